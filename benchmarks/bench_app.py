@@ -0,0 +1,244 @@
+"""End-to-end latency/throughput benchmark for the FastAPI app, fully offline.
+
+Drives the ``app`` in the root main.py in-process over ASGI, with the real
+knowledge/*.csv files, a local BulletinStubServer standing in for
+bulletin.miami.edu (every plan URL serves knowledge/ba_geology.html), and a
+stub LLM provider that answers after a fixed delay. Reports p50/p95/p99
+latency and requests per second at each concurrency level, plus
+micro-benchmarks of the per-request building blocks, and writes everything
+as JSON so runs can be compared.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_app [--concurrency 1 4 16 64] [--requests 200]
+        [--crew-requests 32] [--llm-latency 0.5] [--output PATH]
+"""
+import argparse
+import asyncio
+import csv
+import json
+import logging
+import math
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from unittest import mock
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_OUTPUT_DIR = os.path.join(ROOT_DIR, "benchmarks", "results")
+
+# Courses the stub LLM recommends, including generic slots for fillInCourses
+STUB_ANSWER = json.dumps([
+    {"code": "GSC 110", "name": "Earth System Science", "credits": 3},
+    {"code": "MTH 151", "name": "Calculus I for Engineering and Physics", "credits": 4},
+    {"code": "Elective", "name": "Elective", "credits": 3},
+    {"code": "STEM Elective", "name": "STEM Elective", "credits": 3},
+])
+
+
+def percentile(samples, fraction):
+    """Nearest-rank percentile of ``samples``."""
+    ordered = sorted(samples)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+def summarize(latencies, elapsed=None):
+    summary = {
+        "count": len(latencies),
+        "mean_ms": statistics.fmean(latencies) * 1000,
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p95_ms": percentile(latencies, 0.95) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+    }
+    if elapsed is not None:
+        summary["rps"] = len(latencies) / elapsed
+    return summary
+
+
+def stub_completion(latency):
+    """Return a litellm.completion replacement that answers every prompt after ``latency`` seconds."""
+    import litellm
+
+    def completion(**params):
+        time.sleep(latency)
+        content = f"Thought: I now know the final answer\nFinal Answer: {STUB_ANSWER}"
+        return litellm.ModelResponse(
+            choices=[{"message": {"role": "assistant", "content": content}}],
+            model=params.get("model"),
+        )
+
+    return completion
+
+
+def route_bulletin_to(stub):
+    """Send every bulletin.miami.edu request made by bulletin_client to ``stub`` instead."""
+    from requests.adapters import HTTPAdapter
+
+    from src.ai_advisor.http_client import bulletin_client
+
+    class StubAdapter(HTTPAdapter):
+        def send(self, request, **kwargs):
+            path = request.url.split("://", 1)[1].split("/", 1)[1]
+            request.url = f"{stub.base_url}/{path}"
+            return super().send(request, **kwargs)
+
+    bulletin_client.session.mount("https://bulletin.miami.edu/", StubAdapter())
+
+
+async def load_level(app, requests, concurrency):
+    """Send ``requests`` (list of JSON bodies) with ``concurrency`` clients; return latencies, statuses and wall time."""
+    import httpx
+
+    latencies, statuses = [], {}
+    pending = iter(requests)
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        async def worker():
+            for body in pending:
+                started = time.perf_counter()
+                response = await client.post("/recommend-courses", json=body)
+                latencies.append(time.perf_counter() - started)
+                statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+    return latencies, statuses, elapsed
+
+
+def run_load(app, scenario, bodies, levels, before_level=None):
+    results = []
+    for concurrency in levels:
+        if before_level:
+            before_level()
+        latencies, statuses, elapsed = asyncio.run(load_level(app, bodies, concurrency))
+        level = dict(summarize(latencies, elapsed), concurrency=concurrency,
+                     statuses={str(code): count for code, count in sorted(statuses.items())})
+        results.append(level)
+        print(f"  {scenario:<5} c={concurrency:<4} {level['rps']:9.1f} req/s  p50 {level['p50_ms']:9.2f} ms  "
+              f"p95 {level['p95_ms']:9.2f} ms  p99 {level['p99_ms']:9.2f} ms  {level['statuses']}")
+    return results
+
+
+def micro(name, fn, iterations, setup=None):
+    samples = []
+    for _ in range(iterations):
+        if setup:
+            setup()
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    result = summarize(samples)
+    print(f"  {name:<40} mean {result['mean_ms'] * 1000:9.1f} us  p95 {result['p95_ms'] * 1000:9.1f} us")
+    return result
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16, 64])
+    parser.add_argument("--requests", type=int, default=200, help="Requests per level for the fast path")
+    parser.add_argument("--crew-requests", type=int, default=32, help="Requests per level for the crew path")
+    parser.add_argument("--llm-latency", type=float, default=0.5, help="Seconds the stub LLM takes per completion")
+    parser.add_argument("--micro-iterations", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="JSON results path (default: benchmarks/results/app-<time>.json)")
+    args = parser.parse_args()
+
+    # Settings are read at import time, so isolate caches and disable the
+    # offline index and LLM recording before importing the app
+    os.environ["AI_ADVISOR_CACHE_DIR"] = tempfile.mkdtemp(prefix="ai-advisor-bench-")
+    os.environ["AI_ADVISOR_BULLETIN_INDEX"] = os.path.join(os.environ["AI_ADVISOR_CACHE_DIR"], "no-index.json")
+    os.environ["AI_ADVISOR_LLM_CACHE"] = "off"
+    os.environ.setdefault("OPENAI_API_KEY", "sk-bench")
+    os.environ.setdefault("CREWAI_DISABLE_TELEMETRY", "true")
+    os.environ.setdefault("OTEL_SDK_DISABLED", "true")
+    logging.disable(logging.WARNING)
+
+    from src.ai_advisor import settings
+    from benchmarks.bulletin_stub import BulletinStubServer
+
+    with open(os.path.join(settings.KNOWLEDGE_DIR, "ba_geology.html"), "rb") as f:
+        page = f.read()
+
+    with BulletinStubServer() as stub, mock.patch("litellm.completion", stub_completion(args.llm_latency)):
+        stub.set_default_page(page)
+        route_bulletin_to(stub)
+
+        from main import app
+        from src.ai_advisor.crew_pool import crew_pool
+        from src.ai_advisor.main import fillInCourses
+        from src.ai_advisor.plan_cache import plan_cache
+        from src.ai_advisor.response_cache import response_cache
+        from src.ai_advisor.tools.course_catalog_tool import CourseCatalogTool
+        from src.ai_advisor.tools.degree_program_url_tool import DegreeProgramUrlTool
+
+        crew_pool.warm_up()
+        rng = random.Random(args.seed)
+        with open(settings.DEGREE_PROGRAMS_CSV, newline="") as f:
+            majors = [row["degree_program"] for row in csv.DictReader(f)]
+        pairs = [(major, str(semester)) for major in majors for semester in range(1, 9)]
+        rng.shuffle(pairs)
+
+        print(f"Load test: {len(majors)} programs, stub LLM latency {args.llm_latency}s")
+        fast_bodies = [{"major": major, "semester": semester, "mode": "fast"}
+                       for major, semester in (pairs * (args.requests // len(pairs) + 1))[:args.requests]]
+        fast = run_load(app, "fast", fast_bodies, args.concurrency)
+
+        # Distinct (major, semester) pairs and an empty response cache, so every crew request runs the crew
+        crew_bodies = [{"major": major, "semester": semester, "mode": "crew"}
+                       for major, semester in pairs[:args.crew_requests]]
+        crew = run_load(app, "crew", crew_bodies, args.concurrency, before_level=response_cache.purge)
+
+        print("Micro-benchmarks:")
+        url_tool, catalog_tool = DegreeProgramUrlTool(), CourseCatalogTool()
+        major = majors[0]
+        url = url_tool._get_plan_of_study_url(major)
+        plan = catalog_tool._get_suggested_plan_of_study(major, url)
+        sample = json.loads(STUB_ANSWER)
+        micro_results = {
+            "fillInCourses": micro("fillInCourses", lambda: fillInCourses(sample, major), args.micro_iterations),
+            "_get_plan_of_study_url": micro("_get_plan_of_study_url",
+                                            lambda: url_tool._get_plan_of_study_url(rng.choice(majors)),
+                                            args.micro_iterations),
+            "_get_suggested_plan_of_study (cached)": micro(
+                "_get_suggested_plan_of_study (cached)",
+                lambda: catalog_tool._get_suggested_plan_of_study(major, url), args.micro_iterations),
+            "_get_suggested_plan_of_study (fetch)": micro(
+                "_get_suggested_plan_of_study (fetch)",
+                lambda: catalog_tool._get_suggested_plan_of_study(major, url),
+                max(1, args.micro_iterations // 10), setup=plan_cache.invalidate),
+        }
+
+    results = {
+        "commit": git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "args": vars(args),
+        "plan_semesters": len(plan),
+        "load": {"fast": fast, "crew": crew},
+        "micro": micro_results,
+    }
+    output = args.output or os.path.join(DEFAULT_OUTPUT_DIR, time.strftime("app-%Y%m%d-%H%M%S.json"))
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"Results written to {output}")
+
+
+if __name__ == "__main__":
+    main()
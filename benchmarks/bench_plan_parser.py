@@ -0,0 +1,60 @@
+"""Compare the BeautifulSoup and streaming plan-grid parsers.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_plan_parser [--iterations N] [--page PATH]
+"""
+import argparse
+import logging
+import os
+import time
+import tracemalloc
+
+from src.ai_advisor import settings
+from src.ai_advisor.plan_of_study import parse_plan_of_study, parse_plan_of_study_soup
+
+DEFAULT_PAGE = os.path.join(settings.KNOWLEDGE_DIR, "ba_geology.html")
+
+
+def measure(parse, content, iterations):
+    """Return (mean seconds per parse, peak bytes allocated during one parse)."""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        parse(content)
+    elapsed = (time.perf_counter() - start) / iterations
+
+    tracemalloc.start()
+    parse(content)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--page", default=DEFAULT_PAGE)
+    args = parser.parse_args()
+
+    # Keep the per-row logging of the soup parser out of the measurement
+    logging.disable(logging.CRITICAL)
+    with open(args.page, "rb") as f:
+        content = f.read()
+
+    if parse_plan_of_study(content) != parse_plan_of_study_soup(content):
+        raise SystemExit("Parsers disagree on " + args.page)
+
+    print(f"{args.page}: {len(content)} bytes, {args.iterations} iterations, outputs identical")
+    results = {}
+    for name, parse in (("soup", parse_plan_of_study_soup), ("streaming", parse_plan_of_study)):
+        results[name] = measure(parse, content, args.iterations)
+        elapsed, peak = results[name]
+        print(f"  {name:<10} {elapsed * 1000:8.3f} ms/parse  peak {peak / 1024:8.1f} KiB")
+
+    soup_time, soup_peak = results["soup"]
+    stream_time, stream_peak = results["streaming"]
+    print(f"  speedup {soup_time / stream_time:.1f}x, peak memory {soup_peak / stream_peak:.1f}x lower")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""Cold-start budget for the API process.
+
+Starts a fresh interpreter that imports the app in the root main.py, runs the
+knowledge preload, and serves ``GET /`` and one fast-path
+``POST /recommend-courses`` over ASGI (its plan fetched from a local
+BulletinStubServer), all with crew warm-up disabled. Reports
+the time for each step, the slowest imports (from ``python -X importtime``)
+and whether crewai was imported along the way, which it never should be.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_startup [--budget-ms 1000] [--top 15] [--output PATH]
+
+Exits non-zero if import + preload exceed the budget or crewai was imported.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Runs in the child interpreter; prints one JSON line with its measurements
+CHILD = r"""
+import asyncio, json, sys, time
+started = time.perf_counter()
+import main
+imported = time.perf_counter()
+from src.ai_advisor.startup import preload_knowledge
+preload_knowledge()
+preloaded = time.perf_counter()
+
+import httpx
+from benchmarks.bench_app import route_bulletin_to
+from src.ai_advisor import settings
+from benchmarks.bulletin_stub import BulletinStubServer
+
+stub = BulletinStubServer().start()
+with open(settings.KNOWLEDGE_DIR + "/ba_geology.html", "rb") as f:
+    stub.set_default_page(f.read())
+route_bulletin_to(stub)
+
+async def requests():
+    transport = httpx.ASGITransport(app=main.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://startup") as client:
+        t0 = time.perf_counter()
+        health = await client.get("/")
+        t1 = time.perf_counter()
+        fast = await client.post("/recommend-courses",
+                                 json={"major": "B.A. in Biology", "semester": "1", "mode": "fast"})
+        t2 = time.perf_counter()
+    return health.status_code, t1 - t0, fast.status_code, t2 - t1
+
+health_status, health_s, fast_status, fast_s = asyncio.run(requests())
+print(json.dumps({
+    "import_ms": (imported - started) * 1000,
+    "preload_ms": (preloaded - imported) * 1000,
+    "health_status": health_status,
+    "health_ms": health_s * 1000,
+    "fast_status": fast_status,
+    "fast_ms": fast_s * 1000,
+    "crewai_imported": "crewai" in sys.modules,
+    "litellm_imported": "litellm" in sys.modules,
+}))
+"""
+
+
+def slowest_imports(importtime_log, top):
+    """Parse ``-X importtime`` output into the ``top`` modules by cumulative time."""
+    modules = []
+    for line in importtime_log.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if cumulative.strip().isdigit():
+            modules.append((int(cumulative) / 1000, name.strip()))
+    modules.sort(reverse=True)
+    return [{"module": name, "cumulative_ms": ms} for ms, name in modules[:top]]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--budget-ms", type=float, default=1000.0, help="Budget for import + preload")
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--output", help="Also write the results as JSON to this path")
+    args = parser.parse_args()
+
+    cache_dir = tempfile.mkdtemp(prefix="ai-advisor-startup-")
+    env = dict(os.environ,
+               AI_ADVISOR_WARM_UP_CREWS="false",
+               # Cold caches, and plans come from a local stub of the bulletin
+               AI_ADVISOR_CACHE_DIR=cache_dir,
+               AI_ADVISOR_BULLETIN_INDEX=os.path.join(cache_dir, "no-index.json"),
+               CREWAI_DISABLE_TELEMETRY="true",
+               OTEL_SDK_DISABLED="true")
+    child = subprocess.run([sys.executable, "-X", "importtime", "-c", CHILD], cwd=ROOT_DIR, env=env,
+                           capture_output=True, text=True)
+    if child.returncode != 0:
+        sys.stderr.write(child.stderr)
+        raise SystemExit(f"Startup run failed with exit code {child.returncode}")
+
+    results = json.loads(child.stdout.strip().splitlines()[-1])
+    results["budget_ms"] = args.budget_ms
+    results["slowest_imports"] = slowest_imports(child.stderr, args.top)
+
+    startup_ms = results["import_ms"] + results["preload_ms"]
+    print(f"import main      {results['import_ms']:8.1f} ms")
+    print(f"preload          {results['preload_ms']:8.1f} ms")
+    print(f"GET /            {results['health_ms']:8.1f} ms  ({results['health_status']})")
+    print(f"fast request     {results['fast_ms']:8.1f} ms  ({results['fast_status']})")
+    print(f"crewai imported  {results['crewai_imported']}")
+    print("Slowest imports (cumulative):")
+    for entry in results["slowest_imports"]:
+        print(f"  {entry['cumulative_ms']:8.1f} ms  {entry['module']}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    failures = []
+    if startup_ms > args.budget_ms:
+        failures.append(f"import + preload took {startup_ms:.0f} ms, over the {args.budget_ms:.0f} ms budget")
+    if results["crewai_imported"]:
+        failures.append("crewai was imported by the deterministic path")
+    if failures:
+        raise SystemExit("; ".join(failures))
+    print(f"Within budget: {startup_ms:.0f} ms of {args.budget_ms:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
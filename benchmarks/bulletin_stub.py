@@ -0,0 +1,179 @@
+"""Local stand-in for bulletin.miami.edu, for tests, benchmarks and manual testing.
+
+Serves saved bulletin pages over HTTP on a background thread, with ETag and
+Last-Modified validators, plus hooks to add latency or fail requests:
+
+    with BulletinStubServer() as stub:
+        stub.set_page("/geology/geology-ba/", open("knowledge/ba_geology.html", "rb").read())
+        stub.fail_next(2)  # two 503s, then the page
+        bulletin_client.fetch(stub.url("/geology/geology-ba/"))
+
+Run as ``python -m benchmarks.bulletin_stub [--port 8099]`` to serve every
+page under knowledge/ at /<file name without .html>/.
+"""
+import argparse
+import email.utils
+import hashlib
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+
+from src.ai_advisor import settings
+
+
+class _Page:
+    __slots__ = ("content", "etag", "last_modified")
+
+    def __init__(self, content: bytes):
+        self.content = content
+        self.etag = '"' + hashlib.sha256(content).hexdigest()[:16] + '"'
+        self.last_modified = email.utils.formatdate(time.time(), usegmt=True)
+
+
+class BulletinStubServer:
+    """Threaded HTTP server serving in-memory bulletin pages."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, delay: float = 0.0):
+        self.delay = delay
+        self.requests = 0
+        self.not_modified = 0
+        # Requests being answered now, and the most at once
+        self.in_flight = 0
+        self.max_in_flight = 0
+        # Headers of the last request
+        self.last_headers: Dict[str, str] = {}
+        self._pages: Dict[str, _Page] = {}
+        self._default_page: Optional[_Page] = None
+        self._failures = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def url(self, path: str) -> str:
+        return self.base_url + path
+
+    def set_page(self, path: str, content: bytes) -> None:
+        """Serve ``content`` at ``path``; replacing a page changes its validators."""
+        with self._lock:
+            self._pages[path] = _Page(content)
+
+    def set_default_page(self, content: bytes) -> None:
+        """Serve ``content`` at every path that has no page of its own."""
+        with self._lock:
+            self._default_page = _Page(content)
+
+    def load_knowledge_pages(self, directory: str = settings.KNOWLEDGE_DIR) -> None:
+        """Serve every saved .html page in ``directory`` at /<name>/."""
+        for name in os.listdir(directory):
+            if name.endswith(".html"):
+                with open(os.path.join(directory, name), "rb") as f:
+                    self.set_page(f"/{name[:-len('.html')]}/", f.read())
+
+    def fail_next(self, count: int) -> None:
+        """Answer the next ``count`` requests with 503 Service Unavailable."""
+        with self._lock:
+            self._failures = count
+
+    def start(self) -> "BulletinStubServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def _handler_class(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body go out in separate writes; don't let Nagle delay the body
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                with stub._lock:
+                    stub.requests += 1
+                    stub.in_flight += 1
+                    stub.max_in_flight = max(stub.max_in_flight, stub.in_flight)
+                    stub.last_headers = dict(self.headers)
+                    failing = stub._failures > 0
+                    if failing:
+                        stub._failures -= 1
+                    page = stub._pages.get(self.path.split("?", 1)[0], stub._default_page)
+                try:
+                    self._answer(failing, page)
+                finally:
+                    with stub._lock:
+                        stub.in_flight -= 1
+
+            def _answer(self, failing, page):
+                if stub.delay:
+                    time.sleep(stub.delay)
+
+                if failing:
+                    return self._reply(503, b"unavailable")
+                if page is None:
+                    return self._reply(404, b"not found")
+                if (self.headers.get("If-None-Match") == page.etag
+                        or (self.headers.get("If-None-Match") is None
+                            and self.headers.get("If-Modified-Since") == page.last_modified)):
+                    with stub._lock:
+                        stub.not_modified += 1
+                    return self._reply(304, b"", page)
+                self._reply(200, page.content, page)
+
+            def _reply(self, status, body, page=None):
+                self.send_response(status)
+                if page is not None:
+                    self.send_header("ETag", page.etag)
+                    self.send_header("Last-Modified", page.last_modified)
+                if status != 304:
+                    self.send_header("Content-Type", "text/html; charset=utf-8")
+                    self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                if status != 304:
+                    try:
+                        self.wfile.write(body)
+                    except (BrokenPipeError, ConnectionResetError):
+                        # The client gave up, e.g. after a read timeout
+                        self.close_connection = True
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve saved bulletin pages locally.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8099)
+    parser.add_argument("--delay", type=float, default=0.0, help="Seconds to wait before each response")
+    args = parser.parse_args()
+
+    stub = BulletinStubServer(args.host, args.port, args.delay)
+    stub.load_knowledge_pages()
+    print(f"Serving {len(stub._pages)} pages at {stub.base_url}")
+    try:
+        stub._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,56 @@
-from typing import Union, Optional
-from fastapi import FastAPI, HTTPException
+import asyncio
+from contextlib import asynccontextmanager
+from typing import List, Optional, Literal
+from fastapi import Depends, FastAPI, Header, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
 import json
+import secrets
 import warnings
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
-# Import CrewAI components
-from src.ai_advisor.crew import AiAdvisor
-from src.ai_advisor.main import format_result, fillInCourses
+# Import the advisor components; crewai itself is only imported once a crew is needed
+from src.ai_advisor.batch import iter_batch_recommendations
+from src.ai_advisor.bulletin_refresher import bulletin_refresher
+from src.ai_advisor.crew_executor import CrewQueueFull, crew_executor
+from src.ai_advisor.deadline import (
+    ClientDisconnected, Deadline, cancel_on_disconnect, deadline_scope, request_deadline
+)
+from src.ai_advisor.fast_path import recommend_from_plan, recommend_full_plan
+from src.ai_advisor.llm_cache import llm_cache
+from src.ai_advisor.metrics import TimingMiddleware, render_prometheus
+from src.ai_advisor.plan_cache import plan_cache
+from src.ai_advisor.response_cache import response_cache
+from src.ai_advisor.service import recommend_with_crew_async
+from src.ai_advisor.shared_cache import shared_cache
+from src.ai_advisor.startup import preload_knowledge, warm_up_crews
+from src.ai_advisor.streaming import format_ndjson, format_sse, iter_recommendation_events
+from src.ai_advisor.transcripts import transcript_sink
+from src.ai_advisor import settings
 
 # Suppress warnings
 warnings.filterwarnings("ignore", category=SyntaxWarning, module="pysbd")
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Load the knowledge files before serving; they are fast and every path needs them
+    await run_in_threadpool(preload_knowledge)
+    # Importing crewai and building the crews takes seconds, so do it in the
+    # background and start serving the deterministic endpoints right away
+    app.state.crew_warm_up = asyncio.create_task(asyncio.to_thread(warm_up_crews)) if settings.WARM_UP_CREWS else None
+    # Keep cached plans of study fresh off the request path
+    refresh = settings.BULLETIN_REFRESH_INTERVAL > 0 and not settings.BULLETIN_OFFLINE
+    if refresh:
+        bulletin_refresher.start()
+    yield
+    if refresh:
+        bulletin_refresher.stop(timeout=5)
+    # Write out the transcripts still queued
+    await asyncio.to_thread(transcript_sink.flush, 5)
+
+
+app = FastAPI(lifespan=lifespan)
 
 # Add CORS middleware
 app.add_middleware(
@@ -21,12 +59,28 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],  # Allows all methods
     allow_headers=["*"],  # Allows all headers
+    expose_headers=["Server-Timing"],
 )
 
+# Per-stage timing breakdown in a Server-Timing header on every response
+app.add_middleware(TimingMiddleware)
+
 
 class CourseRequest(BaseModel):
     major: str
     semester: str
+    mode: Optional[Literal["crew", "fast"]] = None
+    # Seed for picking the courses that fill generic slots; the same seed gives the same picks
+    seed: Optional[int] = None
+
+
+class PlanRequest(BaseModel):
+    major: str
+    seed: Optional[int] = None
+
+
+class BatchCourseRequest(BaseModel):
+    items: List[CourseRequest] = Field(..., max_length=settings.BATCH_MAX_ITEMS)
 
 
 @app.get("/")
@@ -35,21 +89,32 @@ def read_root():
 
 
 @app.post("/recommend-courses")
-async def recommend_courses(request: CourseRequest):
+async def recommend_courses(request: CourseRequest, http_request: Request,
+                            x_request_timeout: Optional[float] = Header(default=None)):
     """
-    API endpoint to get course recommendations based on major and semester
+    API endpoint to get course recommendations based on major and semester.
+    The request must finish within its deadline (X-Request-Timeout seconds, or
+    the configured default); past it, the answer comes from the plan of study
+    with no LLM call and is flagged as degraded. Work stops if the client
+    disconnects.
     """
+    async def recommend():
+        # Answer straight from the plan of study when asked to, skipping the LLM
+        if (request.mode or settings.RECOMMENDATION_MODE) == "fast":
+            final_courses = await run_in_threadpool(recommend_from_plan, request.major, request.semester, request.seed)
+            if final_courses is not None:
+                return final_courses
+
+        # Run the CrewAI advisor on the bounded crew pool so the event loop stays free.
+        # Identical (major, semester) requests share one cached or in-flight run.
+        return await recommend_with_crew_async(request.major, request.semester, request.seed)
+
+    deadline = request_deadline(x_request_timeout)
     try:
-        # Initialize the CrewAI advisor and run the recommendation
-        result = AiAdvisor().crew().kickoff(inputs={
-            'major': request.major,
-            'semester': request.semester
-        })
-        
-        # Process and format the results
-        formatted_result = format_result(result.raw)
-        courses = json.loads(formatted_result)
-        final_courses = fillInCourses(courses, request.major)
+        with deadline_scope(deadline):
+            final_courses = await cancel_on_disconnect(
+                http_request, asyncio.wait_for(recommend(), deadline.remaining())
+            )
         
         return {
             "major": request.major, 
@@ -57,8 +122,152 @@ async def recommend_courses(request: CourseRequest):
             "courses": final_courses
         }
         
+    except ClientDisconnected:
+        # Nobody is listening; 499 is only for the access log
+        return Response(status_code=499)
+    except CrewQueueFull as e:
+        raise HTTPException(
+            status_code=429,
+            detail="Too many recommendations in progress, please retry later",
+            headers={"Retry-After": str(e.retry_after)}
+        )
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"An error occurred: {str(e)}")
+        if not deadline.expired:
+            raise HTTPException(status_code=500, detail=f"An error occurred: {str(e)}")
+
+    # Out of time: fall back to the plan of study, with a short budget of its own
+    try:
+        with deadline_scope(Deadline.after(settings.DEGRADED_TIMEOUT)):
+            final_courses = await asyncio.wait_for(
+                run_in_threadpool(recommend_from_plan, request.major, request.semester, request.seed),
+                settings.DEGRADED_TIMEOUT
+            )
+    except Exception:
+        final_courses = None
+    if final_courses is None:
+        raise HTTPException(status_code=504, detail="Timed out before a recommendation could be made")
+    return {
+        "major": request.major,
+        "semester": request.semester,
+        "courses": final_courses,
+        "degraded": True
+    }
+
+
+@app.post("/recommend-courses/plan")
+async def recommend_plan(request: PlanRequest):
+    """
+    API endpoint to get the whole plan of study for a major, every semester
+    answered from one load of the plan with no LLM call. Generic slots are
+    filled across all semesters without repeating a course.
+    """
+    semesters = await run_in_threadpool(recommend_full_plan, request.major, request.seed)
+    if semesters is None:
+        raise HTTPException(status_code=404, detail=f"No plan of study found for the major: {request.major}")
+    return {
+        "major": request.major,
+        "semesters": semesters
+    }
+
+
+@app.post("/recommend-courses/batch")
+async def recommend_courses_batch(request: BatchCourseRequest, format: Literal["ndjson", "json"] = "ndjson"):
+    """
+    API endpoint to get course recommendations for many (major, semester) pairs.
+    Each plan of study is fetched once per major; items default to mode "fast" and
+    only go to the crew when the plan cannot answer them. Results stream back as
+    NDJSON in completion order, or as one JSON array in request order with ?format=json.
+    """
+    items = [(item.major, item.semester, item.mode, item.seed) for item in request.items]
+
+    if format == "json":
+        results = [result async for result in iter_batch_recommendations(items)]
+        return sorted(results, key=lambda result: result["index"])
+
+    async def ndjson_lines():
+        async for result in iter_batch_recommendations(items):
+            yield json.dumps(result) + "\n"
+
+    return StreamingResponse(ndjson_lines(), media_type="application/x-ndjson")
+
+
+@app.post("/recommend-courses/stream")
+async def recommend_courses_stream(request: CourseRequest, format: Literal["sse", "ndjson"] = "sse"):
+    """
+    Streaming variant of /recommend-courses that emits an event per stage
+    (program, plan, llm_started, course, done or error) as soon as it is ready,
+    as Server-Sent Events or NDJSON with ?format=ndjson.
+    """
+    render = format_sse if format == "sse" else format_ndjson
+
+    async def events():
+        async for event, data in iter_recommendation_events(request.major, request.semester, request.mode, request.seed):
+            yield render(event, data)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream" if format == "sse" else "application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+def require_admin(x_admin_token: Optional[str] = Header(default=None)):
+    # Fail closed: without a configured token nobody gets in
+    if not settings.ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Admin endpoints are disabled")
+    if x_admin_token is None or not secrets.compare_digest(x_admin_token, settings.ADMIN_TOKEN):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+
+@app.get("/admin/stats", dependencies=[Depends(require_admin)])
+def admin_stats():
+    """
+    Crew queue depth, wait/run times and cache counters for this worker
+    """
+    return {
+        "crew": crew_executor.stats(),
+        "plan_cache": plan_cache.stats(),
+        "response_cache": response_cache.stats(),
+        "shared_cache": shared_cache.stats(),
+        "llm_cache": llm_cache.stats(),
+        "transcripts": transcript_sink.stats()
+    }
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    """
+    Stage and request latency histograms plus crew, cache and per-program
+    bulletin freshness gauges, in the Prometheus text format
+    """
+    return PlainTextResponse(
+        render_prometheus({
+            "crew": crew_executor.stats(),
+            "plan_cache": plan_cache.stats(),
+            "response_cache": response_cache.stats(),
+            "shared_cache": shared_cache.stats(),
+            "llm_cache": llm_cache.stats(),
+            "transcripts": transcript_sink.stats()
+        }, bulletin_refresher.prometheus_gauges()),
+        media_type="text/plain; version=0.0.4"
+    )
+
+
+@app.get("/admin/freshness", dependencies=[Depends(require_admin)])
+def bulletin_freshness():
+    """
+    When each plan of study was last checked and last changed, and the outcome
+    of its last check
+    """
+    return {"programs": bulletin_refresher.freshness()}
+
+
+@app.delete("/admin/response-cache", dependencies=[Depends(require_admin)])
+def purge_response_cache():
+    """
+    Drop every cached recommendation on this worker and in the shared cache
+    """
+    return {"purged": response_cache.purge()}
 
 
 if __name__ == "__main__":
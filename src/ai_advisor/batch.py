@@ -0,0 +1,84 @@
+"""Batch recommendations for many (major, semester) pairs at once.
+
+Items are grouped by major so each plan of study is resolved, fetched and
+parsed once and then answers every semester requested for that major. Only
+items the plan cannot answer (or that ask for mode "crew") go to the LLM,
+with at most ``settings.BATCH_MAX_PARALLEL`` crew runs per batch at a time.
+"""
+import asyncio
+import logging
+from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Tuple
+
+from src.ai_advisor import settings
+from src.ai_advisor.crew_executor import CrewQueueFull
+from src.ai_advisor.fast_path import load_plan_of_study, recommend_from_loaded_plan
+from src.ai_advisor.program_index import program_key
+from src.ai_advisor.service import recommend_with_crew_async
+
+logger = logging.getLogger(__name__)
+
+# (major, semester, mode, seed) as given by the client; mode None means
+# "fast", and seed picks the courses for generic slots like it does alone
+BatchItem = Tuple[str, str, Optional[str], Optional[int]]
+
+
+def _result(index, major, semester, **fields) -> Dict[str, Any]:
+    return dict(index=index, major=major, semester=semester, **fields)
+
+
+async def iter_batch_recommendations(items: Sequence[BatchItem],
+                                     max_parallel: int = settings.BATCH_MAX_PARALLEL) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Yield one result per item, in completion order.
+
+    Each result carries the item's ``index`` in the request plus either
+    ``courses`` and ``source`` ("plan_of_study" or "crew"), or ``error`` and
+    ``status``. Closing the iterator early cancels the remaining work.
+    """
+    results: "asyncio.Queue[Dict[str, Any]]" = asyncio.Queue()
+    crew_slots = asyncio.Semaphore(max_parallel)
+
+    groups: Dict[str, List[Tuple[int, BatchItem]]] = {}
+    for index, item in enumerate(items):
+        groups.setdefault(program_key(item[0]), []).append((index, item))
+
+    async def run_crew(index, major, semester, seed):
+        try:
+            async with crew_slots:
+                courses = await recommend_with_crew_async(major, semester, seed)
+            results.put_nowait(_result(index, major, semester, courses=courses, source="crew"))
+        except CrewQueueFull as e:
+            results.put_nowait(_result(index, major, semester, status=429,
+                                       error=f"Too many recommendations in progress, retry after {e.retry_after}s"))
+        except Exception as e:
+            results.put_nowait(_result(index, major, semester, status=500, error=f"An error occurred: {str(e)}"))
+
+    async def run_group(entries):
+        plan_of_study = None
+        if any((mode or "fast") == "fast" for _, (_, _, mode, _) in entries):
+            try:
+                plan_of_study = await asyncio.to_thread(load_plan_of_study, entries[0][1][0])
+            except Exception as e:
+                logger.warning(f"Could not load plan of study for {entries[0][1][0]}: {e}")
+
+        crew_runs = []
+        for index, (major, semester, mode, seed) in entries:
+            courses = None
+            if (mode or "fast") == "fast":
+                try:
+                    courses = recommend_from_loaded_plan(plan_of_study, major, semester, seed)
+                except Exception as e:
+                    logger.warning(f"Plan of study lookup failed for {major}, semester {semester}: {e}")
+            if courses is not None:
+                results.put_nowait(_result(index, major, semester, courses=courses, source="plan_of_study"))
+            else:
+                crew_runs.append(run_crew(index, major, semester, seed))
+        await asyncio.gather(*crew_runs)
+
+    tasks = [asyncio.create_task(run_group(entries)) for entries in groups.values()]
+    try:
+        for _ in range(len(items)):
+            yield await results.get()
+    finally:
+        for task in tasks:
+            task.cancel()
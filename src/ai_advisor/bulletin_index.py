@@ -0,0 +1,168 @@
+#!/usr/bin/env python
+"""Offline snapshot of every suggested plan of study listed in degree_programs.csv.
+
+Build the index from the live bulletin:
+
+    python -m src.ai_advisor.bulletin_index
+
+or from a directory of saved pages, named after the last path segment of each
+plan_of_study_url (e.g. ``biology-ba.html`` for ``.../biology/biology-ba/``):
+
+    python -m src.ai_advisor.bulletin_index --html-dir saved_pages/
+
+get_suggested_plan_of_study serves plans from the index without touching the network.
+"""
+import argparse
+import csv
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from src.ai_advisor import settings
+
+logger = logging.getLogger(__name__)
+
+INDEX_VERSION = 1
+
+
+def saved_page_name(url: str) -> str:
+    """Return the file name a saved copy of the bulletin page at ``url`` is expected to have."""
+    return url.rstrip("/").rsplit("/", 1)[-1] + ".html"
+
+
+def compact_plan(plan_of_study: List[Dict[str, Any]]) -> List[list]:
+    """Pack a parsed plan into nested lists: [year, term, [[code, name, hours], ...]]."""
+    return [
+        [semester_plan["year"], semester_plan["semester"],
+         [[course["course_code"], course["course_name"], course["credit_hours"]]
+          for course in semester_plan["courses"]]]
+        for semester_plan in plan_of_study
+    ]
+
+
+def expand_plan(compact: List[list]) -> List[Dict[str, Any]]:
+    """Inverse of compact_plan."""
+    return [
+        {
+            "year": year,
+            "semester": term,
+            "courses": [
+                {"course_code": code, "course_name": name, "credit_hours": hours}
+                for code, name, hours in courses
+            ],
+        }
+        for year, term, courses in compact
+    ]
+
+
+def build_index(csv_path: str = settings.DEGREE_PROGRAMS_CSV, html_dir: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Parse the plan of study for every program in ``csv_path`` once.
+
+    Args:
+        csv_path: Path to degree_programs.csv
+        html_dir: Optional directory of saved bulletin pages; when given, no network is used
+
+    Returns:
+        The index as a JSON-serializable dictionary
+    """
+    # Imported here so loading an existing index never pulls in requests
+    from src.ai_advisor.plan_of_study import fetch_plan_of_study, parse_plan_of_study
+
+    programs = {}
+    with open(csv_path, "r") as f:
+        for row in csv.DictReader(f):
+            url = row["plan_of_study_url"].strip()
+            if not url or url in programs:
+                continue
+
+            if html_dir:
+                page_path = os.path.join(html_dir, saved_page_name(url))
+                if not os.path.exists(page_path):
+                    logger.warning(f"No saved page for {row['degree_program']} at {page_path}")
+                    continue
+                with open(page_path, "rb") as page:
+                    plan_of_study = parse_plan_of_study(page.read(), url)
+            else:
+                plan_of_study = fetch_plan_of_study(row["degree_program"], url)
+
+            if not plan_of_study:
+                logger.warning(f"No plan of study parsed for {row['degree_program']} ({url})")
+                continue
+            programs[url] = {
+                "degree_program": row["degree_program"],
+                "plan": compact_plan(plan_of_study),
+            }
+
+    return {"version": INDEX_VERSION, "generated_at": time.time(), "programs": programs}
+
+
+def write_index(index: Dict[str, Any], path: str = settings.BULLETIN_INDEX_PATH) -> None:
+    """Write the index atomically as compact JSON."""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(index, f, separators=(",", ":"))
+    os.replace(tmp_path, path)
+
+
+class BulletinIndex:
+    """Read-only view over an index file, keyed by plan of study URL."""
+
+    def __init__(self, programs: Optional[Dict[str, Any]] = None):
+        self._plans = {
+            url: expand_plan(program["plan"]) for url, program in (programs or {}).items()
+        }
+
+    @classmethod
+    def load(cls, path: str = settings.BULLETIN_INDEX_PATH) -> "BulletinIndex":
+        """Load the index at ``path``; a missing file gives an empty index."""
+        try:
+            with open(path, "r") as f:
+                index = json.load(f)
+        except FileNotFoundError:
+            return cls()
+        if index.get("version") != INDEX_VERSION:
+            logger.warning(f"Ignoring bulletin index {path} with unsupported version {index.get('version')}")
+            return cls()
+        return cls(index["programs"])
+
+    def get_plan(self, url: str) -> Optional[List[Dict[str, Any]]]:
+        """Return the plan of study for ``url``, or None if the index doesn't have it."""
+        return self._plans.get(url)
+
+    def __len__(self):
+        return len(self._plans)
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_bulletin_index() -> BulletinIndex:
+    """Return the process-wide bulletin index, loading it on first use."""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = BulletinIndex.load()
+    return _index
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the offline bulletin plan of study index.")
+    parser.add_argument("--csv", default=settings.DEGREE_PROGRAMS_CSV, help="Path to degree_programs.csv")
+    parser.add_argument("--html-dir", help="Directory of saved bulletin pages to parse instead of fetching")
+    parser.add_argument("--output", default=settings.BULLETIN_INDEX_PATH, help="Where to write the index")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.ERROR)
+    index = build_index(args.csv, args.html_dir)
+    write_index(index, args.output)
+    print(f"Wrote {len(index['programs'])} programs to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
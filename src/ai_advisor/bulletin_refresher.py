@@ -0,0 +1,221 @@
+#!/usr/bin/env python
+"""Background refresh of the cached plans of study.
+
+Bulletin pages change once or twice a year, so instead of revalidating on
+the request path, BulletinRefresher walks every plan_of_study_url in
+degree_programs.csv on a background thread and checks it at most once per
+``settings.BULLETIN_REFRESH_INTERVAL`` seconds, across all workers:
+
+    not_modified  the conditional GET answered 304
+    unchanged     the page changed, but its plan grid hashes the same, so it isn't re-parsed
+    changed       the plan grid is new; the page is parsed and the plan swapped into the cache
+    error         the bulletin couldn't be reached or the page has no plan grid; the cached plan stays
+
+Every outcome except an error renews the cached plan, so requests keep hitting
+the cache and never wait on the bulletin. A swap is one PlanCache.set; other
+workers see the new content hash in the shared freshness record and reload
+the plan from the shared cache. Plans served from the offline bulletin index
+are pinned to the index and skipped.
+
+One pass can also be run by hand, e.g. against a BulletinStubServer:
+
+    python -m src.ai_advisor.bulletin_refresher [--force]
+"""
+import argparse
+import csv
+import json
+import logging
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+import requests
+
+from src.ai_advisor import settings
+from src.ai_advisor.bulletin_index import get_bulletin_index
+from src.ai_advisor.http_client import bulletin_client
+from src.ai_advisor.plan_cache import plan_cache
+from src.ai_advisor.plan_grid import grid_fingerprint
+from src.ai_advisor.plan_of_study import parse_plan_of_study
+from src.ai_advisor.shared_cache import shared_cache
+
+logger = logging.getLogger(__name__)
+
+# Namespace of per-URL freshness records in the shared cache
+NAMESPACE = "freshness"
+
+# Longest sleep between passes; only URLs that are due are fetched in a pass
+MAX_TICK = 60.0
+
+
+def plan_urls(csv_path: str = settings.DEGREE_PROGRAMS_CSV) -> Dict[str, List[str]]:
+    """Map every plan of study URL in the degree programs CSV to the programs that use it."""
+    urls: Dict[str, List[str]] = {}
+    with open(csv_path, "r", newline="") as f:
+        for row in csv.DictReader(f):
+            url = (row.get("plan_of_study_url") or "").strip()
+            if url.startswith("http"):
+                urls.setdefault(url, []).append(row["degree_program"])
+    return urls
+
+
+class BulletinRefresher:
+    """Keeps cached plans of study fresh from a background thread."""
+
+    def __init__(self, interval: float = settings.BULLETIN_REFRESH_INTERVAL,
+                 csv_path: str = settings.DEGREE_PROGRAMS_CSV):
+        self.interval = interval
+        self.csv_path = csv_path
+        # Content hash of the plan this worker holds in memory, per URL
+        self._applied: Dict[str, Optional[str]] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Start refreshing in a daemon thread; a no-op if it is already running."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="bulletin-refresher", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def refresh_once(self, force: bool = False) -> Dict[str, int]:
+        """
+        Check every plan URL that is due (or all of them with ``force``).
+
+        Returns:
+            How many URLs ended up in each status, with "skipped" for URLs that
+            were not due or are pinned by the bulletin index
+        """
+        counts: Dict[str, int] = {}
+        index = get_bulletin_index()
+        for url, programs in plan_urls(self.csv_path).items():
+            if self._stop.is_set():
+                break
+            if index.get_plan(url) is not None:
+                status = "skipped"
+            else:
+                status = self.refresh(url, programs, force)
+            counts[status] = counts.get(status, 0) + 1
+        return counts
+
+    def refresh(self, url: str, programs: List[str], force: bool = False) -> str:
+        """Check one URL if it is due and return the status of this pass for it."""
+        # One worker checks a URL at a time; the rest read the record it wrote
+        with shared_cache.fill_lock(NAMESPACE, url):
+            record = shared_cache.get(NAMESPACE, url)
+            due = force or record is None or time.time() - record["attempted_at"] >= self.interval
+            if due:
+                record = self._check(url, programs, record)
+                shared_cache.set(NAMESPACE, url, record)
+
+        if record["content_hash"] != self._applied.get(url):
+            if not due:
+                plan_cache.reload(url)
+            self._applied[url] = record["content_hash"]
+        return record["status"] if due else "skipped"
+
+    def freshness(self) -> List[Dict[str, Any]]:
+        """Freshness record of every plan URL, as last written by any worker, sorted by URL."""
+        records = shared_cache.items(NAMESPACE)
+        return [records[url] for url in sorted(records)]
+
+    def prometheus_gauges(self) -> Dict[str, Any]:
+        """Per-program seconds since the last successful check and since the plan last changed."""
+        now = time.time()
+        checked, changed, failing = {}, {}, {}
+        for record in self.freshness():
+            for program in record["programs"]:
+                if record["checked_at"] is not None:
+                    checked[program] = round(now - record["checked_at"], 3)
+                if record["changed_at"] is not None:
+                    changed[program] = round(now - record["changed_at"], 3)
+                failing[program] = 1 if record["status"] == "error" else 0
+        return {
+            "bulletin_checked_age_seconds": ("Seconds since the plan of study was last checked", "program", checked),
+            "bulletin_changed_age_seconds": ("Seconds since the plan of study last changed", "program", changed),
+            "bulletin_refresh_failing": ("1 if the last check of the plan of study failed", "program", failing),
+        }
+
+    def _check(self, url: str, programs: List[str], record: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        now = time.time()
+        record = dict(record or {
+            "url": url, "checked_at": None, "changed_at": None, "content_hash": None,
+            "checks": 0, "changes": 0, "errors": 0,
+        })
+        record.update(programs=programs, attempted_at=now, checks=record["checks"] + 1, error=None)
+
+        stale = plan_cache.get_stale(url)
+        validators = stale["validators"] if stale else {}
+        try:
+            result = bulletin_client.fetch(url, etag=validators.get("etag"),
+                                           last_modified=validators.get("last_modified"))
+            if result.not_modified and not stale:
+                # A 304 leaves nothing to keep once the plan is gone from the
+                # cache (e.g. a proxy revalidated for us), so get the whole page
+                result = bulletin_client.fetch(url)
+        except requests.exceptions.RequestException as e:
+            logger.warning(f"Could not refresh plan of study at {url}: {e}")
+            record.update(status="error", error=str(e), errors=record["errors"] + 1)
+            return record
+
+        if result.not_modified and stale:
+            status, plan = "not_modified", stale["plan"]
+        elif result.not_modified:
+            record.update(status="error", error="Page not modified, but no cached plan to keep",
+                          errors=record["errors"] + 1)
+            return record
+        else:
+            content_hash = grid_fingerprint(result.content)
+            if stale and content_hash is not None and content_hash == record["content_hash"]:
+                status, plan = "unchanged", stale["plan"]
+            else:
+                plan = parse_plan_of_study(result.content, url)
+                if not plan:
+                    record.update(status="error", error="No plan of study grid on the page",
+                                  errors=record["errors"] + 1)
+                    return record
+                status = "changed"
+                record.update(content_hash=content_hash, changed_at=now, changes=record["changes"] + 1)
+                logger.info(f"Plan of study changed at {url}")
+
+        # Also renews an unchanged plan, so it doesn't expire on the request path
+        plan_cache.set(url, plan, etag=result.etag or validators.get("etag"),
+                       last_modified=result.last_modified or validators.get("last_modified"))
+        record.update(status=status, checked_at=now)
+        return record
+
+    def _run(self):
+        tick = min(self.interval, MAX_TICK)
+        while not self._stop.is_set():
+            try:
+                counts = self.refresh_once()
+                if set(counts) - {"skipped"}:
+                    logger.info(f"Bulletin refresh pass: {counts}")
+            except Exception:
+                logger.exception("Bulletin refresh pass failed")
+            self._stop.wait(tick)
+
+
+# Process-wide refresher, started by the API's lifespan when enabled
+bulletin_refresher = BulletinRefresher()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run one bulletin refresh pass and print each URL's freshness.")
+    parser.add_argument("--force", action="store_true", help="Check every URL, even those checked recently")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    print(json.dumps(bulletin_refresher.refresh_once(force=args.force)))
+    for record in bulletin_refresher.freshness():
+        print(f"{record['status']:<13} {record['url']}")
+
+
+if __name__ == "__main__":
+    main()
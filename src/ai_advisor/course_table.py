@@ -0,0 +1,124 @@
+"""Process-wide, read-only view of knowledge/courses.csv.
+
+The CSV is parsed once into compact Course records indexed by course code and
+by fulfillment type, and re-parsed only when the file changes on disk.
+"""
+import csv
+import os
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from src.ai_advisor import settings
+
+# Substring of a generic plan of study slot -> fulfillment type that fills it,
+# checked in this order
+GENERIC_SLOTS = (
+    ('Elective', 'Elective'),
+    ('STEM', 'STEM Cognate'),
+    ('Language', 'Language'),
+    ('People and Society', 'People and Society Cognate'),
+    ('Arts and Humanities', 'Arts and Humanities Cognate'),
+)
+
+# How often, at most, to stat the CSV for changes
+RELOAD_CHECK_INTERVAL = 1.0
+
+
+def generic_slot_type(course_code: str) -> Optional[str]:
+    """Return the fulfillment type a generic slot such as "Elective #1" asks for, or None for a real course."""
+    for marker, fulfillment_type in GENERIC_SLOTS:
+        if marker in course_code:
+            return fulfillment_type
+    return None
+
+
+class Course:
+    """One row of courses.csv."""
+
+    __slots__ = ("code", "name", "description", "credits", "fulfillment_type", "_response")
+
+    def __init__(self, code, name, description, credits, fulfillment_type):
+        self.code = code
+        self.name = name
+        self.description = description
+        self.credits = credits
+        self.fulfillment_type = fulfillment_type
+        self._response = {
+            'code': code,
+            'name': name,
+            'description': description,
+            'credits': credits,
+            'fulfillment_type': fulfillment_type,
+        }
+
+    def as_response(self) -> Dict[str, str]:
+        """Return a fresh dict in the shape /recommend-courses returns."""
+        return self._response.copy()
+
+
+class CourseTable:
+    """Immutable snapshot of courses.csv with lookups by code and fulfillment type."""
+
+    def __init__(self, by_code: Dict[str, Course], by_type: Dict[str, Tuple[Course, ...]]):
+        self.by_code = by_code
+        self.by_type = by_type
+
+    @classmethod
+    def from_csv(cls, csv_path: str) -> "CourseTable":
+        by_code, by_type = {}, {}
+        with open(csv_path, 'r') as f:
+            for row in csv.DictReader(f):
+                course = Course(
+                    row['course_code'],
+                    row['course_name'],
+                    row['description'],
+                    row['credits'],
+                    row['fullfillment_type'],
+                )
+                by_code.setdefault(course.code.strip(), course)
+                by_type.setdefault(course.fulfillment_type.strip(), []).append(course)
+        return cls(by_code, {fulfillment: tuple(courses) for fulfillment, courses in by_type.items()})
+
+    def get(self, code: str) -> Optional[Course]:
+        return self.by_code.get(code.strip())
+
+    def of_type(self, fulfillment_type: str) -> Tuple[Course, ...]:
+        return self.by_type.get(fulfillment_type, ())
+
+
+class _CourseTableLoader:
+    """Keeps the current CourseTable for a CSV file, reloading it when the file changes."""
+
+    def __init__(self, csv_path: str):
+        self.csv_path = csv_path
+        self._lock = threading.Lock()
+        self._mtime = os.stat(csv_path).st_mtime
+        self._table = CourseTable.from_csv(csv_path)
+        self._next_check = time.monotonic() + RELOAD_CHECK_INTERVAL
+
+    def get(self) -> CourseTable:
+        now = time.monotonic()
+        if now >= self._next_check:
+            with self._lock:
+                if now >= self._next_check:
+                    self._next_check = now + RELOAD_CHECK_INTERVAL
+                    mtime = os.stat(self.csv_path).st_mtime
+                    if mtime != self._mtime:
+                        self._table = CourseTable.from_csv(self.csv_path)
+                        self._mtime = mtime
+        return self._table
+
+
+_loader = None
+_loader_lock = threading.Lock()
+
+
+def get_course_table() -> CourseTable:
+    """Return the current course table, loading courses.csv on first use."""
+    global _loader
+    if _loader is None:
+        with _loader_lock:
+            if _loader is None:
+                _loader = _CourseTableLoader(settings.COURSES_CSV)
+    return _loader.get()
@@ -0,0 +1,212 @@
+#!/usr/bin/env python
+"""TF-IDF vectors over courses.csv for relevance-ranked generic slots.
+
+Every course's name and description is turned into an L2-normalized TF-IDF
+row of one NumPy matrix, stored next to the CSV:
+
+    python -m src.ai_advisor.course_vectors
+
+When filling an "Elective", "STEM", "Language" or cognate slot, SlotFiller
+embeds the student's major and the specific courses they are taking with the
+same vocabulary, scores every course with one matrix-vector product, and picks
+among the best-scoring unused courses of the slot's type with a per-request
+seed. A missing or outdated matrix file is rebuilt in memory, which for
+courses.csv takes a few milliseconds.
+"""
+import argparse
+import hashlib
+import logging
+import math
+import re
+import threading
+import zipfile
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set
+
+import numpy as np
+
+from src.ai_advisor import settings
+from src.ai_advisor.course_table import Course, CourseTable, generic_slot_type, get_course_table
+
+logger = logging.getLogger(__name__)
+
+# A slot is filled with one of this many best-scoring courses, chosen with the
+# request's seed, so asking again with another seed gives other relevant picks
+SHORTLIST = 3
+
+_TOKEN = re.compile(r"[a-z]{3,}")
+_STOPWORDS = frozenset(
+    "and are for from has have into its not of off one our than that the their them then there these this "
+    "those through thus was were what when where which while who will with within without you your "
+    "course courses credit credits hour hours student students including include introduction study".split()
+)
+
+
+def tokenize(text: str) -> List[str]:
+    """Lower-case word tokens of ``text``, without stopwords."""
+    return [token for token in _TOKEN.findall(text.lower()) if token not in _STOPWORDS]
+
+
+def corpus_digest(courses: Sequence[Course]) -> str:
+    """Fingerprint of the text the vectors were built from, to detect an outdated matrix file."""
+    digest = hashlib.sha256()
+    for course in courses:
+        digest.update(f"{course.code}\0{course.name}\0{course.description}\n".encode("utf-8"))
+    return digest.hexdigest()
+
+
+class CourseVectors:
+    """Read-only TF-IDF matrix with one row per course code."""
+
+    def __init__(self, codes: Sequence[str], vocabulary: Sequence[str], idf: np.ndarray, matrix: np.ndarray,
+                 digest: str = ""):
+        self.codes = list(codes)
+        self.rows = {code: row for row, code in enumerate(self.codes)}
+        self.vocabulary = {term: column for column, term in enumerate(vocabulary)}
+        self.idf = idf
+        self.matrix = matrix
+        self.digest = digest
+
+    @classmethod
+    def build(cls, courses: Sequence[Course]) -> "CourseVectors":
+        """Compute the vectors for ``courses``, which must have distinct codes."""
+        documents = [Counter(tokenize(f"{course.name} {course.description}")) for course in courses]
+        vocabulary = sorted(set().union(*documents)) if documents else []
+        columns = {term: column for column, term in enumerate(vocabulary)}
+
+        document_frequency = np.zeros(len(vocabulary), dtype=np.float32)
+        for document in documents:
+            document_frequency[[columns[term] for term in document]] += 1
+        # Smoothed IDF, so a term found in every course still counts a little
+        idf = (np.log((1 + len(documents)) / (1 + document_frequency)) + 1).astype(np.float32)
+
+        matrix = np.zeros((len(documents), len(vocabulary)), dtype=np.float32)
+        for row, document in enumerate(documents):
+            for term, count in document.items():
+                matrix[row, columns[term]] = 1 + math.log(count)
+        matrix *= idf
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        matrix /= np.where(norms == 0, 1, norms)
+        return cls([course.code.strip() for course in courses], vocabulary, idf, matrix, corpus_digest(courses))
+
+    @classmethod
+    def load(cls, path: str = settings.COURSE_VECTORS_PATH) -> "CourseVectors":
+        with np.load(path, allow_pickle=False) as stored:
+            return cls(stored["codes"].tolist(), stored["vocabulary"].tolist(), stored["idf"], stored["matrix"],
+                       str(stored["digest"]))
+
+    def save(self, path: str = settings.COURSE_VECTORS_PATH) -> None:
+        # np.savez adds ".npz" to names without it, so write through a file object
+        with open(path, "wb") as f:
+            np.savez_compressed(f, codes=np.array(self.codes), vocabulary=np.array(list(self.vocabulary)),
+                                idf=self.idf, matrix=self.matrix, digest=np.array(self.digest))
+
+    def embed(self, text: str) -> np.ndarray:
+        """Vector of ``text`` in the courses' TF-IDF space (all zeros if no word is known)."""
+        vector = np.zeros(len(self.vocabulary), dtype=np.float32)
+        for term, count in Counter(tokenize(text)).items():
+            column = self.vocabulary.get(term)
+            if column is not None:
+                vector[column] = 1 + math.log(count)
+        vector *= self.idf
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def similarities(self, text: str) -> np.ndarray:
+        """Cosine similarity of ``text`` to every course, indexed like ``codes``."""
+        return self.matrix @ self.embed(text)
+
+
+def _table_courses(table: CourseTable) -> List[Course]:
+    return [table.by_code[code] for code in sorted(table.by_code)]
+
+
+def _load_or_build(table: CourseTable) -> CourseVectors:
+    courses = _table_courses(table)
+    digest = corpus_digest(courses)
+    try:
+        vectors = CourseVectors.load()
+        if vectors.digest == digest:
+            return vectors
+        logger.info(f"{settings.COURSE_VECTORS_PATH} is outdated, rebuilding course vectors in memory")
+    except FileNotFoundError:
+        logger.info(f"No {settings.COURSE_VECTORS_PATH}, building course vectors in memory")
+    except (OSError, ValueError, KeyError, zipfile.BadZipFile) as e:
+        # Truncated, corrupt, or written by an older version without some array
+        logger.warning(f"Could not read {settings.COURSE_VECTORS_PATH} ({e}), rebuilding course vectors in memory")
+    return CourseVectors.build(courses)
+
+
+_vectors: Optional[CourseVectors] = None
+_vectors_table: Optional[CourseTable] = None
+_vectors_lock = threading.Lock()
+
+
+def get_course_vectors() -> CourseVectors:
+    """Return the vectors for the current course table, rebuilding them when courses.csv changes."""
+    global _vectors, _vectors_table
+    table = get_course_table()
+    if _vectors_table is not table:
+        with _vectors_lock:
+            if _vectors_table is not table:
+                _vectors = _load_or_build(table)
+                _vectors_table = table
+    return _vectors
+
+
+class SlotFiller:
+    """
+    Picks courses for the generic slots of one request.
+
+    Args:
+        major: The student's major
+        context: The courses of the request (crew or plan of study shape); the
+            specific ones describe what the student is studying and are never picked
+        taken: Optional set of course codes to avoid, shared between fillers to
+            avoid repeats across calls; every pick is added to it
+        seed: Seed for choosing within the shortlist; None for a fresh one
+    """
+
+    def __init__(self, major: str, context: Iterable[Dict[str, Any]], taken: Optional[Set[str]] = None,
+                 seed: Optional[int] = None):
+        self.vectors = get_course_vectors()
+        self.taken = set() if taken is None else taken
+        self.rng = np.random.default_rng(seed)
+
+        words = [major]
+        for course in context:
+            code = (course.get("code") or course.get("course_code") or "").strip()
+            if generic_slot_type(code) is None:
+                self.taken.add(code)
+                words.append(course.get("name") or course.get("course_name") or "")
+                words.append(course.get("description") or "")
+        self.scores = self.vectors.similarities(" ".join(words))
+
+    def pick(self, candidates: Sequence[Course]) -> Optional[Course]:
+        """Return the chosen course among ``candidates`` (None if there are none) and mark it taken."""
+        # Only repeat a course once every candidate has been used
+        available = [course for course in candidates if course.code not in self.taken] or list(candidates)
+        if not available:
+            return None
+        rows = np.fromiter((self.vectors.rows.get(course.code.strip(), -1) for course in available),
+                           dtype=np.intp, count=len(available))
+        scores = np.where(rows >= 0, self.scores[rows], 0.0)
+        # Random tie-breaking, so equally relevant courses are not always picked in CSV order
+        order = np.lexsort((self.rng.random(len(available)), -scores))
+        choice = available[int(self.rng.choice(order[:SHORTLIST]))]
+        self.taken.add(choice.code)
+        return choice
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the TF-IDF course vectors for courses.csv.")
+    parser.add_argument("--output", default=settings.COURSE_VECTORS_PATH, help="Where to write the vectors")
+    args = parser.parse_args()
+
+    vectors = CourseVectors.build(_table_courses(get_course_table()))
+    vectors.save(args.output)
+    print(f"Wrote {len(vectors.codes)} course vectors over {len(vectors.vocabulary)} terms to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,20 +1,10 @@
-from crewai import Agent, Crew, Process, Task, LLM
+from crewai import Agent, Crew, Process, Task
 from crewai.project import CrewBase, agent, crew, task
+from src.ai_advisor import settings
+from src.ai_advisor.llm import build_llm
 from src.ai_advisor.tools.course_catalog_tool import CourseCatalogTool
 from src.ai_advisor.tools.degree_program_url_tool import DegreeProgramUrlTool
-
-# Advanced configuration with detailed parameters
-llm = LLM(
-    model="openai/gpt-4o-mini",
-    temperature=0.8,        # Higher for more creative outputs
-    timeout=120,           # Seconds to wait for response
-    max_tokens=4000,       # Maximum length of response
-    top_p=0.9,            # Nucleus sampling parameter
-    frequency_penalty=0.1, # Reduce repetition
-    presence_penalty=0.1,  # Encourage topic diversity
-    # response_format={"type": "json"},  # For structured outputs
-    seed=42               # For reproducible results
-)
+from src.ai_advisor.transcripts import record_step
 
 # If you want to run a snippet of code before or after the crew starts,
 # you can use the @before_kickoff and @after_kickoff decorators
@@ -44,15 +34,17 @@ class AiAdvisor():
         return Agent(
             config=self.agents_config['catalog_specialist'],
             tools=[CourseCatalogTool(), DegreeProgramUrlTool()],
-            verbose=True,
-            llm=llm
+            verbose=settings.CREW_VERBOSE,
+            # One LLM per crew, since agents modify theirs; see llm.py
+            llm=build_llm()
         )
 
     @task
     def recommend_courses(self) -> Task:
+        # No output_file: results are returned to the caller, and a shared
+        # file would be overwritten by every concurrent kickoff
         return Task(
             config=self.tasks_config['recommend_courses'],
-            output_file='course_recommendations.md'
         )
 
     @crew
@@ -65,6 +57,8 @@ class AiAdvisor():
             agents=self.agents, # Automatically created by the @agent decorator
             tasks=self.tasks, # Automatically created by the @task decorator
             process=Process.sequential,
-            verbose=True,
+            verbose=settings.CREW_VERBOSE,
+            # Steps go to the sampled transcript sink, not stdout
+            step_callback=record_step,
             # process=Process.hierarchical, # In case you wanna use that instead https://docs.crewai.com/how-to/Hierarchical/
         )
@@ -0,0 +1,119 @@
+import asyncio
+import contextvars
+import logging
+import math
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+from src.ai_advisor import settings
+from src.ai_advisor.deadline import check_deadline
+from src.ai_advisor.metrics import record_stage
+
+logger = logging.getLogger(__name__)
+
+
+class CrewQueueFull(Exception):
+    """Raised when a kickoff is rejected because the wait queue is full."""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"Crew queue is full, retry after {retry_after}s")
+        self.retry_after = retry_after
+
+
+class CrewExecutor:
+    """Runs blocking crew kickoffs off the event loop with bounded concurrency.
+
+    At most ``max_concurrency`` kickoffs run at once on a dedicated thread
+    pool and at most ``max_queue`` more wait for a free slot; anything beyond
+    that is rejected with CrewQueueFull so the endpoint can shed load.
+    """
+
+    def __init__(self, max_concurrency: int = settings.CREW_MAX_CONCURRENCY,
+                 max_queue: int = settings.CREW_MAX_QUEUE):
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self._pool = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="crew")
+        self._lock = threading.Lock()
+        self._waiting = 0
+        self._running = 0
+        self._counters = {
+            "completed": 0,
+            "failed": 0,
+            "rejected": 0,
+            "wait_seconds_total": 0.0,
+            "wait_seconds_max": 0.0,
+            "run_seconds_total": 0.0,
+            "run_seconds_max": 0.0,
+        }
+
+    async def run(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """Run ``fn(*args, **kwargs)`` on the crew pool and await its result."""
+        with self._lock:
+            if self._waiting + self._running >= self.max_concurrency + self.max_queue:
+                self._counters["rejected"] += 1
+                raise CrewQueueFull(self._retry_after())
+            self._waiting += 1
+        submitted_at = time.monotonic()
+
+        def job():
+            started_at = time.monotonic()
+            waited = started_at - submitted_at
+            with self._lock:
+                self._waiting -= 1
+                self._running += 1
+                self._counters["wait_seconds_total"] += waited
+                self._counters["wait_seconds_max"] = max(self._counters["wait_seconds_max"], waited)
+            record_stage("crew_wait", waited)
+            succeeded = False
+            try:
+                # Don't start a kickoff for a request that ran out of time in the queue
+                check_deadline()
+                result = fn(*args, **kwargs)
+                succeeded = True
+                return result
+            finally:
+                ran = time.monotonic() - started_at
+                with self._lock:
+                    self._running -= 1
+                    self._counters["completed" if succeeded else "failed"] += 1
+                    self._counters["run_seconds_total"] += ran
+                    self._counters["run_seconds_max"] = max(self._counters["run_seconds_max"], ran)
+                logger.info(f"Crew kickoff finished in {ran:.2f}s after waiting {waited:.2f}s")
+
+        # Run in the caller's context so spans inside the kickoff reach its
+        # request timings, and its calls see the request's deadline
+        future = self._pool.submit(contextvars.copy_context().run, job)
+        try:
+            return await asyncio.wrap_future(future)
+        except asyncio.CancelledError:
+            # Cancelling the awaiting task cancels a job that hasn't started yet
+            if future.cancelled():
+                with self._lock:
+                    self._waiting -= 1
+            raise
+
+    def stats(self) -> Dict[str, Any]:
+        """Return current queue depth plus cumulative wait/run time counters."""
+        with self._lock:
+            finished = self._counters["completed"] + self._counters["failed"]
+            return dict(
+                self._counters,
+                running=self._running,
+                queue_depth=self._waiting,
+                max_concurrency=self.max_concurrency,
+                max_queue=self.max_queue,
+                wait_seconds_avg=self._counters["wait_seconds_total"] / finished if finished else 0.0,
+                run_seconds_avg=self._counters["run_seconds_total"] / finished if finished else 0.0,
+            )
+
+    def _retry_after(self) -> int:
+        # Caller must hold self._lock. Estimate how long until the queue drains by one slot.
+        finished = self._counters["completed"] + self._counters["failed"]
+        avg_run = self._counters["run_seconds_total"] / finished if finished else settings.CREW_RETRY_AFTER
+        return max(1, math.ceil(avg_run * (self._waiting + 1) / self.max_concurrency))
+
+
+# Process-wide executor shared by every endpoint
+crew_executor = CrewExecutor()
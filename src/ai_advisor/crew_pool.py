@@ -0,0 +1,110 @@
+import logging
+import queue
+from contextlib import contextmanager
+from typing import Callable, Iterator, Optional
+
+from crewai import Crew
+
+from src.ai_advisor import settings
+from src.ai_advisor.crew import AiAdvisor
+
+logger = logging.getLogger(__name__)
+
+
+def reset_crew(crew: Crew) -> None:
+    """Clear the per-run state a kickoff leaves on a crew's tasks and agents."""
+    for task in crew.tasks:
+        task.output = None
+        task.used_tools = 0
+        task.tools_errors = 0
+        task.delegations = 0
+    for agent in crew.agents:
+        # Stale tool results would otherwise be checked for result_as_answer on the next run
+        agent.tools_results = []
+
+
+class DiscardTaskOutputs:
+    """
+    Stand-in for crewai's task output log. crewai writes every task output of
+    every kickoff to one SQLite file per user (for ``crewai replay``) and
+    clears it at the start of each kickoff, so concurrent kickoffs would
+    contend on the file and erase each other's entries.
+    """
+
+    def update(self, task_index, log):
+        pass
+
+    def add(self, *args, **kwargs):
+        pass
+
+    def reset(self):
+        pass
+
+    def load(self):
+        return []
+
+
+def build_serving_crew() -> Crew:
+    """Build a crew whose kickoffs leave nothing behind outside the returned result."""
+    crew = AiAdvisor().crew()
+    crew._task_output_handler = DiscardTaskOutputs()
+    return crew
+
+
+def skip_first_run_prompt() -> None:
+    """
+    Mark crewai's first-run trace prompt as answered. On a user's first
+    kickoff crewai otherwise asks on stdin (waiting up to 20 seconds) whether
+    to show execution traces, once per concurrent kickoff.
+    """
+    try:
+        from crewai.events.listeners.tracing.utils import mark_first_execution_done
+    except ImportError:
+        # crewai releases before the trace prompt (such as the locked 0.108) never ask
+        return
+    try:
+        mark_first_execution_done()
+    except OSError as e:
+        logger.warning(f"Could not mark crewai's first run as done: {e}")
+
+
+class CrewPool:
+    """Pool of ready-to-run AiAdvisor crews.
+
+    Building a crew re-reads the agent/task YAML and constructs every Agent,
+    Task and tool, so crews are built ahead of time and reused. Each crew is
+    checked out by one kickoff at a time and reset before it goes back to the
+    pool; a crew whose kickoff raised is discarded instead.
+    """
+
+    def __init__(self, size: int = settings.CREW_MAX_CONCURRENCY,
+                 factory: Optional[Callable[[], Crew]] = None):
+        self.size = size
+        self._factory = factory or build_serving_crew
+        self._idle: "queue.LifoQueue[Crew]" = queue.LifoQueue()
+
+    def warm_up(self) -> None:
+        """Fill the pool so the first requests don't pay for building crews."""
+        while self._idle.qsize() < self.size:
+            self._idle.put(self._factory())
+        logger.info(f"Crew pool warmed up with {self.size} crews")
+
+    @contextmanager
+    def crew(self) -> Iterator[Crew]:
+        """Check out a crew for one kickoff."""
+        try:
+            crew = self._idle.get_nowait()
+        except queue.Empty:
+            crew = self._factory()
+
+        # If the kickoff raises, the crew is simply dropped
+        yield crew
+        reset_crew(crew)
+        if self._idle.qsize() < self.size:
+            self._idle.put(crew)
+
+
+# Process-wide pool, sized to match the number of concurrent kickoffs; pooled
+# kickoffs serve requests, so they must never wait on the console
+skip_first_run_prompt()
+crew_pool = CrewPool()
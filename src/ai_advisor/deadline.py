@@ -0,0 +1,162 @@
+"""Per-request deadlines, carried through the crew run.
+
+/recommend-courses gives every request a Deadline (``settings.REQUEST_TIMEOUT``
+seconds, or less with an ``X-Request-Timeout`` header) and sets it for the
+current context with deadline_scope. The crew executor runs kickoffs in a copy
+of the caller's context, so the LLM call, the tool calls and the bulletin
+fetches made for the request all see it, and each blocking call caps its own
+timeout to the time left:
+
+    with deadline_scope(Deadline.after(30)):
+        ...
+        response = session.get(url, timeout=capped_timeout(10.0))
+
+capped_timeout (and check_deadline) raise DeadlineExceeded once the deadline
+has passed, so a run that is out of time stops at its next LLM call, tool call
+or fetch. Blocking work can't be interrupted from another thread, so a
+cancelled Deadline, e.g. of a client that disconnected, stops it the same way.
+"""
+import asyncio
+import math
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Awaitable, Iterator, Optional
+
+from src.ai_advisor import settings
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised at a checkpoint when the request's deadline has passed or its work was cancelled."""
+
+
+class ClientDisconnected(Exception):
+    """Raised by cancel_on_disconnect when the client went away before the work finished."""
+
+
+class Deadline:
+    """A point in time (on the monotonic clock) by which a request's work must finish."""
+
+    def __init__(self, expires_at: float = math.inf):
+        self.expires_at = expires_at
+        self._cancelled = threading.Event()
+
+    @classmethod
+    def after(cls, seconds: float) -> "Deadline":
+        return cls(time.monotonic() + seconds)
+
+    def remaining(self) -> float:
+        """Seconds left, 0 once the deadline has passed or was cancelled (inf for no deadline)."""
+        if self.cancelled:
+            return 0.0
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def cancel(self) -> None:
+        self._cancelled.set()
+
+    def extend_to(self, expires_at: float) -> None:
+        """Push the deadline out to ``expires_at`` if that is later, e.g. for work shared by several requests."""
+        self.expires_at = max(self.expires_at, expires_at)
+
+    def check(self) -> None:
+        """Raise DeadlineExceeded if the deadline has passed or was cancelled."""
+        if self.cancelled:
+            raise DeadlineExceeded("Request was cancelled")
+        if time.monotonic() >= self.expires_at:
+            raise DeadlineExceeded("Request deadline exceeded")
+
+
+_current: ContextVar[Optional[Deadline]] = ContextVar("ai_advisor_deadline", default=None)
+
+
+def current_deadline() -> Optional[Deadline]:
+    """The Deadline of the request running in the current context, if it has one."""
+    return _current.get()
+
+
+@contextmanager
+def deadline_scope(deadline: Optional[Deadline]) -> Iterator[Optional[Deadline]]:
+    """Make ``deadline`` the current context's deadline inside this block."""
+    token = _current.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current.reset(token)
+
+
+def request_deadline(timeout: Optional[float] = None) -> Deadline:
+    """
+    Deadline of a new request that asked for ``timeout`` seconds (e.g. from
+    its X-Request-Timeout header), at most settings.REQUEST_TIMEOUT_MAX;
+    settings.REQUEST_TIMEOUT when it didn't ask.
+    """
+    if timeout is None or not timeout > 0:
+        timeout = settings.REQUEST_TIMEOUT
+    return Deadline.after(min(timeout, settings.REQUEST_TIMEOUT_MAX))
+
+
+def check_deadline() -> None:
+    """Raise DeadlineExceeded if the current request is out of time; a no-op outside a request."""
+    deadline = _current.get()
+    if deadline is not None:
+        deadline.check()
+
+
+def capped_timeout(timeout: Optional[float]) -> Optional[float]:
+    """
+    ``timeout`` for a blocking call, cut down to the current request's time
+    left (``timeout`` None means no limit of its own).
+
+    Raises:
+        DeadlineExceeded: if no time is left
+    """
+    deadline = _current.get()
+    if deadline is None:
+        return timeout
+    deadline.check()
+    remaining = deadline.remaining()
+    if math.isinf(remaining):
+        return timeout
+    return remaining if timeout is None else min(timeout, remaining)
+
+
+async def cancel_on_disconnect(request: Any, awaitable: Awaitable[Any]) -> Any:
+    """
+    Await ``awaitable`` while watching the Starlette ``request`` for a
+    disconnect. If the client goes away first, the work is cancelled, along
+    with the current Deadline so threads working for the request stop at
+    their next checkpoint, and ClientDisconnected is raised.
+
+    The request body must have been read already.
+    """
+    work = asyncio.ensure_future(awaitable)
+    watcher = asyncio.ensure_future(_wait_for_disconnect(request))
+    try:
+        await asyncio.wait({work, watcher}, return_when=asyncio.FIRST_COMPLETED)
+    except asyncio.CancelledError:
+        work.cancel()
+        raise
+    finally:
+        watcher.cancel()
+    if work.done():
+        return work.result()
+
+    work.cancel()
+    deadline = _current.get()
+    if deadline is not None:
+        deadline.cancel()
+    raise ClientDisconnected()
+
+
+async def _wait_for_disconnect(request):
+    while (await request.receive())["type"] != "http.disconnect":
+        pass
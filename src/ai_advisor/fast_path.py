@@ -0,0 +1,151 @@
+import logging
+import random
+from typing import Any, Dict, List, Optional
+
+from src.ai_advisor.main import fillInCourses
+from src.ai_advisor.course_table import generic_slot_type
+from src.ai_advisor.plan_of_study import find_semester_plans, get_suggested_plan_of_study
+from src.ai_advisor.prerequisites import prune_dependents
+from src.ai_advisor.program_index import plan_of_study_url
+
+logger = logging.getLogger(__name__)
+
+MAX_SEMESTER = 8
+
+
+def parse_semester(semester) -> Optional[int]:
+    """Return the semester as an int in 1..MAX_SEMESTER, or None if it isn't a plain semester number."""
+    try:
+        number = int(str(semester).strip())
+    except ValueError:
+        return None
+    if 1 <= number <= MAX_SEMESTER:
+        return number
+    return None
+
+
+def plan_courses_to_recommendations(plan_courses: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Convert plan of study rows into the course shape the crew returns."""
+    return [
+        {
+            'code': course['course_code'],
+            'name': course['course_name'],
+            'credits': course['credit_hours'],
+        }
+        for course in plan_courses
+    ]
+
+
+def load_plan_of_study(major: str) -> Optional[List[Dict[str, Any]]]:
+    """Resolve the plan URL for a major and return its (cached) parsed plan, or None if there is no URL."""
+    url = plan_of_study_url(major)
+    if not url or not url.startswith("http"):
+        logger.info(f"No plan of study URL for {major}")
+        return None
+    return get_suggested_plan_of_study(major, url)
+
+
+def semester_courses_from_plan(plan_of_study: Optional[List[Dict[str, Any]]], major: str,
+                               semester) -> Optional[List[Dict[str, Any]]]:
+    """
+    Pick a semester's courses out of an already loaded plan of study, in the
+    shape the crew returns and before generic slots are filled in.
+
+    Returns:
+        The course list, or None when the plan cannot answer the request
+        unambiguously and the caller should fall back to the crew.
+    """
+    semester_number = parse_semester(semester)
+    if semester_number is None:
+        logger.info(f"Semester {semester!r} is not a plain semester number, deferring to the crew")
+        return None
+    if not plan_of_study:
+        logger.info(f"No plan of study for {major}, deferring to the crew")
+        return None
+
+    semester_plans = find_semester_plans(plan_of_study, semester_number)
+    if len(semester_plans) != 1 or not semester_plans[0]["courses"]:
+        logger.info(f"Plan of study for {major} has no single entry for semester {semester_number}, deferring to the crew")
+        return None
+
+    return plan_courses_to_recommendations(prune_dependents(semester_plans[0]["courses"]))
+
+
+def recommend_from_loaded_plan(plan_of_study: Optional[List[Dict[str, Any]]], major: str,
+                               semester, seed: Optional[int] = None) -> Optional[List[Dict[str, Any]]]:
+    """
+    Answer a request from an already loaded plan of study.
+
+    Returns:
+        The filled-in course list, or None when the plan cannot answer the request
+        unambiguously and the caller should fall back to the crew.
+    """
+    courses = semester_courses_from_plan(plan_of_study, major, semester)
+    if courses is None:
+        return None
+    return fillInCourses(courses, major, seed=seed)
+
+
+def recommend_from_plan(major: str, semester, seed: Optional[int] = None) -> Optional[List[Dict[str, Any]]]:
+    """
+    Answer a "major X, semester N" request straight from the suggested plan of study.
+
+    Resolves the plan URL from the program index, reads the semester from the
+    (cached) parsed plan and fills in generic slots with fillInCourses, without
+    calling the LLM.
+
+    Returns:
+        The filled-in course list, or None when the plan cannot answer the request
+        unambiguously and the caller should fall back to the crew.
+    """
+    # Check the semester before doing any lookups
+    if parse_semester(semester) is None:
+        logger.info(f"Semester {semester!r} is not a plain semester number, deferring to the crew")
+        return None
+    return recommend_from_loaded_plan(load_plan_of_study(major), major, semester, seed)
+
+
+def semester_number(year: int, term: str) -> Optional[int]:
+    """Inverse of semester_to_year_term; None for terms outside the Fall/Spring sequence."""
+    if term == "Fall":
+        return 2 * year - 1
+    if term == "Spring":
+        return 2 * year
+    return None
+
+
+def recommend_full_plan(major: str, seed: Optional[int] = None) -> Optional[List[Dict[str, Any]]]:
+    """
+    Answer every semester of a major's plan of study at once.
+
+    The plan is loaded once, and generic slots across all terms are filled from
+    one shared set of taken courses, so no elective is recommended twice and
+    none repeats a course the plan already requires.
+
+    Returns:
+        One entry per term of the plan ({"semester", "year", "term", "courses"}),
+        or None when the major has no plan of study.
+    """
+    plan_of_study = load_plan_of_study(major)
+    if not plan_of_study:
+        logger.info(f"No plan of study for {major}, cannot build a full plan")
+        return None
+
+    terms = [prune_dependents(semester_plan["courses"]) for semester_plan in plan_of_study]
+    taken = {
+        course["course_code"].strip()
+        for courses in terms for course in courses
+        if generic_slot_type(course["course_code"]) is None
+    }
+    # One seed per term drawn from the request's, so terms don't all shortlist alike
+    rng = random.Random(seed)
+    seeds = [rng.getrandbits(64) for _ in terms]
+    return [
+        {
+            "semester": semester_number(semester_plan["year"], semester_plan["semester"]),
+            "year": semester_plan["year"],
+            "term": semester_plan["semester"],
+            "courses": fillInCourses(plan_courses_to_recommendations(courses), major, taken, term_seed),
+        }
+        for semester_plan, courses, term_seed in zip(plan_of_study, terms, seeds)
+    ]
@@ -0,0 +1,131 @@
+import logging
+import random
+import threading
+import time
+from typing import Dict, NamedTuple, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from src.ai_advisor import settings
+from src.ai_advisor.deadline import capped_timeout, current_deadline
+from src.ai_advisor.metrics import span
+
+logger = logging.getLogger(__name__)
+
+# Statuses worth retrying: the server is overloaded or briefly unavailable
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+class HostBusy(requests.exceptions.RequestException):
+    """Raised when no per-host request slot frees up in time."""
+
+
+class FetchResult(NamedTuple):
+    status: int
+    # None when the server answered 304 Not Modified
+    content: Optional[bytes]
+    etag: Optional[str]
+    last_modified: Optional[str]
+
+    @property
+    def not_modified(self) -> bool:
+        return self.status == 304
+
+
+class BulletinClient:
+    """Shared HTTP client for bulletin pages.
+
+    One pooled keep-alive session serves every fetch, with connect/read
+    timeouts, bounded retries with jittered exponential backoff, a cap on
+    concurrent requests per host, and conditional GETs via ETag and
+    Last-Modified.
+    """
+
+    def __init__(self,
+                 connect_timeout: float = settings.BULLETIN_CONNECT_TIMEOUT,
+                 read_timeout: float = settings.BULLETIN_READ_TIMEOUT,
+                 max_retries: int = settings.BULLETIN_MAX_RETRIES,
+                 backoff: float = settings.BULLETIN_BACKOFF,
+                 per_host_limit: int = settings.BULLETIN_PER_HOST_LIMIT,
+                 pool_size: int = settings.BULLETIN_POOL_SIZE):
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.per_host_limit = per_host_limit
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._host_slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._host_slots_lock = threading.Lock()
+
+    @span("bulletin_fetch")
+    def fetch(self, url: str, etag: Optional[str] = None, last_modified: Optional[str] = None) -> FetchResult:
+        """
+        GET ``url``, revalidating with ``etag``/``last_modified`` when given.
+
+        Raises:
+            requests.exceptions.RequestException: after the last retry fails,
+                or for a non-retryable error status
+            DeadlineExceeded: when the current request runs out of time; its
+                timeouts are capped to the time it has left
+        """
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+
+        attempt = 0
+        while True:
+            try:
+                response = self._get(url, headers)
+                if response.status_code not in RETRY_STATUSES:
+                    break
+                error = requests.exceptions.HTTPError(f"{response.status_code} from {url}", response=response)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                error = e
+            if attempt >= self.max_retries:
+                raise error
+            delay = self.backoff * (2 ** attempt) * random.uniform(0.5, 1.5)
+            # No point waiting to retry if the request will be out of time by then
+            deadline = current_deadline()
+            if deadline is not None and deadline.remaining() <= delay:
+                raise error
+            attempt += 1
+            logger.warning(f"Retrying {url} in {delay:.2f}s after: {error}")
+            time.sleep(delay)
+
+        if response.status_code == 304:
+            return FetchResult(304, None, etag, last_modified)
+        response.raise_for_status()
+        return FetchResult(
+            response.status_code,
+            response.content,
+            response.headers.get("ETag"),
+            response.headers.get("Last-Modified"),
+        )
+
+    def _get(self, url, headers):
+        slots = self._slots_for(urlsplit(url).netloc)
+        # Don't queue behind a hung host for longer than a request could take
+        if not slots.acquire(timeout=capped_timeout(sum(self.timeout))):
+            raise HostBusy(f"Too many concurrent requests to {urlsplit(url).netloc}")
+        try:
+            timeout = tuple(capped_timeout(limit) for limit in self.timeout)
+            return self.session.get(url, headers=headers, timeout=timeout)
+        finally:
+            slots.release()
+
+    def _slots_for(self, host):
+        with self._host_slots_lock:
+            slots = self._host_slots.get(host)
+            if slots is None:
+                slots = self._host_slots[host] = threading.BoundedSemaphore(self.per_host_limit)
+            return slots
+
+
+# Process-wide client so every fetch reuses pooled connections
+bulletin_client = BulletinClient()
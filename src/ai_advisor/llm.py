@@ -0,0 +1,86 @@
+"""The crew's LLM.
+
+crewai (and litellm under it) takes seconds to import, so nothing here is
+imported or constructed until a crew actually needs the LLM; the
+deterministic endpoints never pay for it.
+
+Agents change their LLM while running (crewai sets its stop words and
+callbacks), so every crew gets its own instance from build_llm instead of
+sharing one; only the configuration and the completion cache are shared.
+That also lets each call cap the LLM's timeout to its request's deadline.
+"""
+import logging
+
+from crewai import LLM
+
+from src.ai_advisor.deadline import capped_timeout
+from src.ai_advisor.llm_cache import LLMCacheMiss, completion_key, llm_cache
+from src.ai_advisor.metrics import span
+
+logger = logging.getLogger(__name__)
+
+# Seconds to wait for a completion, less when the request has less time left
+TIMEOUT = 120
+
+# Completion parameters that change what the model returns; transport
+# settings such as timeouts and API keys are left out of the cache key
+_KEY_PARAMS = (
+    "temperature", "top_p", "n", "stop", "max_tokens", "max_completion_tokens",
+    "presence_penalty", "frequency_penalty", "logit_bias", "response_format",
+    "seed", "logprobs", "top_logprobs", "reasoning_effort",
+)
+
+
+class CachingLLM(LLM):
+    """crewai LLM whose plain-text completions go through llm_cache.
+
+    Calls that hand the LLM functions to execute (native tool calling) are
+    never cached, since their result depends on running the functions.
+    Raises DeadlineExceeded instead of calling when the request is out of time.
+    """
+
+    @span("llm")
+    def call(self, messages, tools=None, callbacks=None, available_functions=None, **kwargs):
+        # Newer crewai releases also pass from_task/from_agent; forward only
+        # what the caller gave, since older ones don't accept them
+        self.timeout = capped_timeout(TIMEOUT)
+        cache = llm_cache
+        if cache.mode == "off" or available_functions:
+            return super().call(messages, tools=tools, callbacks=callbacks,
+                                available_functions=available_functions, **kwargs)
+
+        key = completion_key(self.model, self._cache_params(), messages, tools)
+        cached = cache.get(key)
+        if cached is not None:
+            logger.debug(f"LLM cache hit for {self.model} ({key[:12]})")
+            return cached
+        if cache.mode == "replay":
+            raise LLMCacheMiss(f"No recorded completion for {self.model} ({key[:12]})")
+
+        response = super().call(messages, tools=tools, callbacks=callbacks,
+                                available_functions=available_functions, **kwargs)
+        if isinstance(response, str) and response:
+            cache.set(key, self.model, response)
+        return response
+
+    def _cache_params(self):
+        params = {name: getattr(self, name, None) for name in _KEY_PARAMS}
+        params.update(self.additional_params)
+        return {name: value for name, value in params.items() if value is not None}
+
+
+def build_llm() -> CachingLLM:
+    """Return a new crew LLM, for one crew's exclusive use."""
+    # Advanced configuration with detailed parameters; completions
+    # are recorded and replayed through llm_cache.py
+    return CachingLLM(
+        model="openai/gpt-4o-mini",
+        temperature=0.8,        # Higher for more creative outputs
+        timeout=TIMEOUT,       # Seconds to wait for response
+        max_tokens=4000,       # Maximum length of response
+        top_p=0.9,            # Nucleus sampling parameter
+        frequency_penalty=0.1, # Reduce repetition
+        presence_penalty=0.1,  # Encourage topic diversity
+        # response_format={"type": "json"},  # For structured outputs
+        seed=42               # For reproducible results
+    )
@@ -0,0 +1,87 @@
+"""Record/replay cache for LLM completions.
+
+CachingLLM (see llm.py) answers a completion from the cache when the same
+model, sampling parameters, messages and tool schema have been seen before,
+so repeated prompts cost a SQLite lookup instead of an API round trip. The cache runs in
+one of three modes (``settings.LLM_CACHE_MODE``):
+
+    off      every call goes to the provider (the default)
+    record   answer from the cache when possible, store every new completion
+    replay   answer only from the cache and raise LLMCacheMiss otherwise, so a
+             recorded run can be repeated with no network or API key
+"""
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from src.ai_advisor import settings
+
+logger = logging.getLogger(__name__)
+
+MODES = ("off", "record", "replay")
+
+
+class LLMCacheMiss(LookupError):
+    """Raised in replay mode when a completion was never recorded."""
+
+
+def completion_key(model: str, params: Dict[str, Any], messages, tools: Optional[List[dict]] = None) -> str:
+    """Hash everything that determines a completion into a stable cache key."""
+    if isinstance(messages, str):
+        messages = [{"role": "user", "content": messages}]
+    payload = {"model": model, "params": params, "messages": messages, "tools": tools or []}
+    encoded = json.dumps(payload, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class LLMCache:
+    """SQLite-backed store of completions keyed by completion_key."""
+
+    def __init__(self, path: str = settings.LLM_CACHE_PATH, mode: str = settings.LLM_CACHE_MODE):
+        if mode not in MODES:
+            raise ValueError(f"Unknown LLM cache mode {mode!r}, expected one of {MODES}")
+        self.path = path
+        self.mode = mode
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0, "stores": 0}
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT response FROM completions WHERE key = ?", (key,)).fetchone()
+            self._counters["hits" if row else "misses"] += 1
+        return row[0] if row else None
+
+    def set(self, key: str, model: str, response: str) -> None:
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO completions (key, model, response, created_at) VALUES (?, ?, ?, ?)",
+                    (key, model, response, time.time()))
+            self._counters["stores"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self._counters, mode=self.mode)
+
+    def _connection(self):
+        # Caller must hold self._lock
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS completions ("
+                "key TEXT PRIMARY KEY, model TEXT, response TEXT NOT NULL, created_at REAL)")
+        return self._conn
+
+
+# Process-wide cache shared by every CachingLLM
+llm_cache = LLMCache()
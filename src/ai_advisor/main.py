@@ -1,59 +1,42 @@
 #!/usr/bin/env python
-import json
+import logging
 import sys
 import warnings
 from datetime import datetime
-import csv
-import os
-import random
 
-# Import both approaches
-from src.ai_advisor.crew import AiAdvisor  # Original CrewAI approach
+# The preloaded course catalog; the crew pool (and with it crewai) is only
+# imported by the functions that run a crew
+from src.ai_advisor.course_table import generic_slot_type, get_course_table
+from src.ai_advisor.course_vectors import SlotFiller
+from src.ai_advisor.llm_cache import llm_cache
+from src.ai_advisor.metrics import span
+from src.ai_advisor.prerequisites import prerequisite_instructions, prune_dependents
+from src.ai_advisor.structured_output import RecommendationFormatError, parse_recommendations, reask_format
+from src.ai_advisor.transcripts import transcript_sink
 
-warnings.filterwarnings("ignore", category=SyntaxWarning, module="pysbd")
+logger = logging.getLogger(__name__)
 
-def format_result(result):
-    """Clean up result by removing markdown code block delimiters if present."""
-    if isinstance(result, str):
-        # Remove markdown code block formatting if present
-        if result.startswith("```") and result.endswith("```"):
-            # Find the first newline to skip the ```json line
-            first_newline = result.find("\n")
-            if first_newline != -1:
-                # Remove opening ```json and closing ```
-                result = result[first_newline+1:-3].strip()
-    
-    return result
+warnings.filterwarnings("ignore", category=SyntaxWarning, module="pysbd")
 
-def fillInCourses(result, major):
+@span("fill_courses")
+def fillInCourses(result, major, taken=None, seed=None, context=None):
     """
     Fill in the courses for the major by looking up details from the courses.csv file.
-    For generic course types (Elective, STEM, etc.), select a random matching course.
+    For generic course types (Elective, STEM, etc.), select the matching course
+    most relevant to the major and the other courses in context (result by
+    default), never one already in the request. When a set of course codes is
+    passed as taken, generic slots also avoid those courses and every pick is
+    added to it, so several calls can share it without repeating a course.
+    The same seed gives the same picks.
     """
-    # Get the root directory path
-    root_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-    courses_csv_path = os.path.join(root_dir, 'knowledge', 'courses.csv')
-    
-    # Load courses from CSV by fulfillment type
-    courses_by_type = {
-        'Elective': [],
-        'STEM Cognate': [],
-        'Language': [],
-        'People and Society Cognate': [],
-        'Arts and Humanities Cognate': []
-    }
-    
-    with open(courses_csv_path, 'r') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            fulfillment = row['fullfillment_type'].strip()
-            if fulfillment in courses_by_type:
-                courses_by_type[fulfillment].append(row)
+    # Shared, preloaded view of courses.csv; no file I/O on the request path
+    course_table = get_course_table()
+    filler = None
     
     courses = []
     try:
         for course in result:
-            print(course)
+            logger.debug(f"Filling in course: {course}")
             
             # Try to get course code with different key names
             try:
@@ -64,57 +47,14 @@ def fillInCourses(result, major):
                 # If any other KeyError occurs
                 course_code = ''
             
-            # Handle generic course types by selecting a random matching course
-            if 'Elective' in course_code:
-                if courses_by_type['Elective']:
-                    random_course = random.choice(courses_by_type['Elective'])
-                    courses.append({
-                        'code': random_course['course_code'],
-                        'name': random_course['course_name'],
-                        'description': random_course['description'],
-                        'credits': random_course['credits'],
-                        'fulfillment_type': random_course['fullfillment_type']
-                    })
-            elif 'STEM' in course_code:
-                if courses_by_type['STEM Cognate']:
-                    random_course = random.choice(courses_by_type['STEM Cognate'])
-                    courses.append({
-                        'code': random_course['course_code'],
-                        'name': random_course['course_name'],
-                        'description': random_course['description'],
-                        'credits': random_course['credits'],
-                        'fulfillment_type': random_course['fullfillment_type']
-                    })
-            elif 'Language' in course_code:
-                if courses_by_type['Language']:
-                    random_course = random.choice(courses_by_type['Language'])
-                    courses.append({
-                        'code': random_course['course_code'],
-                        'name': random_course['course_name'],
-                        'description': random_course['description'],
-                        'credits': random_course['credits'],
-                        'fulfillment_type': random_course['fullfillment_type']
-                    })
-            elif 'People and Society' in course_code:
-                if courses_by_type['People and Society Cognate']:
-                    random_course = random.choice(courses_by_type['People and Society Cognate'])
-                    courses.append({
-                        'code': random_course['course_code'],
-                        'name': random_course['course_name'],
-                        'description': random_course['description'],
-                        'credits': random_course['credits'],
-                        'fulfillment_type': random_course['fullfillment_type']
-                    })
-            elif 'Arts and Humanities' in course_code:
-                if courses_by_type['Arts and Humanities Cognate']:
-                    random_course = random.choice(courses_by_type['Arts and Humanities Cognate'])
-                    courses.append({
-                        'code': random_course['course_code'],
-                        'name': random_course['course_name'],
-                        'description': random_course['description'],
-                        'credits': random_course['credits'],
-                        'fulfillment_type': random_course['fullfillment_type']
-                    })
+            # Handle generic course types by selecting the most relevant matching course
+            fulfillment_type = generic_slot_type(course_code)
+            if fulfillment_type is not None:
+                if filler is None:
+                    filler = SlotFiller(major, result if context is None else context, taken, seed)
+                choice = filler.pick(course_table.of_type(fulfillment_type))
+                if choice is not None:
+                    courses.append(choice.as_response())
             else:
                 # Include specific courses as they are but ensure consistent field names
                 processed_course = {}
@@ -152,6 +92,46 @@ def fillInCourses(result, major):
         print(f"KeyError occurred: {e}")
         return []
 
+def crew_recommendations(major, semester):
+    """
+    Run the crew for a major and semester and return the parsed course list,
+    before generic slots are filled in.
+    Blocks for the whole LLM run; async callers should go through crew_executor.
+    """
+    from src.ai_advisor.crew_pool import crew_pool
+    
+    # Each kickoff has its own crew and LLM; a sampled few are transcribed
+    with transcript_sink.recording(major=major, semester=semester) as transcript, crew_pool.crew() as crew:
+        with span("crew_kickoff"):
+            result = crew.kickoff(inputs={
+                'major': major,
+                'semester': semester,
+                'prerequisite_instructions': prerequisite_instructions()
+            })
+        if transcript is not None:
+            transcript["output"] = result.raw
+    
+        # Validate against the course schema, repairing near-miss JSON; only
+        # output that can't be repaired is sent back for reformatting, through
+        # this crew's LLM while the crew is still checked out
+        try:
+            with span("output_parse"):
+                courses = parse_recommendations(result.raw)
+        except RecommendationFormatError as e:
+            logger.warning(f"Re-asking for formatting of crew output for {major}, semester {semester}: {e}")
+            with span("format_reask"):
+                courses = reask_format(result.raw, crew.agents[0].llm)
+
+    # The prerequisite check is done here rather than left to the prompt
+    with span("prerequisite_check"):
+        return prune_dependents(courses)
+
+def recommend_with_crew(major, semester):
+    """
+    Run the crew for a major and semester and return the filled-in course list.
+    """
+    return fillInCourses(crew_recommendations(major, semester), major)
+
 def run():
     """
     Run the original CrewAI-based approach but with a student query.
@@ -160,21 +140,77 @@ def run():
     semester = "3"
     
     try:
-        
-        result = AiAdvisor().crew().kickoff(inputs={
-            'major': major,
-            'semester': semester
-        })
+        final_courses = recommend_with_crew(major, semester)
         
         print("\nRecommendation Results:")
-        # print(format_result(result))
-        formatted_result = format_result(result.raw)
-        courses = json.loads(formatted_result)
-        final_courses = fillInCourses(courses, major)
         print(final_courses)
         
     except Exception as e:
         raise Exception(f"An error occurred while processing the query: {e}")
 
+def train():
+    """
+    Train the crew for a given number of iterations.
+    Usage: train <n_iterations> <filename>
+    """
+    from src.ai_advisor.crew_pool import crew_pool
+    
+    inputs = {
+        'major': "B.S. in Computer Science",
+        'semester': "3",
+        'prerequisite_instructions': prerequisite_instructions()
+    }
+    try:
+        with crew_pool.crew() as crew:
+            crew.train(n_iterations=int(sys.argv[1]), filename=sys.argv[2], inputs=inputs)
+    
+    except Exception as e:
+        raise Exception(f"An error occurred while training the crew: {e}")
+
+def replay():
+    """
+    Re-run a query using only recorded LLM completions, with no API calls.
+    Usage: replay [major] [semester]
+    Fails if any completion the run needs was never recorded.
+    """
+    major = sys.argv[1] if len(sys.argv) > 1 else "B.S. in Computer Science"
+    semester = sys.argv[2] if len(sys.argv) > 2 else "3"
+    llm_cache.mode = "replay"
+    
+    try:
+        final_courses = recommend_with_crew(major, semester)
+        
+        print("\nReplayed Recommendation Results:")
+        print(final_courses)
+        
+    except Exception as e:
+        raise Exception(f"An error occurred while replaying the query: {e}")
+
+def test():
+    """
+    Check that recorded queries still produce recommendations, offline.
+    Usage: test [major:semester ...]
+    Replays each query from the LLM cache and exits non-zero if any fails or
+    comes back empty. Record the queries first with a normal run
+    with AI_ADVISOR_LLM_CACHE=record.
+    """
+    queries = [arg.rsplit(":", 1) for arg in sys.argv[1:]] or [("B.S. in Computer Science", "3")]
+    llm_cache.mode = "replay"
+    
+    failures = 0
+    for major, semester in queries:
+        try:
+            courses = recommend_with_crew(major, semester)
+            status = "ok" if courses else "empty"
+        except Exception as e:
+            courses, status = [], f"error: {e}"
+        if status != "ok":
+            failures += 1
+        print(f"{major}, semester {semester}: {status} ({len(courses)} courses)")
+    
+    print(f"\n{len(queries) - failures}/{len(queries)} queries passed")
+    if failures:
+        sys.exit(1)
+
 if __name__ == "__main__":
-    run()
\ No newline at end of file
+    run()
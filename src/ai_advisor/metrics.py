@@ -0,0 +1,234 @@
+"""Stage timing spans and Prometheus metrics.
+
+Each stage of a recommendation runs inside ``span(stage)``, which records
+its duration in the ``ai_advisor_stage_seconds`` histogram and, while a
+request is being served, in that request's timing breakdown:
+
+    with span("bulletin_fetch"):
+        ...
+
+TimingMiddleware opens a breakdown for every HTTP request and returns it in
+a ``Server-Timing`` header (durations in milliseconds, summed per stage).
+render_prometheus renders every histogram, along with the crew and cache
+counters and gauges, in the Prometheus text format for the /metrics endpoint.
+"""
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Seconds; spans range from sub-millisecond index lookups to multi-minute crew runs
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+                   1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+
+class Histogram:
+    """Cumulative-bucket histogram with labels, rendered in Prometheus text format."""
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[Tuple[str, ...], List] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = tuple(str(labels.get(name, "")) for name in self.label_names)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                # Per-bucket (non-cumulative) counts, with a final +Inf slot, then sum
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = sorted((key, list(counts), total) for key, (counts, total) in self._series.items())
+        for key, counts, total in series:
+            labels = [f'{name}="{_escape(value)}"' for name, value in zip(self.label_names, key)]
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = 'le="+Inf"' if bound == float("inf") else f'le="{bound!r}"'
+                lines.append(f"{self.name}_bucket{{{','.join(labels + [le])}}} {cumulative}")
+            suffix = "{" + ",".join(labels) + "}" if labels else ""
+            lines.append(f"{self.name}_sum{suffix} {total}")
+            lines.append(f"{self.name}_count{suffix} {cumulative}")
+        return lines
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+stage_seconds = Histogram(
+    "ai_advisor_stage_seconds",
+    "Time spent in each stage of a recommendation",
+    ("stage",),
+)
+request_seconds = Histogram(
+    "ai_advisor_request_seconds",
+    "HTTP request latency by route and status",
+    ("method", "route", "status"),
+)
+
+_request_timings: ContextVar[Optional[Dict[str, float]]] = ContextVar("request_timings", default=None)
+_timings_lock = threading.Lock()
+
+
+def record_stage(stage: str, seconds: float) -> None:
+    """Record a stage duration measured elsewhere, as if it had run in a span."""
+    stage_seconds.observe(seconds, stage=stage)
+    timings = _request_timings.get()
+    if timings is not None:
+        # Stages of one request can run on several threads (e.g. batch groups)
+        with _timings_lock:
+            timings[stage] = timings.get(stage, 0.0) + seconds
+
+
+@contextmanager
+def span(stage: str) -> Iterator[None]:
+    """Time the enclosed block as ``stage``. Also usable as a function decorator."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_stage(stage, time.perf_counter() - started)
+
+
+def format_server_timing(timings: Dict[str, float]) -> str:
+    """Render a stage -> seconds breakdown as a Server-Timing header value."""
+    return ", ".join(f"{stage};dur={seconds * 1000:.1f}" for stage, seconds in timings.items())
+
+
+# Kind and help text of the stats exported by /metrics, by group and stat
+# name. Counters only ever go up and are exported with a _total suffix; stats
+# not listed here are exported as gauges
+STAT_METRICS: Dict[str, Dict[str, Tuple[str, str]]] = {
+    "crew": {
+        "completed": ("counter", "Crew kickoffs that finished"),
+        "failed": ("counter", "Crew kickoffs that raised"),
+        "rejected": ("counter", "Crew kickoffs rejected because the queue was full"),
+        "wait_seconds_total": ("counter", "Time crew kickoffs spent waiting for a slot"),
+        "run_seconds_total": ("counter", "Time crew kickoffs spent running"),
+        "wait_seconds_max": ("gauge", "Longest wait of a crew kickoff for a slot"),
+        "run_seconds_max": ("gauge", "Longest crew kickoff run"),
+        "wait_seconds_avg": ("gauge", "Average wait of a crew kickoff for a slot"),
+        "run_seconds_avg": ("gauge", "Average crew kickoff run"),
+        "running": ("gauge", "Crew kickoffs running now"),
+        "queue_depth": ("gauge", "Crew kickoffs waiting for a slot"),
+        "max_concurrency": ("gauge", "Most crew kickoffs that may run at once"),
+        "max_queue": ("gauge", "Most crew kickoffs that may wait for a slot"),
+    },
+    "plan_cache": {
+        "hits": ("counter", "Plan lookups answered from this worker's memory"),
+        "shared_hits": ("counter", "Plan lookups answered from the shared cache"),
+        "misses": ("counter", "Plan lookups not in the cache"),
+        "evictions": ("counter", "Plans evicted to stay within the cache size"),
+        "expirations": ("counter", "Plans found expired"),
+        "size": ("gauge", "Plans held in this worker's memory"),
+    },
+    "response_cache": {
+        "hits": ("counter", "Recommendations answered from this worker's memory"),
+        "shared_hits": ("counter", "Recommendations answered from the shared cache"),
+        "misses": ("counter", "Recommendations that started a computation"),
+        "coalesced": ("counter", "Recommendations that joined an in-flight computation"),
+        "evictions": ("counter", "Recommendations evicted to stay within the cache size"),
+        "expirations": ("counter", "Recommendations found expired"),
+        "size": ("gauge", "Recommendations held in this worker's memory"),
+        "inflight": ("gauge", "Recommendations being computed"),
+    },
+    "shared_cache": {
+        "hits": ("counter", "Shared cache reads that found an entry"),
+        "misses": ("counter", "Shared cache reads that found no entry"),
+        "stores": ("counter", "Shared cache writes"),
+        "fills_waited": ("counter", "Fills that waited for another thread or worker"),
+        "leases_taken_over": ("counter", "Fill leases taken over after they expired"),
+    },
+    "llm_cache": {
+        "hits": ("counter", "LLM completions answered from the cache"),
+        "misses": ("counter", "LLM completions not in the cache"),
+        "stores": ("counter", "LLM completions stored"),
+    },
+    "transcripts": {
+        "recorded": ("counter", "Crew transcripts queued for writing"),
+        "written": ("counter", "Crew transcripts written"),
+        "dropped": ("counter", "Crew transcripts dropped because the writer was behind"),
+        "pending": ("gauge", "Crew transcripts waiting to be written"),
+        "sample_rate": ("gauge", "Fraction of crew kickoffs transcribed"),
+    },
+}
+
+
+def render_prometheus(stats: Optional[Dict[str, Dict[str, float]]] = None,
+                      labeled_gauges: Optional[Dict[str, Tuple[str, str, Dict[str, float]]]] = None) -> str:
+    """
+    Render every histogram, plus ``stats`` given as {group: {name: value}}
+    (typed and documented by STAT_METRICS) and ``labeled_gauges`` given as
+    {name: (documentation, label, {label value: value})}, in the Prometheus
+    text exposition format.
+    """
+    lines = stage_seconds.render() + request_seconds.render()
+    for group, values in (stats or {}).items():
+        for name, value in values.items():
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                continue
+            kind, documentation = STAT_METRICS.get(group, {}).get(name, ("gauge", f"{group} {name}"))
+            metric = f"ai_advisor_{group}_{name}"
+            if kind == "counter" and not metric.endswith("_total"):
+                metric += "_total"
+            lines.append(f"# HELP {metric} {documentation}")
+            lines.append(f"# TYPE {metric} {kind}")
+            lines.append(f"{metric} {value}")
+    for name, (documentation, label, values) in (labeled_gauges or {}).items():
+        metric = f"ai_advisor_{name}"
+        lines.append(f"# HELP {metric} {documentation}")
+        lines.append(f"# TYPE {metric} gauge")
+        for label_value, value in values.items():
+            escaped = _escape(label_value)
+            lines.append(f'{metric}{{{label}="{escaped}"}} {value}')
+    return "\n".join(lines) + "\n"
+
+
+class TimingMiddleware:
+    """ASGI middleware that times each HTTP request and adds a Server-Timing header."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        timings: Dict[str, float] = {}
+        token = _request_timings.set(timings)
+        started = time.perf_counter()
+        status = 500
+
+        async def send_with_timing(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                # Streaming responses only report the stages finished before the first byte
+                with _timings_lock:
+                    breakdown = dict(timings, total=time.perf_counter() - started)
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", format_server_timing(breakdown).encode("latin-1")))
+                message = dict(message, headers=headers)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _request_timings.reset(token)
+            # The router records the matched route in the scope; unmatched paths share one series
+            route = getattr(scope.get("route"), "path", "unmatched")
+            request_seconds.observe(time.perf_counter() - started,
+                                    method=scope["method"], route=route, status=str(status))
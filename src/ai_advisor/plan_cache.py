@@ -0,0 +1,148 @@
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from src.ai_advisor import settings
+from src.ai_advisor.shared_cache import SharedCache, shared_cache
+
+logger = logging.getLogger(__name__)
+
+# Namespace of parsed plans in the shared cache
+NAMESPACE = "plan"
+
+
+class PlanCache:
+    """Two-tier cache for parsed plans of study, keyed by bulletin URL.
+
+    The first tier is an in-process LRU bounded by ``max_size`` entries. The
+    second tier is the host's SharedCache, which survives restarts and is
+    shared by every worker. Both tiers expire entries after ``ttl`` seconds.
+
+    Each entry also keeps the ETag/Last-Modified validators of the page it was
+    parsed from, so an expired entry can be revalidated with a conditional
+    request instead of being re-downloaded (see get_stale).
+
+    Cached plans are shared between callers and must be treated as read-only.
+    """
+
+    def __init__(self, max_size: int = settings.PLAN_CACHE_SIZE,
+                 ttl: float = settings.PLAN_CACHE_TTL,
+                 shared: Optional[SharedCache] = shared_cache):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.shared = shared
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = {
+            "hits": 0,
+            "shared_hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "expirations": 0,
+        }
+
+    def get(self, url: str) -> Optional[List[Dict[str, Any]]]:
+        """Return the cached plan for ``url``, or None on a miss."""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is not None:
+                stored_at, plan, _ = entry
+                if now - stored_at < self.ttl:
+                    self._entries.move_to_end(url)
+                    self._counters["hits"] += 1
+                    return plan
+                # Expired entries stay around for get_stale until evicted
+                self._counters["expirations"] += 1
+
+        record = self._read_shared(url)
+        with self._lock:
+            if record is None or now - record["stored_at"] >= self.ttl:
+                self._counters["misses"] += 1
+                return None
+            self._counters["shared_hits"] += 1
+            self._store_memory(url, record["stored_at"], record["plan"], record["validators"])
+        return record["plan"]
+
+    def get_stale(self, url: str) -> Optional[Dict[str, Any]]:
+        """
+        Return the newest entry for ``url`` whether or not it has expired, as a
+        dict with "plan", "stored_at" and "validators" ({"etag", "last_modified"}),
+        or None if there is none.
+        """
+        with self._lock:
+            entry = self._entries.get(url)
+        record = self._read_shared(url)
+        if entry is not None and (record is None or entry[0] >= record["stored_at"]):
+            stored_at, plan, validators = entry
+            return {"plan": plan, "stored_at": stored_at, "validators": validators}
+        return record
+
+    def set(self, url: str, plan: List[Dict[str, Any]],
+            etag: Optional[str] = None, last_modified: Optional[str] = None) -> None:
+        """Store ``plan`` for ``url`` in both tiers, with the validators of the page it came from."""
+        stored_at = time.time()
+        validators = {"etag": etag, "last_modified": last_modified}
+        with self._lock:
+            self._store_memory(url, stored_at, plan, validators)
+        self._write_shared(url, stored_at, plan, validators)
+
+    def reload(self, url: str) -> None:
+        """Replace this worker's in-memory entry for ``url`` with the shared one, after another worker refreshed it."""
+        record = self._read_shared(url)
+        with self._lock:
+            if record is None:
+                self._entries.pop(url, None)
+            else:
+                self._store_memory(url, record["stored_at"], record["plan"], record["validators"])
+
+    def invalidate(self, url: Optional[str] = None) -> None:
+        """Drop ``url`` from both tiers, or everything when no URL is given."""
+        with self._lock:
+            if url is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(url, None)
+        if self.shared:
+            self.shared.delete(NAMESPACE, url)
+
+    def stats(self) -> Dict[str, int]:
+        """Return a snapshot of the hit/miss/eviction counters."""
+        with self._lock:
+            return dict(self._counters, size=len(self._entries))
+
+    def _store_memory(self, url, stored_at, plan, validators):
+        # Caller must hold self._lock
+        self._entries[url] = (stored_at, plan, validators)
+        self._entries.move_to_end(url)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self._counters["evictions"] += 1
+
+    def _read_shared(self, url):
+        if not self.shared:
+            return None
+        entry = self.shared.get_entry(NAMESPACE, url)
+        if entry is None:
+            return None
+        record, stored_at = entry
+        return {
+            "plan": record["plan"],
+            "stored_at": stored_at,
+            "validators": record.get("validators") or {"etag": None, "last_modified": None},
+        }
+
+    def _write_shared(self, url, stored_at, plan, validators):
+        if not self.shared:
+            return
+        try:
+            self.shared.set(NAMESPACE, url, {"plan": plan, "validators": validators}, stored_at)
+        except sqlite3.Error as e:
+            logger.warning(f"Could not write plan cache entry for {url}: {e}")
+
+
+# Process-wide cache shared by every plan of study lookup
+plan_cache = PlanCache()
@@ -0,0 +1,292 @@
+"""Streaming extractor for the bulletin's Suggested Plan of Study grid.
+
+Instead of building a full BeautifulSoup tree for the page, PlanGridExtractor
+listens to html.parser events, ignores everything outside
+``#planofstudytextcontainer table.sc_plangrid`` and emits each semester of the
+plan as soon as its last row has been seen. Parsing stops as soon as the grid
+table is closed.
+"""
+import codecs
+import hashlib
+import logging
+import re
+from html.parser import HTMLParser
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+CONTAINER_ID = "planofstudytextcontainer"
+GRID_CLASS = "sc_plangrid"
+CHUNK_SIZE = 16 * 1024
+
+_CONTAINER_ATTR = re.compile(r"""\bid\s*=\s*["']?""" + CONTAINER_ID + r"""\b""", re.IGNORECASE)
+_GRID_TABLE = re.compile(r"<table\b[^>]*\b" + GRID_CLASS + r"\b.*?</table\s*>", re.IGNORECASE | re.DOTALL)
+_WHITESPACE = re.compile(r"\s+")
+
+_YEAR_NAMES = (
+    (1, ("Year One", "Freshman Year")),
+    (2, ("Year Two", "Sophomore Year")),
+    (3, ("Year Three", "Junior Year")),
+    (4, ("Year Four", "Senior Year")),
+)
+_TERM_NAMES = ("Fall", "Spring", "Summer")
+
+
+def plan_year(text: str) -> Optional[int]:
+    """Return the plan year a year row's text refers to, or None if it isn't recognized."""
+    for year, names in _YEAR_NAMES:
+        if any(name in text for name in names):
+            return year
+    return None
+
+
+def plan_term(text: str) -> Optional[str]:
+    """Return the term a term row's text refers to, or None if it isn't recognized."""
+    for term in _TERM_NAMES:
+        if term in text:
+            return term
+    return None
+
+
+class _Row:
+    __slots__ = ("classes", "text", "cells")
+
+    def __init__(self, classes):
+        self.classes = classes
+        self.text = []
+        # First td per column class -> {"text", "link", "comment"} text fragments
+        self.cells = {}
+
+
+class PlanGridExtractor(HTMLParser):
+    """Event-driven parser that turns the plan grid into plan of study entries.
+
+    Feed it HTML with ``feed()``; completed semester entries accumulate in
+    ``ready`` (drained by the caller) and ``done`` becomes True once the grid
+    table has been closed.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.ready: List[Dict[str, Any]] = []
+        self.done = False
+        # Locating the grid: tag name and nesting count of the container element
+        self._container_tag = None
+        self._container_depth = 0
+        self._table_depth = 0
+        # Current row and the cell/inline elements whose text is being captured
+        self._row: Optional[_Row] = None
+        self._cell = None
+        self._link_depth = 0
+        self._comment_depth = 0
+        # Plan of study state, mirroring parse_plan_of_study
+        self._year = None
+        self._term = None
+        self._courses = []
+
+    def handle_starttag(self, tag, attrs):
+        if self.done:
+            return
+        if self._table_depth == 0:
+            self._find_grid(tag, dict(attrs))
+            return
+
+        attrs = dict(attrs)
+        if tag == "table":
+            self._table_depth += 1
+        elif tag == "tr":
+            self._end_row()
+            self._row = _Row((attrs.get("class") or "").split())
+        elif self._row is None:
+            return
+        elif tag in ("td", "th"):
+            self._cell = None
+            classes = (attrs.get("class") or "").split()
+            if tag == "td":
+                for column in ("codecol", "titlecol", "hourscol"):
+                    if column in classes and column not in self._row.cells:
+                        self._cell = self._row.cells[column] = {"text": [], "link": None, "comment": None}
+                        break
+        elif self._cell is not None:
+            if tag == "a":
+                if self._link_depth:
+                    self._link_depth += 1
+                elif self._cell["link"] is None:
+                    self._cell["link"] = []
+                    self._link_depth = 1
+            elif tag == "span":
+                if self._comment_depth:
+                    self._comment_depth += 1
+                elif self._cell["comment"] is None and "comment" in (attrs.get("class") or "").split():
+                    self._cell["comment"] = []
+                    self._comment_depth = 1
+
+    def handle_endtag(self, tag):
+        if self.done:
+            return
+        if self._table_depth == 0:
+            if self._container_depth and tag == self._container_tag:
+                self._container_depth -= 1
+            return
+
+        if tag == "table":
+            self._table_depth -= 1
+            if self._table_depth == 0:
+                self._end_row()
+                self._finish()
+        elif tag == "tr":
+            self._end_row()
+        elif tag in ("td", "th"):
+            self._cell = None
+            self._link_depth = 0
+            self._comment_depth = 0
+        elif tag == "a" and self._link_depth:
+            self._link_depth -= 1
+        elif tag == "span" and self._comment_depth:
+            self._comment_depth -= 1
+
+    def handle_data(self, data):
+        if self._row is None or self.done:
+            return
+        self._row.text.append(data)
+        if self._cell is not None:
+            self._cell["text"].append(data)
+            if self._link_depth:
+                self._cell["link"].append(data)
+            if self._comment_depth:
+                self._cell["comment"].append(data)
+
+    def close(self):
+        super().close()
+        if not self.done:
+            self._end_row()
+            self._finish()
+
+    def _find_grid(self, tag, attrs):
+        if self._container_depth:
+            if tag == self._container_tag:
+                self._container_depth += 1
+            elif tag == "table" and GRID_CLASS in (attrs.get("class") or "").split():
+                self._table_depth = 1
+        elif attrs.get("id") == CONTAINER_ID:
+            self._container_tag = tag
+            self._container_depth = 1
+
+    def _save_semester(self):
+        if self._year and self._term and self._courses:
+            entry = {"year": self._year, "semester": self._term, "courses": self._courses}
+            logger.debug(f"Saved {len(self._courses)} courses for Year {self._year}, {self._term}")
+            self.ready.append(entry)
+            self._courses = []
+
+    def _end_row(self):
+        row, self._row = self._row, None
+        self._cell = None
+        self._link_depth = 0
+        self._comment_depth = 0
+        if row is None:
+            return
+
+        if "plangridyear" in row.classes:
+            self._save_semester()
+            year = plan_year("".join(row.text).strip())
+            if year:
+                self._year = year
+        elif "plangridterm" in row.classes:
+            self._save_semester()
+            term = plan_term("".join(row.text).strip())
+            if term:
+                self._term = term
+        elif ("codecol" in row.cells and
+              "plangridsum" not in row.classes and
+              "plangridtotal" not in row.classes):
+            course = self._course_from_row(row)
+            if (course["course_code"] or course["course_name"]) and self._year and self._term:
+                logger.debug(f"Added course: {course['course_code']} - {course['course_name']} ({course['credit_hours']} credit hours)")
+                self._courses.append(course)
+
+    @staticmethod
+    def _course_from_row(row):
+        code_cell = row.cells["codecol"]
+        title_cell = row.cells.get("titlecol")
+        hours_cell = row.cells.get("hourscol")
+
+        course_code = ""
+        if code_cell["link"] is not None:
+            course_code = "".join(code_cell["link"]).strip()
+        elif code_cell["comment"] is not None:
+            course_code = "".join(code_cell["comment"]).strip()
+
+        course_name = ""
+        if title_cell is not None:
+            course_name = "".join(title_cell["text"]).strip()
+        elif not course_code:
+            course_name = "".join(code_cell["text"]).strip()
+
+        credit_hours = "".join(hours_cell["text"]).strip() if hours_cell is not None else ""
+        return {"course_code": course_code, "course_name": course_name, "credit_hours": credit_hours}
+
+    def _finish(self):
+        self._save_semester()
+        self.done = True
+
+
+def _text_chunks(content: Union[bytes, str, Iterable[Union[bytes, str]]]) -> Iterator[str]:
+    if isinstance(content, (bytes, str)):
+        content = [content[i:i + CHUNK_SIZE] for i in range(0, len(content), CHUNK_SIZE)]
+    # Bulletin pages are UTF-8; the incremental decoder handles characters split across chunks
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    for chunk in content:
+        yield decoder.decode(chunk) if isinstance(chunk, bytes) else chunk
+    yield decoder.decode(b"", final=True)
+
+
+def iter_plan_of_study(content: Union[bytes, str, Iterable[Union[bytes, str]]]) -> Iterator[Dict[str, Any]]:
+    """
+    Yield each semester of the plan of study as soon as it has been parsed.
+
+    Args:
+        content: The page HTML, either whole or as an iterable of chunks
+            (e.g. ``response.iter_content()``)
+
+    Yields:
+        Dictionaries with "year", "semester" and "courses" keys
+    """
+    extractor = PlanGridExtractor()
+    # Text before the container element can't contain the grid, so it is skipped
+    # without tokenizing; only the last (possibly partial) tag is kept around
+    pending = ""
+    for chunk in _text_chunks(content):
+        if pending is not None:
+            pending += chunk
+            found = _CONTAINER_ATTR.search(pending)
+            if found is None:
+                pending = pending[max(pending.rfind("<"), 0):]
+                continue
+            chunk, pending = pending[max(pending.rfind("<", 0, found.start()), 0):], None
+        extractor.feed(chunk)
+        yield from extractor.ready
+        extractor.ready.clear()
+        if extractor.done:
+            return
+    extractor.close()
+    yield from extractor.ready
+
+
+def extract_plan_of_study(content) -> List[Dict[str, Any]]:
+    """Parse the whole plan of study grid; see iter_plan_of_study."""
+    return list(iter_plan_of_study(content))
+
+
+def grid_fingerprint(content: Union[bytes, str]) -> Optional[str]:
+    """
+    Hash of the page's plan grid table with whitespace collapsed, or None if
+    the page has no grid. Edits elsewhere on the page don't change it, so it
+    tells whether a page needs to be re-parsed.
+    """
+    text = content.decode("utf-8", errors="replace") if isinstance(content, bytes) else content
+    container = _CONTAINER_ATTR.search(text)
+    grid = _GRID_TABLE.search(text, container.start() if container else 0)
+    if grid is None:
+        return None
+    return hashlib.sha256(_WHITESPACE.sub(" ", grid.group(0)).encode("utf-8")).hexdigest()
@@ -0,0 +1,292 @@
+"""Loading suggested plans of study from the University of Miami Bulletin.
+
+Used by CourseCatalogTool and directly by the deterministic (no-LLM) paths,
+so nothing here imports crewai.
+"""
+import logging
+import traceback
+from typing import Any, Dict, List
+
+import requests
+
+from src.ai_advisor import settings
+from src.ai_advisor.bulletin_index import get_bulletin_index
+from src.ai_advisor.http_client import bulletin_client
+from src.ai_advisor.metrics import span
+from src.ai_advisor.plan_cache import NAMESPACE as PLAN_NAMESPACE, plan_cache
+from src.ai_advisor.plan_grid import extract_plan_of_study
+from src.ai_advisor.shared_cache import shared_cache
+
+logger = logging.getLogger(__name__)
+
+
+def semester_to_year_term(semester: int):
+    """Convert a semester number to its (year, term) in the plan of study."""
+    year = (semester + 1) // 2  # Semesters 1-2 = Year 1, 3-4 = Year 2, etc.
+    term = "Fall" if semester % 2 == 1 else "Spring"
+    return year, term
+
+
+def find_semester_plans(plan_of_study: List[Dict[str, Any]], semester: int) -> List[Dict[str, Any]]:
+    """Return every entry of the plan of study that matches the given semester number."""
+    year, term = semester_to_year_term(semester)
+    return [semester_plan for semester_plan in plan_of_study
+            if semester_plan["year"] == year and semester_plan["semester"] == term]
+
+
+@span("plan_parse")
+def parse_plan_of_study(content, url: str = "") -> List[Dict[str, Any]]:
+    """Parse the suggested plan of study grid out of a bulletin page.
+    
+    Uses the streaming extractor in plan_grid.py, which only looks at the
+    plan grid table and stops reading once it has been closed.
+    
+    Args:
+        content: The raw HTML of the bulletin page (bytes, str or an iterable of chunks)
+        url: The page URL, used only for logging
+    
+    Returns:
+        A list of dictionaries containing course information organized by year and semester
+    """
+    plan_of_study = extract_plan_of_study(content)
+    if not plan_of_study:
+        logger.warning(f"No plan of study found at URL: {url}")
+    else:
+        logger.info(f"Extracted plan of study with {len(plan_of_study)} semesters")
+    return plan_of_study
+
+
+def parse_plan_of_study_soup(content, url: str = "") -> List[Dict[str, Any]]:
+    """Parse the suggested plan of study grid by building a full BeautifulSoup tree.
+    
+    Reference implementation for parse_plan_of_study, kept for comparison
+    and benchmarking (see benchmarks/bench_plan_parser.py).
+    
+    Args:
+        content: The raw HTML of the bulletin page (bytes or str)
+        url: The page URL, used only for logging
+    
+    Returns:
+        A list of dictionaries containing course information organized by year and semester
+    """
+    # Only the reference parser needs bs4, so don't pay for importing it elsewhere
+    from bs4 import BeautifulSoup
+    
+    # Parse the HTML content
+    logger.debug("Parsing HTML content")
+    soup = BeautifulSoup(content, 'html.parser')
+    
+    # Find the plan of study table
+    logger.debug("Looking for plan of study table")
+    plan_table = soup.select_one('#planofstudytextcontainer table.sc_plangrid')
+    if not plan_table:
+        logger.warning(f"No plan of study table found at URL: {url}")
+        return []
+    
+    logger.info("Found plan of study table, extracting course information")
+    plan_of_study = []
+    current_year = None
+    current_semester = None
+    courses = []
+    
+    row_count = 0
+    for row in plan_table.find_all('tr'):
+        row_count += 1
+        # Check if this is a year row
+        if 'plangridyear' in row.get('class', []):
+            if current_year and current_semester and courses:
+                # Save previous semester data before starting a new year
+                plan_of_study.append({
+                    "year": current_year,
+                    "semester": current_semester,
+                    "courses": courses
+                })
+                logger.debug(f"Saved {len(courses)} courses for Year {current_year}, {current_semester}")
+                courses = []
+            
+            year_text = row.text.strip()
+            logger.debug(f"Found year row: {year_text}")
+            if 'Year One' in year_text or 'Freshman Year' in year_text:
+                current_year = 1
+            elif 'Year Two' in year_text or 'Sophomore Year' in year_text:
+                current_year = 2
+            elif 'Year Three' in year_text or 'Junior Year' in year_text:
+                current_year = 3
+            elif 'Year Four' in year_text or 'Senior Year' in year_text:
+                current_year = 4
+            
+        # Check if this is a semester row
+        elif 'plangridterm' in row.get('class', []):
+            if current_year and current_semester and courses:
+                # Save previous semester data before starting a new semester
+                plan_of_study.append({
+                    "year": current_year,
+                    "semester": current_semester,
+                    "courses": courses
+                })
+                logger.debug(f"Saved {len(courses)} courses for Year {current_year}, {current_semester}")
+                courses = []
+            
+            semester_text = row.text.strip()
+            logger.debug(f"Found semester row: {semester_text}")
+            if 'Fall' in semester_text:
+                current_semester = 'Fall'
+            elif 'Spring' in semester_text:
+                current_semester = 'Spring'
+            elif 'Summer' in semester_text:
+                current_semester = 'Summer'
+        
+        # Check if this is a course row (not a header, sum or total row)
+        elif (row.find('td', class_='codecol') and 
+              'plangridsum' not in row.get('class', []) and 
+              'plangridtotal' not in row.get('class', [])):
+            
+            logger.debug(f"Processing course row {row_count}")
+            code_cell = row.find('td', class_='codecol')
+            title_cell = row.find('td', class_='titlecol')
+            hours_cell = row.find('td', class_='hourscol')
+            
+            # Extract course code
+            course_code = ""
+            if code_cell:
+                # Check if there's a link in the codecol
+                course_link = code_cell.find('a')
+                if course_link:
+                    course_code = course_link.text.strip()
+                else:
+                    # Handle cases like "Elective" or "Language Course"
+                    comment = code_cell.find('span', class_='comment')
+                    if comment:
+                        course_code = comment.text.strip()
+            
+            # Extract course name
+            course_name = ""
+            if title_cell:
+                course_name = title_cell.text.strip()
+            elif code_cell and not course_code:
+                # For cases where course name is in the codecol
+                course_name = code_cell.text.strip()
+            
+            # Extract credit hours
+            credit_hours = ""
+            if hours_cell:
+                credit_hours = hours_cell.text.strip()
+            
+            if (course_code or course_name) and current_year and current_semester:
+                logger.debug(f"Added course: {course_code} - {course_name} ({credit_hours} credit hours)")
+                courses.append({
+                    "course_code": course_code,
+                    "course_name": course_name,
+                    "credit_hours": credit_hours
+                })
+    
+    # Add the last semester's courses
+    if current_year and current_semester and courses:
+        plan_of_study.append({
+            "year": current_year,
+            "semester": current_semester,
+            "courses": courses
+        })
+        logger.debug(f"Saved final set of {len(courses)} courses for Year {current_year}, {current_semester}")
+    else:
+        logger.debug(f"Plan of study table ended without a final semester to save "
+                     f"(year: {current_year}, semester: {current_semester}, courses: {len(courses)})")
+
+    logger.info(f"Extracted plan of study with {len(plan_of_study)} semesters")
+    
+    # Log a summary of what we found
+    for semester in plan_of_study:
+        logger.debug(f"Year {semester['year']} {semester['semester']}: {len(semester['courses'])} courses")
+    
+    return plan_of_study
+
+
+def get_suggested_plan_of_study(major: str, url: str) -> List[Dict[str, Any]]:
+    """Get the suggested plan of study for a given major.
+
+    Plans are served from the offline bulletin index or the shared plan
+    cache when possible; only a miss goes out to the bulletin, once across
+    all workers, and not even that in offline mode. An expired cache entry is revalidated rather than
+    re-downloaded. Empty results are not cached.
+
+    Args:
+        major: The student's major (e.g., 'Computer Science')
+        url: The URL to the plan of study page
+
+    Returns:
+        A list of dictionaries containing course information organized by year and semester
+    """
+    indexed = get_bulletin_index().get_plan(url)
+    if indexed is not None:
+        logger.info(f"Using indexed plan of study for {major} from URL: {url}")
+        return indexed
+
+    cached = plan_cache.get(url)
+    if cached is not None:
+        logger.info(f"Using cached plan of study for {major} from URL: {url}")
+        return cached
+
+    if settings.BULLETIN_OFFLINE:
+        logger.warning(f"No indexed plan of study for {major} and offline mode is on: {url}")
+        return []
+
+    # Only one thread on any worker fetches a given plan; the others wait for
+    # it and read what it stored
+    with shared_cache.fill_lock(PLAN_NAMESPACE, url):
+        cached = plan_cache.get(url)
+        if cached is not None:
+            logger.info(f"Using plan of study for {major} filled by another worker from URL: {url}")
+            return cached
+        return revalidate_plan_of_study(major, url)
+
+
+def revalidate_plan_of_study(major: str, url: str) -> List[Dict[str, Any]]:
+    """Refresh the cached plan for ``url`` with a conditional GET.
+
+    An unchanged page (304) keeps the stale plan without re-parsing it. If
+    the bulletin can't be reached, the stale plan is served as-is.
+    """
+    stale = plan_cache.get_stale(url)
+    validators = stale["validators"] if stale else {}
+    try:
+        result = bulletin_client.fetch(url, etag=validators.get("etag"),
+                                       last_modified=validators.get("last_modified"))
+    except requests.exceptions.RequestException as e:
+        if stale:
+            logger.warning(f"Serving stale plan of study for {major}, bulletin unavailable: {str(e)}")
+            return stale["plan"]
+        logger.error(f"Request error fetching plan of study: {str(e)}")
+        return []
+
+    if result.not_modified and stale:
+        logger.info(f"Plan of study for {major} unchanged at URL: {url}")
+        plan_of_study = stale["plan"]
+    else:
+        try:
+            plan_of_study = parse_plan_of_study(result.content, url)
+        except Exception as e:
+            logger.error(f"Error parsing plan of study: {str(e)}")
+            logger.warning(traceback.format_exc())
+            return stale["plan"] if stale else []
+
+    if plan_of_study:
+        plan_cache.set(url, plan_of_study, etag=result.etag, last_modified=result.last_modified)
+    return plan_of_study
+
+
+def fetch_plan_of_study(major: str, url: str) -> List[Dict[str, Any]]:
+    """Fetch and parse the suggested plan of study from the bulletin, bypassing the cache."""
+    logger.info(f"Getting suggested plan of study for {major} from URL: {url}")
+
+    try:
+        return parse_plan_of_study(bulletin_client.fetch(url).content, url)
+
+    except requests.exceptions.RequestException as e:
+        logger.error(f"Request error fetching plan of study: {str(e)}")
+        logger.warning(traceback.format_exc())
+        return []
+    except Exception as e:
+        # Log the error and return empty list
+        logger.error(f"Error fetching plan of study: {str(e)}")
+        logger.warning(traceback.format_exc())
+        return []
@@ -0,0 +1,313 @@
+#!/usr/bin/env python
+"""Prerequisite graph built from bulletin course descriptions.
+
+Build the graph from the live bulletin's course description pages (one per
+subject found in courses.csv and the bulletin index):
+
+    python -m src.ai_advisor.prerequisites
+
+or from a directory of saved course description pages:
+
+    python -m src.ai_advisor.prerequisites --html-dir saved_pages/
+
+The result is written next to the other knowledge files and loaded once per
+process when AI_ADVISOR_PREREQUISITE_CHECK is on; no graph ships with the
+repo, so the check is off by default. Each course maps to its requirement as a list of groups that must
+all be met, where a group is met by completing any one of its courses:
+"MTH 151 or MTH 161, and CSC 120" becomes [["MTH 151", "MTH 161"], ["CSC 120"]].
+Transitive prerequisites are resolved when the graph is loaded, so checking a
+course against a set of courses is linear in the size of its prerequisites.
+"""
+import argparse
+import csv
+import html
+import json
+import logging
+import os
+import re
+import threading
+import time
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from src.ai_advisor import settings
+
+logger = logging.getLogger(__name__)
+
+GRAPH_VERSION = 1
+COURSE_DESCRIPTIONS_URL = "https://bulletin.miami.edu/course-descriptions/{subject}/"
+
+# "CSC 220", "MTH151", or a bare "161" continuing the previous subject ("MTH 151 or 161")
+_CODE = re.compile(r"\b([A-Z]{3,4})\s?(\d{3}[A-Z]?)\b|(?<![\w.])(\d{3}[A-Z]?)\b")
+_PREREQUISITE = re.compile(r"Prerequisites?(?:\(s\))?\s*:?\s*(.*?)(?:\.(?:\s|$)|Corequisites?|$)", re.IGNORECASE | re.DOTALL)
+# All that may come between a code and a bare number continuing its subject: "MTH 151, 161, or 171", "CSC 120/121"
+_CONTINUATION = re.compile(r"\s*(?:[,/&]\s*)?(?:(?:or|and)\s+)?", re.IGNORECASE)
+_GROUP_SEPARATOR = re.compile(r"\band\b|;|,(?!\s*or\b)", re.IGNORECASE)
+_COURSEBLOCK = re.compile(r'<div[^>]*class="[^"]*\bcourseblock\b[^"]*"[^>]*>', re.IGNORECASE)
+_TAG = re.compile(r"<[^>]+>")
+
+
+def normalize_code(code: str) -> str:
+    """Canonical spelling of a course code: upper case, one space ("csc220" -> "CSC 220")."""
+    match = _CODE.match(code.strip().upper())
+    if match and match.group(1):
+        return f"{match.group(1)} {match.group(2)}"
+    return " ".join(code.split()).upper()
+
+
+def parse_codes(text: str, subject: Optional[str] = None) -> List[str]:
+    """
+    Return every course code mentioned in ``text``, in order.
+
+    A bare number continues the subject of the code right before it, or
+    ``subject`` at the very start of ``text``, when only a separator such as
+    "or" comes between them; any other bare number ("a score of 650") is not
+    a course.
+    """
+    codes = []
+    # Where a bare number may continue ``subject``, None when none may
+    continues_at = 0 if subject else None
+    for match in _CODE.finditer(text):
+        if match.group(1):
+            subject = match.group(1)
+            codes.append(f"{subject} {match.group(2)}")
+        elif continues_at is not None and _CONTINUATION.fullmatch(text, continues_at, match.start()):
+            codes.append(f"{subject} {match.group(3)}")
+        else:
+            continues_at = None
+            continue
+        continues_at = match.end()
+    return codes
+
+
+def parse_requirement(text: str) -> List[List[str]]:
+    """Turn prerequisite prose into groups of alternatives that must all be met."""
+    groups = []
+    subject = None
+    for part in _GROUP_SEPARATOR.split(" ".join(text.split())):
+        # Keep the subject across groups so "MTH 151 and 162" reads as MTH 162
+        codes = parse_codes(part, subject)
+        if codes:
+            subject = codes[-1].split()[0]
+            groups.append(sorted(set(codes)))
+    return groups
+
+
+def requirements_from_description(description: str) -> List[List[str]]:
+    """Extract the requirement from a course description's "Prerequisite: ..." sentence, if any."""
+    match = _PREREQUISITE.search(description)
+    return parse_requirement(match.group(1)) if match else []
+
+
+def requirements_from_page(content: str) -> Dict[str, List[List[str]]]:
+    """Extract every course's requirement from a bulletin course description page."""
+    requirements = {}
+    blocks = _COURSEBLOCK.split(content)[1:]
+    for block in blocks:
+        text = html.unescape(_TAG.sub(" ", block))
+        codes = parse_codes(text[:200])
+        if not codes:
+            continue
+        groups = requirements_from_description(text)
+        if groups:
+            requirements[codes[0]] = groups
+    return requirements
+
+
+def build_graph(courses_csv: str = settings.COURSES_CSV, html_dir: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Collect the requirement of every course we can find a description for.
+
+    Args:
+        courses_csv: Path to courses.csv; its descriptions are scanned too, and
+            its subjects decide which bulletin pages are fetched
+        html_dir: Optional directory of saved course description pages; when given, no network is used
+
+    Returns:
+        The graph as a JSON-serializable dictionary
+    """
+    requirements: Dict[str, List[List[str]]] = {}
+    subjects = set()
+    with open(courses_csv, "r", newline="") as f:
+        for row in csv.DictReader(f):
+            code = normalize_code(row["course_code"])
+            subjects.update(code.split()[:1])
+            groups = requirements_from_description(row.get("description") or "")
+            if groups:
+                requirements[code] = groups
+
+    if html_dir:
+        for name in sorted(os.listdir(html_dir)):
+            if name.endswith(".html"):
+                with open(os.path.join(html_dir, name), "r", encoding="utf-8", errors="replace") as page:
+                    requirements.update(requirements_from_page(page.read()))
+    else:
+        # Imported here so loading an existing graph never pulls in requests
+        import requests
+
+        from src.ai_advisor.http_client import bulletin_client
+
+        for subject in sorted(s for s in subjects if s.isalpha()):
+            url = COURSE_DESCRIPTIONS_URL.format(subject=subject.lower())
+            try:
+                content = bulletin_client.fetch(url).content.decode("utf-8", errors="replace")
+            except requests.exceptions.RequestException as e:
+                logger.warning(f"Could not fetch course descriptions for {subject}: {e}")
+                continue
+            requirements.update(requirements_from_page(content))
+
+    return {"version": GRAPH_VERSION, "generated_at": time.time(), "courses": requirements}
+
+
+def write_graph(graph: Dict[str, Any], path: str = settings.PREREQUISITES_PATH) -> None:
+    """Write the graph atomically as compact JSON."""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(graph, f, separators=(",", ":"), sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+class PrerequisiteGraph:
+    """Read-only prerequisite DAG with precomputed transitive prerequisites."""
+
+    def __init__(self, requirements: Optional[Dict[str, List[List[str]]]] = None):
+        self._requirements: Dict[str, Tuple[FrozenSet[str], ...]] = {
+            normalize_code(code): tuple(frozenset(normalize_code(c) for c in group) for group in groups)
+            for code, groups in (requirements or {}).items()
+        }
+        self._ancestors: Dict[str, FrozenSet[str]] = {}
+        for code in self._requirements:
+            self._resolve(code, set())
+
+    @classmethod
+    def load(cls, path: str = settings.PREREQUISITES_PATH) -> "PrerequisiteGraph":
+        """Load the graph at ``path``; a missing file gives an empty graph."""
+        try:
+            with open(path, "r") as f:
+                graph = json.load(f)
+        except FileNotFoundError:
+            return cls()
+        if graph.get("version") != GRAPH_VERSION:
+            logger.warning(f"Ignoring prerequisite graph {path} with unsupported version {graph.get('version')}")
+            return cls()
+        return cls(graph["courses"])
+
+    def _resolve(self, code, visiting):
+        resolved = self._ancestors.get(code)
+        if resolved is not None:
+            return resolved
+        visiting.add(code)
+        ancestors = set()
+        for group in self._requirements.get(code, ()):
+            for prerequisite in group:
+                if prerequisite in visiting:
+                    logger.warning(f"Ignoring prerequisite cycle through {code} and {prerequisite}")
+                    continue
+                ancestors.add(prerequisite)
+                ancestors.update(self._resolve(prerequisite, visiting))
+        visiting.discard(code)
+        resolved = self._ancestors[code] = frozenset(ancestors)
+        return resolved
+
+    def prerequisites(self, code: str) -> FrozenSet[str]:
+        """Every course that can appear anywhere in ``code``'s prerequisite chain."""
+        return self._ancestors.get(normalize_code(code), frozenset())
+
+    def is_eligible(self, code: str, completed: Iterable[str]) -> bool:
+        """True if ``completed`` satisfies every requirement group of ``code``."""
+        completed = {normalize_code(c) for c in completed}
+        return all(not group.isdisjoint(completed) for group in self._requirements.get(normalize_code(code), ()))
+
+    def dependents_in(self, codes: Iterable[str]) -> List[str]:
+        """Return the codes in ``codes`` that have another code of the same set in their prerequisite chain."""
+        normalized = [normalize_code(code) for code in codes]
+        present = set(normalized)
+        return [code for code in normalized if not self.prerequisites(code).isdisjoint(present - {code})]
+
+    def __len__(self):
+        return len(self._requirements)
+
+
+_graph = None
+_graph_lock = threading.Lock()
+
+
+def get_prerequisite_graph() -> PrerequisiteGraph:
+    """Return the process-wide prerequisite graph, loading it on first use; empty while the check is off."""
+    global _graph
+    if _graph is None:
+        with _graph_lock:
+            if _graph is None:
+                _graph = PrerequisiteGraph.load() if settings.PREREQUISITE_CHECK else PrerequisiteGraph()
+    return _graph
+
+
+# What the recommend_courses task asks about prerequisites ({prerequisite_instructions}
+# in tasks.yaml): with a graph, the catalog tool has already pruned the list;
+# without one nothing prunes it, so the agent has to
+PRUNED_INSTRUCTIONS = (
+    "The course_catalog_tool has already replaced courses whose prerequisite is listed "
+    "in the same semester with electives; keep its list as it is."
+)
+UNPRUNED_INSTRUCTIONS = (
+    "If one of the courses is a prerequisite for other course(s), ONLY RETURN THE COURSE THAT IS "
+    "THE PREREQUISITE, NOT THE COURSE THAT REQUIRES IT. In the case that you do include courses that "
+    "require another listed course as a prerequisite, replace those courses with other courses, like "
+    "electives that fulfill some requirement."
+)
+
+
+def prerequisite_instructions() -> str:
+    """The prompt's prerequisite instructions, depending on whether prune_dependents has a graph to work with."""
+    return PRUNED_INSTRUCTIONS if len(get_prerequisite_graph()) else UNPRUNED_INSTRUCTIONS
+
+
+def _course_code(course: Dict[str, Any]) -> str:
+    return course.get("code") or course.get("course_code") or ""
+
+
+def prune_dependents(courses: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Replace every course whose prerequisite is also in ``courses`` with an Elective slot.
+
+    Only the prerequisite is recommended; the freed slot keeps its credit
+    hours and is filled in like any other generic slot. Works on both the
+    crew's shape ("code") and the plan of study shape ("course_code").
+    """
+    graph = get_prerequisite_graph()
+    if not len(graph):
+        return courses
+    dependents = set(graph.dependents_in(_course_code(course) for course in courses))
+    if not dependents:
+        return courses
+
+    pruned = []
+    for course in courses:
+        if normalize_code(_course_code(course)) not in dependents:
+            pruned.append(course)
+            continue
+        logger.info(f"Replacing {_course_code(course)} with an elective; its prerequisite is also recommended")
+        code_key = "course_code" if "course_code" in course else "code"
+        name_key = "course_name" if "course_name" in course else "name"
+        slot = {code_key: "Elective", name_key: "Elective"}
+        for credits_key in ("credits", "credit_hours"):
+            if credits_key in course:
+                slot[credits_key] = course[credits_key]
+        pruned.append(slot)
+    return pruned
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the prerequisite graph from bulletin course descriptions.")
+    parser.add_argument("--csv", default=settings.COURSES_CSV, help="Path to courses.csv")
+    parser.add_argument("--html-dir", help="Directory of saved course description pages to parse instead of fetching")
+    parser.add_argument("--output", default=settings.PREREQUISITES_PATH, help="Where to write the graph")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.ERROR)
+    graph = build_graph(args.csv, args.html_dir)
+    write_graph(graph, args.output)
+    print(f"Wrote prerequisites for {len(graph['courses'])} courses to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
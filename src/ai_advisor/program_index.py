@@ -0,0 +1,248 @@
+"""In-memory fuzzy-match index over knowledge/degree_programs.csv.
+
+Names are normalized (case, punctuation, degree abbreviations such as
+"B.S." / "Bachelor of Science", and common subject shorthands such as "CS")
+and indexed by character trigram, so a lookup only scores programs that share
+at least one trigram with the query. A program only matches if it also shares
+a subject word with the query (allowing for typos and prefixes such as
+"Comp"), so an unknown program like "Marine Science" isn't mapped onto a
+similar-looking one like "Neuroscience". The index is built when the module is
+first used (or preloaded at startup) and rebuilt automatically when the CSV
+file changes.
+"""
+import csv
+import logging
+import os
+import re
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+from src.ai_advisor import settings
+from src.ai_advisor.metrics import span
+
+logger = logging.getLogger(__name__)
+
+# Multi-word phrases, applied before tokenizing
+_PHRASES = (
+    (re.compile(r"\bbachelors? of science\b"), "bs"),
+    (re.compile(r"\bbachelors? of arts\b"), "ba"),
+    (re.compile(r"\bmasters? of science\b"), "ms"),
+    (re.compile(r"\bpre[\s-]+med(ical)?\b"), "premed"),
+)
+
+# Single-token shorthands students commonly type
+ABBREVIATIONS = {
+    "ai": "artificial intelligence",
+    "bio": "biology",
+    "chem": "chemistry",
+    "cs": "computer science",
+    "compsci": "computer science",
+    "ds": "data science",
+    "econ": "economics",
+    "eng": "english",
+    "ghs": "global health studies",
+    "micro": "microbiology",
+    "neuro": "neuroscience",
+    "phys": "physics",
+    "polisci": "political science",
+    "poli": "political",
+    "sci": "science",
+}
+
+STOPWORDS = frozenset({"in", "and", "of", "the", "degree", "major", "program"})
+
+# Words that say what kind of degree it is, or are shared by too many
+# subjects, rather than what it is in; they don't count as a shared subject
+NON_SUBJECT_WORDS = frozenset({"bs", "ba", "ms", "five", "year", "science", "studies", "applied", "pure"})
+
+# A query word and a program word are the same subject if one is a prefix of
+# the other (at least this long) or their trigrams overlap at least this much
+MIN_PREFIX = 3
+SUBJECT_SIMILARITY = 0.6
+
+# Scores below this are treated as "no match", like difflib's cutoff
+DEFAULT_CUTOFF = 0.5
+
+# How often, at most, to stat the CSV for changes
+RELOAD_CHECK_INTERVAL = 1.0
+
+
+def normalize(name: str) -> str:
+    """Normalize a degree program name for matching, e.g. "BS CS" -> "bs computer science"."""
+    text = name.lower().replace(".", "")
+    for pattern, replacement in _PHRASES:
+        text = pattern.sub(replacement, text)
+    tokens = []
+    for token in re.split(r"[^a-z0-9]+", text):
+        if token and token not in STOPWORDS:
+            tokens.extend(ABBREVIATIONS.get(token, token).split())
+    return " ".join(tokens)
+
+
+def trigrams(text: str) -> frozenset:
+    padded = f"  {text} "
+    return frozenset(padded[i:i + 3] for i in range(len(padded) - 2))
+
+
+def dice(a: frozenset, b: frozenset) -> float:
+    return 2.0 * len(a & b) / (len(a) + len(b)) if a or b else 0.0
+
+
+def subject_words(key: str) -> Tuple[str, ...]:
+    """The words of a normalized name that name its subject, e.g. "bs computer science" -> ("computer",)."""
+    return tuple(word for word in key.split() if word not in NON_SUBJECT_WORDS)
+
+
+def same_subject(query_words: Tuple[str, ...], program_words: Tuple[str, ...]) -> bool:
+    """Whether any query subject word is, allowing for a typo or an abbreviation, one of the program's."""
+    for query_word in query_words:
+        query_grams = trigrams(query_word)
+        for program_word in program_words:
+            shorter, longer = sorted((query_word, program_word), key=len)
+            if len(shorter) >= MIN_PREFIX and longer.startswith(shorter):
+                return True
+            if dice(query_grams, trigrams(program_word)) >= SUBJECT_SIMILARITY:
+                return True
+    return False
+
+
+class ProgramIndex:
+    """Trigram index over the degree programs in a CSV file."""
+
+    def __init__(self, csv_path: str = settings.DEGREE_PROGRAMS_CSV):
+        self.csv_path = csv_path
+        self._lock = threading.Lock()
+        self._mtime = None
+        self._next_check = 0.0
+        self._load()
+
+    def _load(self):
+        try:
+            mtime = os.stat(self.csv_path).st_mtime
+        except FileNotFoundError:
+            mtime = None
+
+        programs, grams, subjects, exact = [], [], [], {}
+        postings = defaultdict(list)
+        if mtime is not None:
+            with open(self.csv_path, "r") as f:
+                for row in csv.DictReader(f):
+                    name = (row.get("degree_program") or "").strip()
+                    if not name:
+                        continue
+                    program_id = len(programs)
+                    key = normalize(name)
+                    programs.append(row)
+                    grams.append(trigrams(key))
+                    subjects.append(subject_words(key))
+                    exact.setdefault(key, program_id)
+                    for gram in grams[program_id]:
+                        postings[gram].append(program_id)
+
+        # Swap in the new index in one assignment so readers never see a partial one
+        self._state = (programs, grams, subjects, exact, dict(postings))
+        self._mtime = mtime
+
+    def _maybe_reload(self):
+        now = time.monotonic()
+        if now < self._next_check:
+            return
+        with self._lock:
+            if now < self._next_check:
+                return
+            self._next_check = now + RELOAD_CHECK_INTERVAL
+            try:
+                mtime = os.stat(self.csv_path).st_mtime
+            except FileNotFoundError:
+                mtime = None
+            if mtime != self._mtime:
+                self._load()
+
+    @span("program_match")
+    def match(self, query: str, k: int = 5, cutoff: float = DEFAULT_CUTOFF) -> List[Tuple[float, Dict[str, str]]]:
+        """
+        Return up to ``k`` (score, row) pairs for the programs closest to ``query``, best first.
+
+        Scores are the Dice coefficient of the normalized names' trigram sets,
+        in [0, 1]; an exact match after normalization scores 1.0. Programs
+        that share no subject word with ``query`` never match.
+        """
+        self._maybe_reload()
+        programs, grams, subjects, exact, postings = self._state
+        key = normalize(query)
+        if k == 1 and key in exact:
+            return [(1.0, programs[exact[key]])]
+
+        query_grams = trigrams(key)
+        shared = defaultdict(int)
+        for gram in query_grams:
+            for program_id in postings.get(gram, ()):
+                shared[program_id] += 1
+
+        query_subjects = subject_words(key)
+        scored = []
+        for program_id, count in shared.items():
+            score = 2.0 * count / (len(query_grams) + len(grams[program_id]))
+            if score >= cutoff and same_subject(query_subjects, subjects[program_id]):
+                scored.append((score, program_id))
+        scored.sort(key=lambda item: (-item[0], item[1]))
+        return [(score, programs[program_id]) for score, program_id in scored[:k]]
+
+    def best(self, query: str, cutoff: float = DEFAULT_CUTOFF) -> Optional[Dict[str, str]]:
+        """Return the row of the closest matching program, or None if nothing clears ``cutoff``."""
+        matches = self.match(query, k=1, cutoff=cutoff)
+        return matches[0][1] if matches else None
+
+
+_indexes: Dict[str, ProgramIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_program_index(csv_path: str = settings.DEGREE_PROGRAMS_CSV) -> ProgramIndex:
+    """Return the shared index for ``csv_path``, building it on first use."""
+    index = _indexes.get(csv_path)
+    if index is None:
+        with _indexes_lock:
+            index = _indexes.get(csv_path)
+            if index is None:
+                index = _indexes[csv_path] = ProgramIndex(csv_path)
+    return index
+
+
+def program_key(major: str) -> str:
+    """Canonical key for a requested major: the matched program's name, or the normalized text if none matches."""
+    program = get_program_index().best(major)
+    return program["degree_program"] if program else normalize(major)
+
+
+def plan_of_study_url(degree_program: str, csv_path: str = settings.DEGREE_PROGRAMS_CSV) -> Optional[str]:
+    """
+    Find the closest matching degree program and return its plan of study URL.
+
+    Args:
+        degree_program (str): The degree program to search for.
+        csv_path (str): The degree programs CSV to search.
+
+    Returns:
+        str: The URL to the plan of study for the closest matching degree program,
+        None if nothing matches, or an error message if the lookup failed.
+    """
+    try:
+        # Look up the closest match in the preloaded index
+        best_match = get_program_index(csv_path).best(degree_program)
+        logger.debug(f"Match: {best_match['degree_program'] if best_match else None}")
+        if not best_match:
+            return None
+
+        # Get the URL for the best match
+        url = best_match.get('plan_of_study_url')
+        if url is None:
+            return "Error: CSV file does not contain required columns."
+
+        logger.debug(f"Found url for {degree_program}: {url}")
+        return url
+
+    except Exception as e:
+        return f"Error finding degree program: {str(e)}"
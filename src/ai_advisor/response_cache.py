@@ -0,0 +1,153 @@
+import asyncio
+import json
+import math
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+from src.ai_advisor import settings
+from src.ai_advisor.deadline import Deadline, current_deadline, deadline_scope
+from src.ai_advisor.fast_path import parse_semester
+from src.ai_advisor.program_index import program_key
+from src.ai_advisor.shared_cache import SharedCache, shared_cache
+
+# Namespace of crew results in the shared cache
+NAMESPACE = "response"
+
+
+def response_cache_key(major: str, semester) -> Tuple[str, str]:
+    """Normalize a (major, semester) request so equivalent spellings share a cache entry."""
+    major_key = program_key(major)
+    semester_number = parse_semester(semester)
+    semester_key = str(semester_number) if semester_number is not None else str(semester).strip().lower()
+    return major_key, semester_key
+
+
+class ResponseCache:
+    """LRU + TTL cache of recommendation results with single-flight fills.
+
+    Concurrent requests for a key that is being computed await the same
+    in-flight computation instead of starting their own. The computation runs
+    as its own task, so one caller disconnecting doesn't cancel it for the
+    others. Failures are passed to every waiter and not cached.
+
+    The computation runs under a Deadline of its own that is extended to the
+    latest deadline of the requests waiting for it (see deadline.py). Once
+    every waiter has gone, because it timed out or its client disconnected,
+    the computation is cancelled.
+
+    Behind the in-process LRU sits the host's SharedCache: a local miss reads
+    the result another worker stored, and a fill holds the key's lease so no
+    two workers run the crew for the same key at once. Keys and values must
+    be JSON-serializable.
+
+    Must be used from a single event loop.
+    """
+
+    def __init__(self, max_size: int = settings.RESPONSE_CACHE_SIZE,
+                 ttl: float = settings.RESPONSE_CACHE_TTL,
+                 shared: Optional[SharedCache] = shared_cache):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.shared = shared
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._inflight: Dict[Hashable, Tuple[asyncio.Task, Deadline]] = {}
+        self._waiters: Dict[Hashable, int] = {}
+        self._counters = {
+            "hits": 0,
+            "shared_hits": 0,
+            "misses": 0,
+            "coalesced": 0,
+            "evictions": 0,
+            "expirations": 0,
+        }
+
+    async def get_or_compute(self, key: Hashable, compute: Callable[[], Awaitable[Any]]) -> Any:
+        """Return the cached value for ``key``, computing it with ``compute()`` at most once at a time."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            stored_at, value = entry
+            if time.monotonic() - stored_at < self.ttl:
+                self._entries.move_to_end(key)
+                self._counters["hits"] += 1
+                return value
+            del self._entries[key]
+            self._counters["expirations"] += 1
+
+        caller = current_deadline()
+        expires_at = caller.expires_at if caller is not None else math.inf
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            task, deadline = inflight
+            deadline.extend_to(expires_at)
+            self._counters["coalesced"] += 1
+        else:
+            self._counters["misses"] += 1
+            deadline = Deadline(expires_at)
+            task = asyncio.ensure_future(self._compute_shared(key, compute, deadline))
+            self._inflight[key] = task, deadline
+            task.add_done_callback(lambda done: self._fill(key, done))
+
+        self._waiters[key] = self._waiters.get(key, 0) + 1
+        try:
+            return await asyncio.shield(task)
+        finally:
+            self._waiters[key] -= 1
+            if not self._waiters[key]:
+                del self._waiters[key]
+                if not task.done():
+                    # Nobody wants the result any more; a running kickoff
+                    # stops at its next LLM call, tool call or fetch
+                    deadline.cancel()
+                    task.cancel()
+                    self._inflight.pop(key, None)
+
+    def purge(self) -> int:
+        """
+        Drop every cached entry of this worker and of the shared cache, and
+        return how many there were (in the shared cache, when there is one).
+        In-flight fills still complete. Other workers keep their in-process
+        entries until they expire.
+        """
+        purged = len(self._entries)
+        self._entries.clear()
+        if self.shared:
+            purged = self.shared.delete(NAMESPACE)
+        return purged
+
+    def stats(self) -> Dict[str, int]:
+        return dict(self._counters, size=len(self._entries), inflight=len(self._inflight))
+
+    async def _compute_shared(self, key, compute, deadline):
+        # The task runs in its own copy of the context, so this only affects the computation
+        with deadline_scope(deadline):
+            return await self._compute(key, compute)
+
+    async def _compute(self, key, compute):
+        if not self.shared:
+            return await compute()
+        shared_key = json.dumps(key)
+        async with self.shared.fill_lock_async(NAMESPACE, shared_key):
+            value = await asyncio.to_thread(self.shared.get, NAMESPACE, shared_key, self.ttl)
+            if value is not None:
+                self._counters["shared_hits"] += 1
+                return value
+            value = await compute()
+            await asyncio.to_thread(self.shared.set, NAMESPACE, shared_key, value)
+        return value
+
+    def _fill(self, key, task):
+        # A cancelled task may finish after a new one took its place
+        if self._inflight.get(key, (None,))[0] is task:
+            del self._inflight[key]
+        if task.cancelled() or task.exception() is not None:
+            return
+        self._entries[key] = (time.monotonic(), task.result())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self._counters["evictions"] += 1
+
+
+# Process-wide cache of crew results for /recommend-courses
+response_cache = ResponseCache()
@@ -0,0 +1,26 @@
+"""Async entry points shared by the API endpoints."""
+from typing import Any, Dict, List, Optional
+
+from src.ai_advisor.crew_executor import crew_executor
+from src.ai_advisor.main import crew_recommendations, fillInCourses
+from src.ai_advisor.response_cache import response_cache, response_cache_key
+
+
+async def crew_courses_async(major: str, semester) -> List[Dict[str, Any]]:
+    """
+    Get the crew's course list for a major and semester without blocking the
+    event loop, before generic slots are filled in.
+
+    The kickoff runs on the bounded crew pool, and identical (major, semester)
+    requests share one cached or in-flight run. Raises CrewQueueFull when the
+    pool's wait queue is full.
+    """
+    return await response_cache.get_or_compute(
+        response_cache_key(major, semester),
+        lambda: crew_executor.run(crew_recommendations, major, semester)
+    )
+
+
+async def recommend_with_crew_async(major: str, semester, seed: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Recommend courses with the crew; see crew_courses_async. Generic slots are filled per request."""
+    return fillInCourses(await crew_courses_async(major, semester), major, seed=seed)
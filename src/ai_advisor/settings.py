@@ -0,0 +1,114 @@
+"""Runtime settings for the AI advisor.
+
+Every value can be overridden with an ``AI_ADVISOR_*`` environment variable so
+the same image can be tuned per deployment without code changes.
+"""
+import os
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+KNOWLEDGE_DIR = os.path.join(ROOT_DIR, "knowledge")
+DEGREE_PROGRAMS_CSV = os.path.join(KNOWLEDGE_DIR, "degree_programs.csv")
+COURSES_CSV = os.path.join(KNOWLEDGE_DIR, "courses.csv")
+# TF-IDF matrix over courses.csv (see course_vectors.py)
+COURSE_VECTORS_PATH = os.path.join(KNOWLEDGE_DIR, "course_vectors.npz")
+CACHE_DIR = os.environ.get("AI_ADVISOR_CACHE_DIR", os.path.join(ROOT_DIR, ".cache"))
+
+
+def _env_int(name, default):
+    value = os.environ.get(name)
+    return int(value) if value else default
+
+
+def _env_float(name, default):
+    value = os.environ.get(name)
+    return float(value) if value else default
+
+
+def _env_bool(name, default):
+    value = os.environ.get(name)
+    return value.lower() in ("1", "true", "yes") if value else default
+
+
+# Cache shared by every worker on the host (see shared_cache.py), and how long
+# a worker may hold the right to fill an entry before others take it over
+SHARED_CACHE_PATH = os.environ.get("AI_ADVISOR_SHARED_CACHE", os.path.join(CACHE_DIR, "shared_cache.sqlite"))
+SHARED_CACHE_LEASE = _env_float("AI_ADVISOR_SHARED_CACHE_LEASE", 120.0)
+
+# Parsed plan of study cache (see plan_cache.py)
+PLAN_CACHE_SIZE = _env_int("AI_ADVISOR_PLAN_CACHE_SIZE", 128)
+PLAN_CACHE_TTL = _env_int("AI_ADVISOR_PLAN_CACHE_TTL", 24 * 60 * 60)
+
+# How /recommend-courses answers by default: "crew" always runs the LLM crew,
+# "fast" answers from the plan of study and only falls back to the crew when
+# the plan cannot answer the request
+RECOMMENDATION_MODE = os.environ.get("AI_ADVISOR_RECOMMENDATION_MODE", "crew")
+
+# Offline bulletin snapshot (see bulletin_index.py). With BULLETIN_OFFLINE set,
+# plans missing from the index are never fetched from the bulletin.
+BULLETIN_INDEX_PATH = os.environ.get("AI_ADVISOR_BULLETIN_INDEX", os.path.join(KNOWLEDGE_DIR, "bulletin_index.json"))
+BULLETIN_OFFLINE = _env_bool("AI_ADVISOR_BULLETIN_OFFLINE", False)
+
+# How often each plan of study is revalidated in the background (see
+# bulletin_refresher.py), in seconds; 0 turns the refresher off
+BULLETIN_REFRESH_INTERVAL = _env_float("AI_ADVISOR_BULLETIN_REFRESH_INTERVAL", 12 * 60 * 60)
+
+# Prerequisite graph (see prerequisites.py), built with
+# ``python -m src.ai_advisor.prerequisites``. Recommendations are only checked
+# against it for courses that require another recommended course once
+# PREREQUISITE_CHECK is turned on; until then the agent is asked to check them
+PREREQUISITE_CHECK = _env_bool("AI_ADVISOR_PREREQUISITE_CHECK", False)
+PREREQUISITES_PATH = os.environ.get("AI_ADVISOR_PREREQUISITES", os.path.join(KNOWLEDGE_DIR, "prerequisites.json"))
+
+# Crew kickoffs (see crew_executor.py): how many run at once, how many may
+# wait for a slot before requests are rejected with 429, and the Retry-After
+# hint in seconds used before any run time has been measured
+CREW_MAX_CONCURRENCY = _env_int("AI_ADVISOR_CREW_MAX_CONCURRENCY", 4)
+CREW_MAX_QUEUE = _env_int("AI_ADVISOR_CREW_MAX_QUEUE", 16)
+CREW_RETRY_AFTER = _env_int("AI_ADVISOR_CREW_RETRY_AFTER", 30)
+
+# Build the crew pool in the background at startup. Turn off for deployments
+# that only serve the fast path, so crewai is never imported
+WARM_UP_CREWS = _env_bool("AI_ADVISOR_WARM_UP_CREWS", True)
+
+# Print every agent step and tool call to stdout; for local debugging only
+CREW_VERBOSE = _env_bool("AI_ADVISOR_CREW_VERBOSE", False)
+
+# Fraction of crew kickoffs whose transcript is appended, off the request
+# path, to TRANSCRIPT_PATH as JSON lines (see transcripts.py); 0 records none
+TRANSCRIPT_SAMPLE_RATE = _env_float("AI_ADVISOR_TRANSCRIPT_SAMPLE_RATE", 0.0)
+TRANSCRIPT_PATH = os.environ.get("AI_ADVISOR_TRANSCRIPT_PATH", os.path.join(CACHE_DIR, "transcripts.jsonl"))
+
+# Deadline of a /recommend-courses request in seconds (see deadline.py); a
+# client may ask for less, or more up to REQUEST_TIMEOUT_MAX, with an
+# X-Request-Timeout header. A request out of time is answered from the plan of
+# study, flagged as degraded, with DEGRADED_TIMEOUT more seconds to load it
+REQUEST_TIMEOUT = _env_float("AI_ADVISOR_REQUEST_TIMEOUT", 90.0)
+REQUEST_TIMEOUT_MAX = _env_float("AI_ADVISOR_REQUEST_TIMEOUT_MAX", 300.0)
+DEGRADED_TIMEOUT = _env_float("AI_ADVISOR_DEGRADED_TIMEOUT", 5.0)
+
+# Cached crew results for /recommend-courses (see response_cache.py)
+RESPONSE_CACHE_SIZE = _env_int("AI_ADVISOR_RESPONSE_CACHE_SIZE", 1024)
+RESPONSE_CACHE_TTL = _env_int("AI_ADVISOR_RESPONSE_CACHE_TTL", 60 * 60)
+
+# /admin endpoints require this value in the X-Admin-Token header; while it
+# is unset they are disabled
+ADMIN_TOKEN = os.environ.get("AI_ADVISOR_ADMIN_TOKEN", "")
+
+# /recommend-courses/batch: largest accepted batch and how many of its items
+# may run the crew at the same time
+BATCH_MAX_ITEMS = _env_int("AI_ADVISOR_BATCH_MAX_ITEMS", 1000)
+BATCH_MAX_PARALLEL = _env_int("AI_ADVISOR_BATCH_MAX_PARALLEL", CREW_MAX_CONCURRENCY)
+
+# Bulletin HTTP client (see http_client.py)
+BULLETIN_CONNECT_TIMEOUT = _env_float("AI_ADVISOR_BULLETIN_CONNECT_TIMEOUT", 3.05)
+BULLETIN_READ_TIMEOUT = _env_float("AI_ADVISOR_BULLETIN_READ_TIMEOUT", 10.0)
+BULLETIN_MAX_RETRIES = _env_int("AI_ADVISOR_BULLETIN_MAX_RETRIES", 2)
+BULLETIN_BACKOFF = _env_float("AI_ADVISOR_BULLETIN_BACKOFF", 0.5)
+BULLETIN_PER_HOST_LIMIT = _env_int("AI_ADVISOR_BULLETIN_PER_HOST_LIMIT", 4)
+BULLETIN_POOL_SIZE = _env_int("AI_ADVISOR_BULLETIN_POOL_SIZE", 10)
+
+# Recorded LLM completions (see llm_cache.py): "off", "record" or "replay".
+# Off when serving, so every request gets a fresh completion; record and
+# replay are for tests and benchmarks
+LLM_CACHE_MODE = os.environ.get("AI_ADVISOR_LLM_CACHE", "off")
+LLM_CACHE_PATH = os.environ.get("AI_ADVISOR_LLM_CACHE_PATH", os.path.join(CACHE_DIR, "llm_cache.sqlite"))
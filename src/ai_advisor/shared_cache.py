@@ -0,0 +1,237 @@
+"""Cross-process cache shared by every worker on a host.
+
+One SQLite database in WAL mode (``settings.SHARED_CACHE_PATH``) holds JSON
+values by (namespace, key), so several uvicorn workers read each other's
+parsed plans ("plan") and crew results ("response") instead of each warming
+its own copy. Readers never block writers in WAL mode, and a lookup is one
+indexed SELECT.
+
+Fills are made atomic with leases: whoever computes an entry first takes a
+lease on its key with a single conditional INSERT, and every other thread or
+worker wanting the same key waits for the lease to be released (or to
+expire, if its holder died) and then reads the stored value. Callers check
+the cache again once they hold the lease:
+
+    value = shared_cache.get("plan", url)
+    if value is None:
+        with shared_cache.fill_lock("plan", url):
+            value = shared_cache.get("plan", url)
+            if value is None:
+                value = compute()
+                shared_cache.set("plan", url, value)
+
+Each worker attaches at startup (see startup.py); connections are opened per
+process, so the cache is safe to use in workers forked after import.
+"""
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import asynccontextmanager, contextmanager
+from typing import Any, Dict, Optional, Tuple
+
+from src.ai_advisor import settings
+from src.ai_advisor.deadline import capped_timeout
+
+logger = logging.getLogger(__name__)
+
+# Waiting for another worker's fill polls at these bounds, in seconds
+POLL_INITIAL = 0.01
+POLL_MAX = 0.25
+
+# A held async fill lease is renewed this many times per lease period
+RENEWALS_PER_LEASE = 3
+
+
+class SharedCache:
+    """SQLite-backed JSON store with expiring fill leases, shared between processes."""
+
+    def __init__(self, path: str = settings.SHARED_CACHE_PATH, lease: float = settings.SHARED_CACHE_LEASE):
+        self.path = path
+        self.lease = lease
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pid = None
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0, "stores": 0, "fills_waited": 0, "leases_taken_over": 0}
+
+    def attach(self) -> None:
+        """Open this process's connection and create the tables if needed."""
+        with self._lock:
+            self._connection()
+
+    def get(self, namespace: str, key: str, max_age: Optional[float] = None) -> Optional[Any]:
+        """Return the value stored under (namespace, key), or None if there is none or it is older than ``max_age``."""
+        entry = self.get_entry(namespace, key, max_age)
+        return entry[0] if entry else None
+
+    def get_entry(self, namespace: str, key: str, max_age: Optional[float] = None) -> Optional[Tuple[Any, float]]:
+        """Like get, but return (value, stored_at)."""
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT value, stored_at FROM entries WHERE namespace = ? AND key = ?", (namespace, key)).fetchone()
+            if row is not None and max_age is not None and time.time() - row[1] >= max_age:
+                row = None
+            self._counters["hits" if row else "misses"] += 1
+        if row is None:
+            return None
+        try:
+            return json.loads(row[0]), row[1]
+        except ValueError as e:
+            logger.warning(f"Ignoring unreadable shared cache entry {namespace}/{key}: {e}")
+            return None
+
+    def items(self, namespace: str) -> Dict[str, Any]:
+        """Return every value of ``namespace`` by key."""
+        with self._lock:
+            rows = self._connection().execute(
+                "SELECT key, value FROM entries WHERE namespace = ?", (namespace,)).fetchall()
+        return {key: json.loads(value) for key, value in rows}
+
+    def set(self, namespace: str, key: str, value: Any, stored_at: Optional[float] = None) -> None:
+        encoded = json.dumps(value, separators=(",", ":"))
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO entries (namespace, key, value, stored_at) VALUES (?, ?, ?, ?)",
+                    (namespace, key, encoded, time.time() if stored_at is None else stored_at))
+            self._counters["stores"] += 1
+
+    def delete(self, namespace: str, key: Optional[str] = None) -> int:
+        """Drop one key, or the whole namespace when no key is given; return how many entries were removed."""
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                if key is None:
+                    cursor = conn.execute("DELETE FROM entries WHERE namespace = ?", (namespace,))
+                else:
+                    cursor = conn.execute("DELETE FROM entries WHERE namespace = ? AND key = ?", (namespace, key))
+            return cursor.rowcount
+
+    def prune(self, namespace: str, max_age: float) -> int:
+        """Drop entries of ``namespace`` older than ``max_age`` seconds; return how many were removed."""
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                cursor = conn.execute("DELETE FROM entries WHERE namespace = ? AND stored_at < ?",
+                                      (namespace, time.time() - max_age))
+            return cursor.rowcount
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self._counters)
+
+    def try_acquire(self, namespace: str, key: str, token: str) -> bool:
+        """Take the fill lease on (namespace, key) for ``token`` unless someone else holds an unexpired one."""
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                previous = conn.execute("SELECT owner, expires_at FROM leases WHERE namespace = ? AND key = ?",
+                                        (namespace, key)).fetchone()
+                cursor = conn.execute(
+                    "INSERT INTO leases (namespace, key, owner, expires_at) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT (namespace, key) DO UPDATE SET owner = excluded.owner, expires_at = excluded.expires_at "
+                    "WHERE leases.expires_at < ? OR leases.owner = excluded.owner",
+                    (namespace, key, token, now + self.lease, now))
+            acquired = cursor.rowcount == 1
+            if acquired and previous is not None and previous[0] != token:
+                self._counters["leases_taken_over"] += 1
+                logger.warning(f"Took over expired fill lease on {namespace}/{key}")
+            return acquired
+
+    def renew(self, namespace: str, key: str, token: str) -> bool:
+        """Extend the lease ``token`` holds on (namespace, key); False if it no longer holds it."""
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                cursor = conn.execute("UPDATE leases SET expires_at = ? WHERE namespace = ? AND key = ? AND owner = ?",
+                                      (time.time() + self.lease, namespace, key, token))
+            return cursor.rowcount == 1
+
+    def release(self, namespace: str, key: str, token: str) -> None:
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.execute("DELETE FROM leases WHERE namespace = ? AND key = ? AND owner = ?",
+                             (namespace, key, token))
+
+    @contextmanager
+    def fill_lock(self, namespace: str, key: str):
+        """
+        Hold the fill lease on (namespace, key), waiting while another thread
+        or worker holds it, but not past the current request's deadline.
+
+        Raises:
+            DeadlineExceeded: if the request runs out of time while waiting
+        """
+        token = uuid.uuid4().hex
+        delay = POLL_INITIAL
+        waited = False
+        while not self.try_acquire(namespace, key, token):
+            waited = True
+            time.sleep(capped_timeout(delay))
+            delay = min(delay * 2, POLL_MAX)
+        if waited:
+            with self._lock:
+                self._counters["fills_waited"] += 1
+        try:
+            yield
+        finally:
+            self.release(namespace, key, token)
+
+    @asynccontextmanager
+    async def fill_lock_async(self, namespace: str, key: str):
+        """
+        fill_lock for coroutines; waits with asyncio.sleep so the event loop
+        keeps serving. The lease is renewed while it is held, so a fill that
+        takes longer than the lease, like a crew run, keeps it to the end.
+        """
+        token = uuid.uuid4().hex
+        delay = POLL_INITIAL
+        waited = False
+        while not await asyncio.to_thread(self.try_acquire, namespace, key, token):
+            waited = True
+            await asyncio.sleep(capped_timeout(delay))
+            delay = min(delay * 2, POLL_MAX)
+        if waited:
+            with self._lock:
+                self._counters["fills_waited"] += 1
+        heartbeat = asyncio.ensure_future(self._renew_while_held(namespace, key, token))
+        try:
+            yield
+        finally:
+            heartbeat.cancel()
+            await asyncio.to_thread(self.release, namespace, key, token)
+
+    async def _renew_while_held(self, namespace, key, token):
+        while True:
+            await asyncio.sleep(self.lease / RENEWALS_PER_LEASE)
+            if not await asyncio.to_thread(self.renew, namespace, key, token):
+                logger.warning(f"Lost the fill lease on {namespace}/{key} before the fill finished")
+                return
+
+    def _connection(self):
+        # Caller must hold self._lock. Connections aren't shared across a fork.
+        if self._conn is None or self._pid != os.getpid():
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self._conn = sqlite3.connect(self.path, timeout=5.0, check_same_thread=False)
+            self._pid = os.getpid()
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            with self._conn:
+                self._conn.execute(
+                    "CREATE TABLE IF NOT EXISTS entries (namespace TEXT NOT NULL, key TEXT NOT NULL, "
+                    "value TEXT NOT NULL, stored_at REAL NOT NULL, PRIMARY KEY (namespace, key))")
+                self._conn.execute(
+                    "CREATE TABLE IF NOT EXISTS leases (namespace TEXT NOT NULL, key TEXT NOT NULL, "
+                    "owner TEXT NOT NULL, expires_at REAL NOT NULL, PRIMARY KEY (namespace, key))")
+        return self._conn
+
+
+# Process-wide handle on the host's shared cache
+shared_cache = SharedCache()
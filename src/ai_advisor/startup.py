@@ -0,0 +1,51 @@
+"""Explicit startup phase for the API process.
+
+Importing the app only imports what the deterministic endpoints need. At
+startup, preload_knowledge loads the knowledge files so the first request
+doesn't pay for parsing them, and warm_up_crews (run in the background so it
+doesn't hold up serving) imports crewai and builds the crew pool.
+"""
+import logging
+import time
+
+from src.ai_advisor import settings
+from src.ai_advisor.bulletin_index import get_bulletin_index
+from src.ai_advisor.course_table import get_course_table
+from src.ai_advisor.course_vectors import get_course_vectors
+from src.ai_advisor.metrics import record_stage
+from src.ai_advisor.prerequisites import get_prerequisite_graph
+from src.ai_advisor.program_index import get_program_index
+from src.ai_advisor.response_cache import NAMESPACE as RESPONSE_NAMESPACE
+from src.ai_advisor.shared_cache import shared_cache
+
+logger = logging.getLogger(__name__)
+
+
+def preload_knowledge() -> None:
+    """
+    Attach to the host's shared cache and load the degree program index,
+    course table and vectors, offline bulletin index and prerequisite graph.
+    """
+    started = time.perf_counter()
+    shared_cache.attach()
+    # Expired crew results are never served again; plans are kept for revalidation
+    shared_cache.prune(RESPONSE_NAMESPACE, settings.RESPONSE_CACHE_TTL)
+    get_program_index()
+    get_course_table()
+    get_course_vectors()
+    get_bulletin_index()
+    get_prerequisite_graph()
+    elapsed = time.perf_counter() - started
+    record_stage("startup_preload", elapsed)
+    logger.info(f"Preloaded knowledge files in {elapsed * 1000:.0f} ms")
+
+
+def warm_up_crews() -> None:
+    """Import crewai and fill the crew pool; crew requests before this finishes build crews on demand."""
+    started = time.perf_counter()
+    from src.ai_advisor.crew_pool import crew_pool
+
+    crew_pool.warm_up()
+    elapsed = time.perf_counter() - started
+    record_stage("startup_crews", elapsed)
+    logger.info(f"Crews ready in {elapsed:.1f} s")
@@ -0,0 +1,81 @@
+"""Stage-by-stage recommendation events for the streaming endpoint.
+
+iter_recommendation_events yields (event, data) pairs as each stage of a
+recommendation finishes:
+
+    program      matched degree program and plan of study URL
+    plan         plan of study loaded (fast mode only)
+    llm_started  the crew is running because the plan could not answer
+    course       one filled-in course, once the list is resolved
+    done         source of the answer and number of courses
+    error        the request failed; no further events follow
+"""
+import asyncio
+import json
+import logging
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+
+from src.ai_advisor import settings
+from src.ai_advisor.crew_executor import CrewQueueFull
+from src.ai_advisor.fast_path import semester_courses_from_plan
+from src.ai_advisor.main import fillInCourses
+from src.ai_advisor.plan_of_study import get_suggested_plan_of_study
+from src.ai_advisor.program_index import get_program_index
+from src.ai_advisor.service import crew_courses_async
+
+logger = logging.getLogger(__name__)
+
+Event = Tuple[str, Dict[str, Any]]
+
+
+async def iter_recommendation_events(major: str, semester: str, mode: Optional[str] = None,
+                                     seed: Optional[int] = None) -> AsyncIterator[Event]:
+    """Yield the events for one recommendation; see the module docstring."""
+    program = get_program_index().best(major)
+    url = program.get("plan_of_study_url") if program else None
+    yield "program", {"degree_program": program["degree_program"] if program else None, "url": url}
+
+    courses = None
+    source = "crew"
+    if (mode or settings.RECOMMENDATION_MODE) == "fast" and url:
+        try:
+            plan_of_study = await asyncio.to_thread(get_suggested_plan_of_study, major, url)
+        except Exception as e:
+            yield "error", {"status": 500, "detail": f"An error occurred: {str(e)}"}
+            return
+        yield "plan", {"semesters": len(plan_of_study)}
+        courses = semester_courses_from_plan(plan_of_study, major, semester)
+        source = "plan_of_study"
+
+    if courses is None:
+        source = "crew"
+        yield "llm_started", {}
+        try:
+            courses = await crew_courses_async(major, semester)
+        except CrewQueueFull as e:
+            yield "error", {"status": 429, "detail": "Too many recommendations in progress, please retry later",
+                            "retry_after": e.retry_after}
+            return
+        except Exception as e:
+            yield "error", {"status": 500, "detail": f"An error occurred: {str(e)}"}
+            return
+
+    # Filled in one go, like /recommend-courses, so a seed picks the same courses there and here
+    try:
+        filled = fillInCourses(courses, major, seed=seed)
+    except Exception as e:
+        yield "error", {"status": 500, "detail": f"An error occurred: {str(e)}"}
+        return
+    for course in filled:
+        yield "course", course
+    yield "done", {"source": source, "count": len(filled)}
+
+
+def format_sse(event: str, data: Dict[str, Any]) -> str:
+    """Render one event as a Server-Sent Events message."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def format_ndjson(event: str, data: Dict[str, Any]) -> str:
+    """Render one event as a line of NDJSON."""
+    return json.dumps({"event": event, "data": data}) + "\n"
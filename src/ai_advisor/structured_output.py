@@ -0,0 +1,154 @@
+"""Schema-validated parsing of the crew's course recommendations.
+
+The recommend_courses task is asked for a JSON list of courses, but the model
+sometimes wraps it in markdown or prose, leaves trailing commas, uses Python
+literals, or runs out of tokens half-way through the list. parse_recommendations
+repairs those near misses locally; only output that can't be repaired costs an
+extra LLM call, and that call (reask_format) only re-does the formatting step
+instead of re-running the whole agent.
+"""
+import ast
+import json
+import logging
+import re
+from typing import Any, List, Optional, Union
+
+from pydantic import AliasChoices, BaseModel, Field, ValidationError, field_validator
+
+logger = logging.getLogger(__name__)
+
+
+class RecommendationFormatError(ValueError):
+    """Raised when the crew's output can't be turned into a course list."""
+
+
+class RecommendedCourse(BaseModel):
+    code: str = Field(validation_alias=AliasChoices("code", "course_code"))
+    name: str = Field("", validation_alias=AliasChoices("name", "course_name", "title"))
+    description: Optional[str] = None
+    credits: Optional[str] = Field(None, validation_alias=AliasChoices("credits", "credit_hours"))
+    fulfillment_type: Optional[str] = None
+    prerequisites: Optional[Union[str, List[str]]] = None
+
+    @field_validator("credits", mode="before")
+    @classmethod
+    def _credits_as_str(cls, value):
+        return None if value is None else str(value)
+
+
+class CourseRecommendations(BaseModel):
+    courses: List[RecommendedCourse]
+
+
+_FENCE = re.compile(r"```(?:json|JSON)?\s*\n?(.*?)(?:```|$)", re.DOTALL)
+_TRAILING_COMMA = re.compile(r",\s*([\]}])")
+_SMART_QUOTES = str.maketrans({"“": '"', "”": '"', "‘": "'", "’": "'"})
+
+
+def _candidates(text: str):
+    """Yield progressively more aggressive readings of ``text`` as Python objects."""
+    fenced = _FENCE.search(text)
+    if fenced:
+        text = fenced.group(1)
+    text = text.strip()
+    try:
+        yield json.loads(text)
+    except ValueError:
+        pass
+
+    # Cut away any prose around the outermost list or object
+    starts = [i for i in (text.find("["), text.find("{")) if i != -1]
+    if not starts:
+        return
+    start = min(starts)
+    end = text.rfind("]" if text[start] == "[" else "}")
+    body = text[start:end + 1] if end > start else text[start:]
+    body = _TRAILING_COMMA.sub(r"\1", body.translate(_SMART_QUOTES))
+    try:
+        yield json.loads(body)
+    except ValueError:
+        pass
+    try:
+        # Single quotes, True/False/None
+        yield ast.literal_eval(body)
+    except (ValueError, SyntaxError, MemoryError, RecursionError):
+        pass
+
+    # Truncated output: keep every complete object in the list
+    salvaged = _salvage_objects(text[start:])
+    if salvaged:
+        logger.info(f"Salvaged {len(salvaged)} complete courses from truncated output")
+        yield salvaged
+
+
+def _salvage_objects(text: str) -> List[Any]:
+    decoder = json.JSONDecoder()
+    position = text.find("{")
+    objects = []
+    while position != -1:
+        try:
+            obj, end = decoder.raw_decode(text, position)
+        except ValueError:
+            break
+        objects.append(obj)
+        position = text.find("{", end)
+    return objects
+
+
+def _validate(data) -> List[RecommendedCourse]:
+    if isinstance(data, dict):
+        data = data.get("courses", data.get("recommendations", [data]))
+    return CourseRecommendations(courses=data).courses
+
+
+def parse_recommendations(raw: str) -> List[dict]:
+    """
+    Parse and validate the crew's raw output into a list of course dicts.
+
+    Args:
+        raw: The final answer of the recommend_courses task
+
+    Returns:
+        One dict per course with "code", "name" and whichever optional fields were given
+
+    Raises:
+        RecommendationFormatError: if no repair yields a valid course list
+    """
+    last_error = None
+    for candidate in _candidates(raw or ""):
+        try:
+            courses = _validate(candidate)
+        except (ValidationError, TypeError) as e:
+            last_error = e
+            continue
+        return [course.model_dump(exclude_none=True) for course in courses]
+    raise RecommendationFormatError(f"Could not parse course recommendations: {last_error or 'no JSON found'}")
+
+
+REASK_PROMPT = """Rewrite the course recommendations below as JSON that matches this schema:
+
+{schema}
+
+Reply with only the JSON object, no markdown and no commentary. Keep every course \
+that is mentioned and do not add new ones.
+
+Recommendations:
+{raw}"""
+
+
+def reask_format(raw: str, llm) -> List[dict]:
+    """
+    Ask ``llm`` to reformat output that parse_recommendations rejected.
+
+    This is a single short completion over the crew's own answer; the agent
+    and its tools are not run again.
+
+    Raises:
+        RecommendationFormatError: if the reformatted output is still invalid
+    """
+    prompt = REASK_PROMPT.format(schema=json.dumps(CourseRecommendations.model_json_schema()), raw=raw)
+    reformatted = llm.call([
+        {"role": "system", "content": "You convert text into strictly valid JSON."},
+        {"role": "user", "content": prompt},
+    ])
+    return parse_recommendations(reformatted)
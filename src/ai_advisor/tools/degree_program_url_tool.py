@@ -1,10 +1,14 @@
-import os
-import pandas as pd
-from difflib import get_close_matches
+import logging
 from crewai.tools import BaseTool
-from typing import Type, List, Dict, Any
+from typing import Type
 from pydantic import BaseModel, Field
 
+from src.ai_advisor import settings
+from src.ai_advisor.metrics import span
+from src.ai_advisor.program_index import plan_of_study_url
+
+logger = logging.getLogger(__name__)
+
 class DegreeProgramUrlQueryInput(BaseModel):
     degree_program: str = Field(..., description="The degree program to search for.")
 
@@ -16,15 +20,12 @@ class DegreeProgramUrlTool(BaseTool):
 
     def __init__(self, **data):
         super().__init__(**data)
-        self.csv_path = os.path.join(
-            os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))),
-            "knowledge",
-            "degree_programs.csv"
-        )
+        self.csv_path = settings.DEGREE_PROGRAMS_CSV
 
+    @span("tool.degree_program_url")
     def _run(self, degree_program: str) -> str:
         # Get the full plan of study for the given major
-        print(f"Getting url for {degree_program}")
+        logger.debug(f"Getting url for {degree_program}")
         url = self._get_plan_of_study_url(degree_program)
         
         if not url:
@@ -37,38 +38,6 @@ class DegreeProgramUrlTool(BaseTool):
     def _get_plan_of_study_url(self, degree_program):
         """
         Find the closest matching degree program and return its plan of study URL.
-        
-        Args:
-            degree_program (str): The degree program to search for.
-            
-        Returns:
-            str: The URL to the plan of study for the closest matching degree program.
+        See program_index.plan_of_study_url.
         """
-        try:
-            # Read the CSV file
-            df = pd.read_csv(self.csv_path)
-            
-            # Check if required columns exist
-            if 'degree_program' not in df.columns or 'plan_of_study_url' not in df.columns:
-                return "Error: CSV file does not contain required columns."
-            
-            # Get all degree programs
-            degree_programs = df['degree_program'].tolist()
-            
-            # Find closest match
-            matches = get_close_matches(degree_program, degree_programs, n=1, cutoff=0.6)
-            print(f"Matches: {matches}")
-            if not matches:
-                return None
-                
-            best_match = matches[0]
-            
-            # Get the URL for the best match
-            url = df[df['degree_program'] == best_match]['plan_of_study_url'].iloc[0]
-            
-            print(f"Found url for {degree_program}: {url}")
-            return url
-            
-        except Exception as e:
-            return f"Error finding degree program: {str(e)}"
-
+        return plan_of_study_url(degree_program, self.csv_path)
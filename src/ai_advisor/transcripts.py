@@ -0,0 +1,135 @@
+"""Optional, sampled sink for crew transcripts.
+
+Crews run quietly when serving (settings.CREW_VERBOSE is off), so nothing is
+printed on the request path. Instead, a ``settings.TRANSCRIPT_SAMPLE_RATE``
+fraction of kickoffs record every agent step and the final output, and the
+transcript is handed to a background thread that appends it as one JSON line
+to ``settings.TRANSCRIPT_PATH``. Recording never blocks a kickoff: when the
+writer falls behind, transcripts are dropped and counted instead.
+
+Steps reach the transcript through record_step, which every crew gets as its
+step_callback; it appends to the transcript of the kickoff running in the
+current context, if that kickoff was sampled.
+"""
+import json
+import logging
+import os
+import queue
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, Optional
+
+from src.ai_advisor import settings
+
+logger = logging.getLogger(__name__)
+
+# Step attributes worth keeping from crewai's AgentAction / AgentFinish / ToolResult
+_STEP_FIELDS = ("thought", "tool", "tool_input", "result", "output", "text")
+# Longest string kept per step field
+MAX_FIELD_LENGTH = 4000
+
+_current: ContextVar[Optional[Dict[str, Any]]] = ContextVar("ai_advisor_transcript", default=None)
+
+
+def record_step(step: Any) -> None:
+    """crewai step_callback: add ``step`` to the current kickoff's transcript, if it is being recorded."""
+    transcript = _current.get()
+    if transcript is None:
+        return
+    entry = {"type": type(step).__name__, "at": time.time()}
+    for field in _STEP_FIELDS:
+        value = getattr(step, field, None)
+        if value is not None:
+            entry[field] = str(value)[:MAX_FIELD_LENGTH]
+    transcript["steps"].append(entry)
+
+
+class TranscriptSink:
+    """Writes sampled transcripts as JSON lines from a background thread."""
+
+    def __init__(self, path: str = settings.TRANSCRIPT_PATH, sample_rate: float = settings.TRANSCRIPT_SAMPLE_RATE,
+                 max_pending: int = 256):
+        self.path = path
+        self.sample_rate = sample_rate
+        self._queue: "queue.Queue[Dict[str, Any]]" = queue.Queue(max_pending)
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._counters = {"recorded": 0, "written": 0, "dropped": 0}
+
+    @contextmanager
+    def recording(self, **inputs: Any) -> Iterator[Optional[Dict[str, Any]]]:
+        """
+        Record the kickoff run inside this block if it is sampled.
+
+        Yields the transcript dict (None when not sampled), to which the caller
+        may add the outcome; it is queued for writing when the block exits,
+        with the error if the block raised.
+        """
+        if self.sample_rate <= 0 or random.random() >= self.sample_rate:
+            yield None
+            return
+        transcript = {"inputs": inputs, "started_at": time.time(), "steps": []}
+        token = _current.set(transcript)
+        try:
+            yield transcript
+        except BaseException as e:
+            transcript["error"] = repr(e)
+            raise
+        finally:
+            _current.reset(token)
+            transcript["elapsed"] = time.time() - transcript["started_at"]
+            self.submit(transcript)
+
+    def submit(self, transcript: Dict[str, Any]) -> None:
+        """Queue ``transcript`` for writing without waiting; drop it if the writer is behind."""
+        self._ensure_writer()
+        try:
+            self._queue.put_nowait(transcript)
+        except queue.Full:
+            with self._lock:
+                self._counters["dropped"] += 1
+            return
+        with self._lock:
+            self._counters["recorded"] += 1
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every queued transcript has been written; return False on timeout."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self._queue.unfinished_tasks:
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self._counters, pending=self._queue.qsize(), sample_rate=self.sample_rate)
+
+    def _ensure_writer(self):
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._write_forever, name="transcript-sink", daemon=True)
+                self._thread.start()
+
+    def _write_forever(self):
+        while True:
+            transcript = self._queue.get()
+            try:
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(transcript, default=str) + "\n")
+                with self._lock:
+                    self._counters["written"] += 1
+            except OSError as e:
+                logger.warning(f"Could not write crew transcript to {self.path}: {e}")
+            finally:
+                self._queue.task_done()
+
+
+# Process-wide sink used by every kickoff
+transcript_sink = TranscriptSink()
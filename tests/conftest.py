@@ -0,0 +1,35 @@
+import os
+import tempfile
+
+# Keep the process-wide caches created at import time out of the working tree
+os.environ.setdefault("AI_ADVISOR_CACHE_DIR", tempfile.mkdtemp(prefix="ai_advisor_tests_"))
+
+import pytest  # noqa: E402
+
+
+class FakeClock:
+    """Stands in for time.time so expiry can be tested without sleeping."""
+
+    def __init__(self, now: float = 1_000_000.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr("time.time", fake)
+    return fake
+
+
+@pytest.fixture
+def stub():
+    from benchmarks.bulletin_stub import BulletinStubServer
+
+    with BulletinStubServer() as server:
+        yield server
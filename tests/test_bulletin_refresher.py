@@ -0,0 +1,117 @@
+import pytest
+
+from src.ai_advisor import bulletin_refresher, settings
+from src.ai_advisor.bulletin_refresher import BulletinRefresher
+from src.ai_advisor.http_client import FetchResult, bulletin_client
+from src.ai_advisor.plan_cache import PlanCache
+from src.ai_advisor.shared_cache import SharedCache
+
+PROGRAMS = ["B.A. in Geology"]
+
+with open(settings.KNOWLEDGE_DIR + "/ba_geology.html", "rb") as f:
+    PAGE = f.read()
+
+
+@pytest.fixture
+def shared(tmp_path):
+    return SharedCache(str(tmp_path / "shared.sqlite"))
+
+
+@pytest.fixture
+def plans(shared, monkeypatch):
+    """This worker's plan cache, in place of the process-wide one."""
+    plans = PlanCache(shared=shared)
+    monkeypatch.setattr(bulletin_refresher, "shared_cache", shared)
+    monkeypatch.setattr(bulletin_refresher, "plan_cache", plans)
+    return plans
+
+
+@pytest.fixture
+def url(stub):
+    stub.set_page("/geology/", PAGE)
+    return stub.url("/geology/")
+
+
+def test_first_check_parses_the_plan(plans, url):
+    assert BulletinRefresher().refresh(url, PROGRAMS) == "changed"
+    plan = plans.get(url)
+    assert plan[0]["courses"][0]["course_code"] == "GSC 110"
+
+
+def test_recheck_of_the_same_page_is_not_modified(plans, stub, url):
+    refresher = BulletinRefresher()
+    refresher.refresh(url, PROGRAMS)
+
+    assert refresher.refresh(url, PROGRAMS) == "skipped"
+    assert refresher.refresh(url, PROGRAMS, force=True) == "not_modified"
+    assert stub.not_modified == 1
+    assert plans.get(url) is not None
+
+
+def test_page_changed_outside_the_grid_is_unchanged(plans, stub, url):
+    refresher = BulletinRefresher()
+    refresher.refresh(url, PROGRAMS)
+    plan = plans.get(url)
+    etag = plans.get_stale(url)["validators"]["etag"]
+
+    stub.set_page("/geology/", PAGE + b"<!-- footer revised -->")
+    assert refresher.refresh(url, PROGRAMS, force=True) == "unchanged"
+    assert plans.get(url) == plan
+    # Revalidated against the new page from now on
+    assert plans.get_stale(url)["validators"]["etag"] != etag
+
+
+def test_new_grid_is_swapped_in(plans, stub, url):
+    refresher = BulletinRefresher()
+    refresher.refresh(url, PROGRAMS)
+
+    stub.set_page("/geology/", PAGE.replace(b"GSC 110", b"GSC 111"))
+    assert refresher.refresh(url, PROGRAMS, force=True) == "changed"
+    assert plans.get(url)[0]["courses"][0]["course_code"] == "GSC 111"
+    record = refresher.freshness()[0]
+    assert record["changes"] == 2
+
+
+def test_unreachable_page_keeps_the_cached_plan(plans, stub, url):
+    refresher = BulletinRefresher()
+    refresher.refresh(url, PROGRAMS)
+    plan = plans.get(url)
+
+    stub.set_page("/geology/", b"<html>down for maintenance</html>")
+    assert refresher.refresh(url, PROGRAMS, force=True) == "error"
+    assert plans.get(url) == plan
+    assert refresher.refresh(stub.url("/missing/"), PROGRAMS) == "error"
+    assert {record["status"] for record in refresher.freshness()} == {"error"}
+
+
+def test_not_modified_without_a_cached_plan_fetches_the_page(plans, url, monkeypatch):
+    refresher = BulletinRefresher()
+    refresher.refresh(url, PROGRAMS)
+    # The freshness record outlives the plan, and something in between still answers 304
+    plans.invalidate(url)
+    fetch = bulletin_client.fetch
+    answers = iter([FetchResult(304, None, None, None)])
+    monkeypatch.setattr(bulletin_client, "fetch", lambda *args, **kwargs: next(answers, None) or fetch(*args, **kwargs))
+
+    assert refresher.refresh(url, PROGRAMS, force=True) == "changed"
+    assert plans.get(url)[0]["courses"][0]["course_code"] == "GSC 110"
+
+
+def test_other_workers_reload_a_changed_plan(shared, plans, stub, url, monkeypatch):
+    checking, other = BulletinRefresher(), BulletinRefresher()
+    checking.refresh(url, PROGRAMS)
+    # The other worker holds the first plan in memory
+    other_plans = PlanCache(shared=shared)
+    assert other_plans.get(url)[0]["courses"][0]["course_code"] == "GSC 110"
+    monkeypatch.setattr(bulletin_refresher, "plan_cache", other_plans)
+    assert other.refresh(url, PROGRAMS) == "skipped"
+
+    monkeypatch.setattr(bulletin_refresher, "plan_cache", plans)
+    stub.set_page("/geology/", PAGE.replace(b"GSC 110", b"GSC 111"))
+    assert checking.refresh(url, PROGRAMS, force=True) == "changed"
+    assert other_plans.get(url)[0]["courses"][0]["course_code"] == "GSC 110"
+
+    monkeypatch.setattr(bulletin_refresher, "plan_cache", other_plans)
+    assert other.refresh(url, PROGRAMS) == "skipped"
+    assert other_plans.get(url)[0]["courses"][0]["course_code"] == "GSC 111"
+    assert stub.requests == 2
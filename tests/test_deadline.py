@@ -0,0 +1,196 @@
+import asyncio
+import json
+import threading
+import time
+
+import httpx
+import pytest
+
+import main
+from src.ai_advisor import settings
+from src.ai_advisor.deadline import (
+    Deadline,
+    DeadlineExceeded,
+    capped_timeout,
+    check_deadline,
+    current_deadline,
+    deadline_scope,
+    request_deadline,
+)
+from src.ai_advisor.shared_cache import SharedCache
+
+COURSES = [{"code": "CSC 120", "name": "Computer Programming I", "credits": "4"}]
+BODY = {"major": "B.S. in Computer Science", "semester": "1", "mode": "crew"}
+
+
+def test_capped_timeout_without_a_deadline_is_unchanged():
+    assert capped_timeout(10.0) == 10.0
+    assert capped_timeout(None) is None
+    with deadline_scope(Deadline()):
+        assert capped_timeout(10.0) == 10.0
+    check_deadline()
+
+
+def test_capped_timeout_is_cut_to_the_time_left():
+    with deadline_scope(Deadline.after(0.5)):
+        assert 0.4 < capped_timeout(10.0) <= 0.5
+        assert 0.4 < capped_timeout(None) <= 0.5
+        assert capped_timeout(0.1) == 0.1
+
+
+def test_capped_timeout_caps_a_blocking_call():
+    started = time.monotonic()
+    with deadline_scope(Deadline.after(0.1)):
+        assert not threading.Event().wait(capped_timeout(10.0))
+    assert time.monotonic() - started < 0.5
+
+
+def test_out_of_time_raises():
+    deadline = Deadline.after(0)
+    with deadline_scope(deadline):
+        with pytest.raises(DeadlineExceeded):
+            capped_timeout(10.0)
+        with pytest.raises(DeadlineExceeded):
+            check_deadline()
+
+    cancelled = Deadline.after(60)
+    cancelled.cancel()
+    assert cancelled.remaining() == 0
+    with deadline_scope(cancelled), pytest.raises(DeadlineExceeded, match="cancelled"):
+        check_deadline()
+
+
+def test_request_deadline_is_bounded(monkeypatch):
+    monkeypatch.setattr(settings, "REQUEST_TIMEOUT", 30.0)
+    monkeypatch.setattr(settings, "REQUEST_TIMEOUT_MAX", 60.0)
+    assert 29 < request_deadline().remaining() <= 30
+    assert 29 < request_deadline(0).remaining() <= 30
+    assert 9 < request_deadline(10).remaining() <= 10
+    assert 59 < request_deadline(600).remaining() <= 60
+
+
+def test_lease_wait_ends_at_the_deadline(tmp_path):
+    shared = SharedCache(str(tmp_path / "shared.sqlite"), lease=60)
+    assert shared.try_acquire("response", "k", "other worker")
+
+    started = time.monotonic()
+    with deadline_scope(Deadline.after(0.3)), pytest.raises(DeadlineExceeded):
+        with shared.fill_lock("response", "k"):
+            pass
+    assert time.monotonic() - started < 1.0
+
+
+def test_async_lease_wait_ends_at_the_deadline(tmp_path):
+    shared = SharedCache(str(tmp_path / "shared.sqlite"), lease=60)
+    assert shared.try_acquire("response", "k", "other worker")
+
+    async def fill():
+        with deadline_scope(Deadline.after(0.3)):
+            async with shared.fill_lock_async("response", "k"):
+                pass
+
+    started = time.monotonic()
+    with pytest.raises(DeadlineExceeded):
+        asyncio.run(fill())
+    assert time.monotonic() - started < 1.0
+
+
+@pytest.fixture
+def slow_crew(monkeypatch):
+    """A crew run that takes far longer than any request in these tests."""
+    calls = []
+
+    async def recommend(major, semester, seed=None):
+        calls.append(current_deadline())
+        await asyncio.sleep(30)
+
+    monkeypatch.setattr(main, "recommend_with_crew_async", recommend)
+    monkeypatch.setattr(settings, "DEGRADED_TIMEOUT", 0.3)
+    return calls
+
+
+def post(body=BODY, timeout="0.2"):
+    async def request():
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.post("/recommend-courses", json=body, headers={"X-Request-Timeout": timeout})
+
+    return asyncio.run(request())
+
+
+def test_out_of_time_request_is_answered_from_the_plan(slow_crew, monkeypatch):
+    monkeypatch.setattr(main, "recommend_from_plan", lambda major, semester, seed=None: COURSES)
+
+    started = time.monotonic()
+    response = post()
+    assert time.monotonic() - started < 1.0
+    assert response.status_code == 200
+    assert response.json() == {"major": BODY["major"], "semester": "1", "courses": COURSES, "degraded": True}
+    assert slow_crew[0].expires_at - time.monotonic() < 0.2
+
+
+def test_failing_fallback_times_out(slow_crew, monkeypatch):
+    def recommend_from_plan(major, semester, seed=None):
+        raise RuntimeError("bulletin unreachable")
+
+    monkeypatch.setattr(main, "recommend_from_plan", recommend_from_plan)
+    response = post()
+    assert response.status_code == 504
+
+
+def test_slow_fallback_stops_at_its_own_deadline(slow_crew, monkeypatch):
+    stopped = threading.Event()
+
+    def recommend_from_plan(major, semester, seed=None):
+        try:
+            while True:
+                check_deadline()
+                time.sleep(0.01)
+        finally:
+            stopped.set()
+
+    monkeypatch.setattr(main, "recommend_from_plan", recommend_from_plan)
+    started = time.monotonic()
+    response = post()
+    assert response.status_code == 504
+    assert time.monotonic() - started < 1.5
+    assert stopped.wait(1.0)
+
+
+def test_error_before_the_deadline_is_not_degraded(monkeypatch):
+    async def recommend(major, semester, seed=None):
+        raise RuntimeError("crew failed")
+
+    monkeypatch.setattr(main, "recommend_with_crew_async", recommend)
+    response = post(timeout="10")
+    assert response.status_code == 500
+
+
+def test_client_disconnect_cancels_the_request(slow_crew):
+    body = json.dumps(BODY).encode()
+    messages = [{"type": "http.request", "body": body, "more_body": False}]
+    sent = []
+
+    async def receive():
+        if messages:
+            return messages.pop(0)
+        # The client hangs up once the body is in
+        await asyncio.sleep(0.05)
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "POST",
+        "scheme": "http", "path": "/recommend-courses", "raw_path": b"/recommend-courses", "query_string": b"",
+        "root_path": "", "headers": [(b"content-type", b"application/json"),
+                                     (b"content-length", str(len(body)).encode())],
+        "client": ("127.0.0.1", 50000), "server": ("test", 80),
+    }
+    started = time.monotonic()
+    asyncio.run(main.app(scope, receive, send))
+    assert time.monotonic() - started < 1.0
+    assert sent[0]["type"] == "http.response.start"
+    assert sent[0]["status"] == 499
+    assert slow_crew[0].cancelled
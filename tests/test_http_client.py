@@ -0,0 +1,133 @@
+import threading
+import time
+
+import pytest
+import requests
+
+from src.ai_advisor.deadline import Deadline, DeadlineExceeded, deadline_scope
+from src.ai_advisor.http_client import BulletinClient
+
+PAGE = b"<html>plan of study</html>"
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Backoff delays the client asked to sleep for, without sleeping."""
+    delays = []
+    monkeypatch.setattr("src.ai_advisor.http_client.time.sleep", delays.append)
+    return delays
+
+
+def test_retries_with_growing_backoff_until_the_page_comes_back(stub, sleeps):
+    stub.set_page("/p/", PAGE)
+    stub.fail_next(2)
+    client = BulletinClient(max_retries=2, backoff=0.1)
+
+    result = client.fetch(stub.url("/p/"))
+    assert result.status == 200
+    assert result.content == PAGE
+    assert stub.requests == 3
+    assert len(sleeps) == 2
+    # Jittered between half and one and a half times backoff * 2**attempt
+    assert 0.05 <= sleeps[0] <= 0.15
+    assert 0.1 <= sleeps[1] <= 0.3
+
+
+def test_gives_up_after_the_last_retry(stub, sleeps):
+    stub.set_page("/p/", PAGE)
+    stub.fail_next(3)
+    client = BulletinClient(max_retries=2, backoff=0.1)
+
+    with pytest.raises(requests.exceptions.HTTPError):
+        client.fetch(stub.url("/p/"))
+    assert stub.requests == 3
+
+
+def test_does_not_retry_a_client_error(stub, sleeps):
+    client = BulletinClient(max_retries=2)
+    with pytest.raises(requests.exceptions.HTTPError):
+        client.fetch(stub.url("/missing/"))
+    assert stub.requests == 1
+    assert sleeps == []
+
+
+def test_concurrent_fetches_to_one_host_stay_within_its_limit(stub):
+    stub.set_page("/p/", PAGE)
+    stub.delay = 0.1
+    client = BulletinClient(per_host_limit=2)
+
+    threads = [threading.Thread(target=client.fetch, args=(stub.url("/p/"),)) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert stub.requests == 6
+    assert stub.max_in_flight == 2
+
+
+def test_revalidates_with_etag(stub):
+    stub.set_page("/p/", PAGE)
+    client = BulletinClient()
+    first = client.fetch(stub.url("/p/"))
+
+    second = client.fetch(stub.url("/p/"), etag=first.etag)
+    assert second.not_modified
+    assert second.content is None
+    assert second.etag == first.etag
+    assert stub.last_headers["If-None-Match"] == first.etag
+    assert stub.not_modified == 1
+
+
+def test_revalidates_with_last_modified(stub):
+    stub.set_page("/p/", PAGE)
+    client = BulletinClient()
+    first = client.fetch(stub.url("/p/"))
+
+    second = client.fetch(stub.url("/p/"), last_modified=first.last_modified)
+    assert second.not_modified
+    assert stub.last_headers["If-Modified-Since"] == first.last_modified
+
+
+def test_changed_page_is_fetched_again_despite_validators(stub):
+    stub.set_page("/p/", PAGE)
+    client = BulletinClient()
+    first = client.fetch(stub.url("/p/"))
+
+    stub.set_page("/p/", PAGE + b"<!-- revised -->")
+    second = client.fetch(stub.url("/p/"), etag=first.etag)
+    assert second.status == 200
+    assert second.content == PAGE + b"<!-- revised -->"
+    assert second.etag != first.etag
+
+
+def test_read_timeout_is_capped_to_the_request_deadline(stub):
+    stub.set_page("/p/", PAGE)
+    stub.delay = 2.0
+    client = BulletinClient(read_timeout=10.0, max_retries=0)
+
+    started = time.monotonic()
+    with deadline_scope(Deadline.after(0.2)):
+        with pytest.raises((requests.exceptions.Timeout, DeadlineExceeded)):
+            client.fetch(stub.url("/p/"))
+    assert time.monotonic() - started < 1.0
+
+
+def test_no_retry_when_the_backoff_would_outlast_the_deadline(stub, sleeps):
+    stub.set_page("/p/", PAGE)
+    stub.fail_next(1)
+    client = BulletinClient(max_retries=2, backoff=5.0)
+
+    with deadline_scope(Deadline.after(1.0)):
+        with pytest.raises(requests.exceptions.HTTPError):
+            client.fetch(stub.url("/p/"))
+    assert stub.requests == 1
+    assert sleeps == []
+
+
+def test_expired_deadline_sends_nothing(stub):
+    stub.set_page("/p/", PAGE)
+    client = BulletinClient()
+    with deadline_scope(Deadline.after(0)):
+        with pytest.raises(DeadlineExceeded):
+            client.fetch(stub.url("/p/"))
+    assert stub.requests == 0
@@ -0,0 +1,110 @@
+import logging
+
+import pytest
+
+from src.ai_advisor import prerequisites
+from src.ai_advisor.prerequisites import (
+    UNPRUNED_INSTRUCTIONS,
+    PrerequisiteGraph,
+    parse_codes,
+    parse_requirement,
+    prerequisite_instructions,
+    prune_dependents,
+    requirements_from_description,
+    write_graph,
+)
+
+REQUIREMENTS = {
+    "MTH 161": [["MTH 151"]],
+    "MTH 162": [["MTH 161"]],
+    # CSC 120 or 121, and MTH 151
+    "CSC 220": [["CSC 120", "CSC 121"], ["MTH 151"]],
+}
+
+
+@pytest.mark.parametrize("text, groups", [
+    ("MTH 151 and 162", [["MTH 151"], ["MTH 162"]]),
+    ("MTH 151 or 161, and CSC 120", [["MTH 151", "MTH 161"], ["CSC 120"]]),
+    ("CSC 120/121", [["CSC 120", "CSC 121"]]),
+    ("MTH  151 or\n 161", [["MTH 151", "MTH 161"]]),
+    ("MTH 151 or a math placement score of 650", [["MTH 151"]]),
+    ("MTH 151 and a score of 650", [["MTH 151"]]),
+])
+def test_parse_requirement(text, groups):
+    assert parse_requirement(text) == groups
+
+
+def test_prerequisite_sentence_keeps_bare_numbers():
+    assert requirements_from_description("Prerequisites: CSC 220 and 317.") == [["CSC 220"], ["CSC 317"]]
+
+
+def test_bare_number_without_a_subject_is_not_a_course():
+    assert parse_codes("Score of 650 or MTH 151") == ["MTH 151"]
+
+
+@pytest.fixture
+def graph(monkeypatch):
+    graph = PrerequisiteGraph(REQUIREMENTS)
+    monkeypatch.setattr(prerequisites, "_graph", graph)
+    return graph
+
+
+def test_prerequisites_are_transitive(graph):
+    assert graph.prerequisites("MTH 162") == {"MTH 161", "MTH 151"}
+    assert graph.prerequisites("csc220") == {"CSC 120", "CSC 121", "MTH 151"}
+    assert graph.prerequisites("MTH 151") == frozenset()
+
+
+def test_is_eligible_needs_one_course_of_every_group(graph):
+    assert graph.is_eligible("CSC 220", ["CSC 121", "MTH 151"])
+    assert not graph.is_eligible("CSC 220", ["CSC 120", "CSC 121"])
+    assert not graph.is_eligible("CSC 220", ["MTH 151"])
+    assert graph.is_eligible("MTH 151", [])
+
+
+def test_dependents_in_finds_courses_whose_chain_is_present(graph):
+    assert graph.dependents_in(["MTH 151", "MTH 162", "CSC 120"]) == ["MTH 162"]
+    assert graph.dependents_in(["MTH 162", "CSC 220"]) == []
+
+
+def test_cycles_are_dropped(caplog):
+    with caplog.at_level(logging.WARNING):
+        graph = PrerequisiteGraph({"ABC 101": [["ABC 102"]], "ABC 102": [["ABC 101"]]})
+    assert "cycle" in caplog.text
+    assert graph.prerequisites("ABC 101") == {"ABC 102"}
+    assert "ABC 101" not in graph.prerequisites("ABC 101")
+    assert graph.dependents_in(["ABC 101"]) == []
+
+
+def test_graph_round_trips_through_its_file(tmp_path):
+    path = str(tmp_path / "prerequisites.json")
+    write_graph({"version": prerequisites.GRAPH_VERSION, "courses": REQUIREMENTS}, path)
+    assert len(PrerequisiteGraph.load(path)) == 3
+    assert len(PrerequisiteGraph.load(str(tmp_path / "missing.json"))) == 0
+
+
+def test_prune_dependents_replaces_them_with_electives(graph):
+    courses = [
+        {"code": "MTH 151", "name": "Calculus I", "credits": 4},
+        {"code": "MTH 161", "name": "Calculus II", "credits": 4},
+        {"code": "CSC 120", "name": "Computer Programming I", "credits": 4},
+    ]
+    assert prune_dependents(courses) == [
+        courses[0],
+        {"code": "Elective", "name": "Elective", "credits": 4},
+        courses[2],
+    ]
+
+
+def test_prune_dependents_keeps_the_plan_of_study_shape(graph):
+    courses = [{"course_code": "MTH 161", "course_name": "Calculus II", "credit_hours": 4},
+               {"course_code": "MTH 162", "course_name": "Calculus III", "credit_hours": 4}]
+    assert prune_dependents(courses)[1] == {"course_code": "Elective", "course_name": "Elective", "credit_hours": 4}
+
+
+def test_check_is_off_by_default(monkeypatch):
+    monkeypatch.setattr(prerequisites, "_graph", None)
+    courses = [{"code": "MTH 151"}, {"code": "MTH 161"}]
+    assert len(prerequisites.get_prerequisite_graph()) == 0
+    assert prune_dependents(courses) == courses
+    assert prerequisite_instructions() == UNPRUNED_INSTRUCTIONS
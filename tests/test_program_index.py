@@ -0,0 +1,30 @@
+import pytest
+
+from src.ai_advisor.program_index import get_program_index, normalize
+
+
+@pytest.mark.parametrize("query, program", [
+    ("B.S. in Computer Science", "B.S. in Computer Science"),
+    ("BS CS", "B.S. in Computer Science"),
+    ("Comp Sci", "B.S. in Computer Science"),
+    ("compter science", "B.S. in Computer Science"),
+    ("neuroscince", "B.S. in Neuroscience"),
+    ("Chemistry five year", "B.S. / M.S. in Chemistry Five-Year"),
+    ("B.S. in Chemistry", "B.S. in Chemistry"),
+])
+def test_matches_known_programs(query, program):
+    assert get_program_index().best(query)["degree_program"] == program
+
+
+@pytest.mark.parametrize("query", [
+    "B.S. in Marine Science",
+    "B.A. in Geology",
+    "Nursing",
+    "Mathematics",
+])
+def test_unknown_programs_do_not_match(query):
+    assert get_program_index().best(query) is None
+
+
+def test_five_year_program_keeps_its_distinguishing_words():
+    assert normalize("B.S. / M.S. in Chemistry Five-Year") != normalize("B.S. / M.S. in Chemistry")
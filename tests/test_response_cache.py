@@ -0,0 +1,117 @@
+import asyncio
+
+from src.ai_advisor.deadline import current_deadline
+from src.ai_advisor.response_cache import ResponseCache
+from src.ai_advisor.shared_cache import SharedCache
+
+KEY = ("b.s. in computer science", "1")
+COURSES = [{"code": "CSC 120", "name": "Computer Programming I", "credits": "4"}]
+
+
+class SlowCompute:
+    """A compute function that counts its runs and takes ``seconds`` to finish."""
+
+    def __init__(self, seconds: float = 0.1):
+        self.seconds = seconds
+        self.runs = 0
+        self.finished = 0
+        self.cancelled = 0
+        self.deadlines = []
+
+    async def __call__(self):
+        self.runs += 1
+        self.deadlines.append(current_deadline())
+        try:
+            await asyncio.sleep(self.seconds)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        self.finished += 1
+        return COURSES
+
+
+def test_concurrent_identical_requests_compute_once():
+    cache = ResponseCache(shared=None)
+    compute = SlowCompute()
+
+    async def run():
+        return await asyncio.gather(*(cache.get_or_compute(KEY, compute) for _ in range(5)))
+
+    assert asyncio.run(run()) == [COURSES] * 5
+    assert compute.runs == 1
+    assert cache.stats()["misses"] == 1
+    assert cache.stats()["coalesced"] == 4
+    assert cache.stats()["inflight"] == 0
+
+    assert asyncio.run(cache.get_or_compute(KEY, compute)) == COURSES
+    assert compute.runs == 1
+    assert cache.stats()["hits"] == 1
+
+
+def test_workers_sharing_a_cache_compute_once(tmp_path):
+    path = str(tmp_path / "shared.sqlite")
+    first, second = ResponseCache(shared=SharedCache(path)), ResponseCache(shared=SharedCache(path))
+    compute = SlowCompute()
+
+    async def run():
+        return await asyncio.gather(first.get_or_compute(KEY, compute), second.get_or_compute(KEY, compute))
+
+    assert asyncio.run(run()) == [COURSES, COURSES]
+    assert compute.runs == 1
+    assert first.stats()["shared_hits"] + second.stats()["shared_hits"] == 1
+
+
+def test_cancelled_waiter_does_not_cancel_the_shared_fill():
+    cache = ResponseCache(shared=None)
+    compute = SlowCompute(0.2)
+
+    async def run():
+        leaving = asyncio.ensure_future(cache.get_or_compute(KEY, compute))
+        staying = asyncio.ensure_future(cache.get_or_compute(KEY, compute))
+        await asyncio.sleep(0.05)
+        leaving.cancel()
+        return await staying, leaving.cancelled()
+
+    assert asyncio.run(run()) == (COURSES, True)
+    assert compute.finished == 1
+    assert compute.cancelled == 0
+    assert not compute.deadlines[0].cancelled
+
+
+def test_fill_is_cancelled_once_every_waiter_has_gone():
+    cache = ResponseCache(shared=None)
+    compute = SlowCompute(1.0)
+
+    async def run():
+        waiters = [asyncio.ensure_future(cache.get_or_compute(KEY, compute)) for _ in range(2)]
+        await asyncio.sleep(0.05)
+        for waiter in waiters:
+            waiter.cancel()
+        await asyncio.gather(*waiters, return_exceptions=True)
+        # Let the cancelled fill unwind
+        await asyncio.sleep(0.05)
+
+    asyncio.run(run())
+    assert compute.cancelled == 1
+    assert compute.deadlines[0].cancelled
+    assert cache.stats()["inflight"] == 0
+    assert cache.stats()["size"] == 0
+
+
+def test_heartbeat_keeps_a_long_fill_leased(tmp_path):
+    path = str(tmp_path / "shared.sqlite")
+    worker, other = SharedCache(path, lease=0.3), SharedCache(path, lease=0.3)
+
+    async def run():
+        taken_during = []
+        async with worker.fill_lock_async("response", "k"):
+            for _ in range(4):
+                await asyncio.sleep(0.25)
+                taken_during.append(await asyncio.to_thread(other.try_acquire, "response", "k", "other"))
+        return taken_during
+
+    # The fill outlives its 0.3 s lease three times over without losing it
+    assert asyncio.run(run()) == [False] * 4
+    assert other.try_acquire("response", "k", "other")
+    assert worker.stats()["leases_taken_over"] == 0
+    assert other.stats()["leases_taken_over"] == 0
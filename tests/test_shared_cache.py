@@ -0,0 +1,106 @@
+import threading
+import time
+
+from src.ai_advisor.plan_cache import PlanCache
+from src.ai_advisor.shared_cache import SharedCache
+
+PLAN = [{"year": 1, "term": "Fall", "courses": [{"course_code": "CSC 120"}]}]
+
+
+def test_plan_expires_after_ttl_but_stays_available_stale(tmp_path, clock):
+    cache = PlanCache(ttl=60, shared=SharedCache(str(tmp_path / "shared.sqlite")))
+    cache.set("u", PLAN, etag='"v1"')
+    assert cache.get("u") == PLAN
+
+    clock.advance(61)
+    assert cache.get("u") is None
+    stale = cache.get_stale("u")
+    assert stale["plan"] == PLAN
+    assert stale["validators"] == {"etag": '"v1"', "last_modified": None}
+    assert cache.stats()["expirations"] == 1
+
+
+def test_evicted_plan_is_read_back_from_the_shared_tier(tmp_path):
+    cache = PlanCache(max_size=2, shared=SharedCache(str(tmp_path / "shared.sqlite")))
+    for url in ("a", "b", "c"):
+        cache.set(url, PLAN)
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["size"] == 2
+
+    assert cache.get("a") == PLAN
+    assert cache.stats()["shared_hits"] == 1
+
+
+def test_evicted_plan_is_gone_without_a_shared_tier():
+    cache = PlanCache(max_size=1, shared=None)
+    cache.set("a", PLAN)
+    cache.set("b", PLAN)
+    assert cache.get("a") is None
+    assert cache.get("b") == PLAN
+
+
+def test_workers_share_plans_through_the_shared_tier(tmp_path):
+    path = str(tmp_path / "shared.sqlite")
+    first, second = PlanCache(shared=SharedCache(path)), PlanCache(shared=SharedCache(path))
+    first.set("u", PLAN)
+    assert second.get("u") == PLAN
+    assert second.stats()["shared_hits"] == 1
+
+
+def test_shared_entries_expire_by_max_age(tmp_path, clock):
+    shared = SharedCache(str(tmp_path / "shared.sqlite"))
+    shared.set("ns", "k", {"v": 1})
+    clock.advance(30)
+    assert shared.get("ns", "k", max_age=60) == {"v": 1}
+    assert shared.get("ns", "k", max_age=10) is None
+    assert shared.prune("ns", max_age=10) == 1
+    assert shared.get("ns", "k") is None
+
+
+def test_fill_lock_serializes_fillers_across_workers(tmp_path):
+    path = str(tmp_path / "shared.sqlite")
+    computed, inside, most_inside = [], [0], [0]
+    counter_lock = threading.Lock()
+
+    def fill(cache):
+        if cache.get("plan", "u") is not None:
+            return
+        with cache.fill_lock("plan", "u"):
+            with counter_lock:
+                inside[0] += 1
+                most_inside[0] = max(most_inside[0], inside[0])
+            try:
+                if cache.get("plan", "u") is None:
+                    time.sleep(0.1)
+                    computed.append(1)
+                    cache.set("plan", "u", PLAN)
+            finally:
+                with counter_lock:
+                    inside[0] -= 1
+
+    workers = [SharedCache(path) for _ in range(2)]
+    threads = [threading.Thread(target=fill, args=(cache,)) for cache in workers for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(computed) == 1
+    assert most_inside[0] == 1
+    assert sum(cache.stats()["fills_waited"] for cache in workers) >= 1
+
+
+def test_expired_lease_is_taken_over(tmp_path, clock):
+    shared = SharedCache(str(tmp_path / "shared.sqlite"), lease=30)
+    assert shared.try_acquire("plan", "u", "dead-worker")
+    assert not shared.try_acquire("plan", "u", "other")
+
+    clock.advance(31)
+    assert shared.try_acquire("plan", "u", "other")
+    assert shared.stats()["leases_taken_over"] == 1
+
+    # The old holder's late release doesn't free the new holder's lease
+    shared.release("plan", "u", "dead-worker")
+    assert not shared.try_acquire("plan", "u", "third")
+    shared.release("plan", "u", "other")
+    assert shared.try_acquire("plan", "u", "third")